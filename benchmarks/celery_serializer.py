@@ -0,0 +1,56 @@
+"""This file benchmarks the payload size and latency of the celery serializers.
+
+Run it with `python -m benchmarks.celery_serializer`. The JSON serializer needs the numpy
+arrays turned into nested lists, the msgpack-numpy serializer takes them as they are.
+"""
+import timeit
+
+import numpy as np
+from kombu.serialization import dumps, loads
+
+from src.service.event.serializer import SERIALIZER_NAME, register_serializer
+
+
+def get_payloads() -> dict:
+    """Return typical optimizer payloads: one-hot populations, phenotypes and a result."""
+    rng = np.random.default_rng(0)
+    payloads = {}
+    for pop_size in (100, 1000):
+        choice = rng.integers(0, 10, size=(pop_size, 2, 96))
+        payloads[f"one-hot population {pop_size}x2x96x10"] = np.eye(10, dtype=int)[choice]
+        payloads[f"phenotype {pop_size}x2x96"] = rng.random((pop_size, 2, 96))
+    payloads["result 2x96"] = {"best_fit": 1.0, "best_phenotype": rng.random((2, 96)), "generations": 100}
+    return payloads
+
+
+def to_json_compatible(payload):
+    """Turn numpy arrays into nested lists."""
+    if isinstance(payload, np.ndarray):
+        return payload.tolist()
+    if isinstance(payload, dict):
+        return {key: to_json_compatible(value) for key, value in payload.items()}
+    return payload
+
+
+def measure(payload, serializer: str, number: int = 5) -> tuple:
+    """Return the payload size in bytes, and the encode and decode time in milliseconds."""
+    _, _, data = dumps(payload, serializer=serializer)
+    content_type = "application/json" if serializer == "json" else "application/x-msgpack-numpy"
+    encode_ms = timeit.timeit(lambda: dumps(payload, serializer=serializer), number=number) / number * 1000
+    decode_ms = timeit.timeit(lambda: loads(data, content_type, "binary" if serializer != "json" else "utf-8"),
+                              number=number) / number * 1000
+    return len(data), encode_ms, decode_ms
+
+
+def main():
+    """Print the comparison table."""
+    register_serializer()
+    print(f"{'payload':<40}{'serializer':<15}{'bytes':>12}{'encode ms':>12}{'decode ms':>12}")
+    for name, payload in get_payloads().items():
+        for serializer, value in (("json", to_json_compatible(payload)), (SERIALIZER_NAME, payload)):
+            size, encode_ms, decode_ms = measure(value, serializer)
+            print(f"{name:<40}{serializer:<15}{size:>12}{encode_ms:>12.2f}{decode_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""This file benchmarks the crossover of the one-hot and the index populations.
+
+Run it with `python -m benchmarks.crossover`.
+"""
+import timeit
+
+import numpy as np
+
+from src.service.optimizer.gene_change import GeneChange
+from src.service.optimizer.gene_translation import GeneTranslation
+
+ACCURACY = [10, 2]
+FUTURE_STEP = 96
+CROSSOVER_RATE = 0.8
+
+
+def main():
+    """Print the crossover time of each population size."""
+    gene_change = GeneChange(accuracy=ACCURACY, future_step=FUTURE_STEP, rng=np.random.default_rng(0))
+    print(f"{'pop size':>10}{'one-hot ms':>14}" + "".join(f"{method + ' ms':>18}" for method in GeneChange.CROSSOVER_METHODS))
+    for pop_size in (100, 1000, 10000):
+        gene_translation = GeneTranslation(pop_size, len(ACCURACY), FUTURE_STEP, ACCURACY)
+        index_pop = gene_translation.create_index_pop(np.random.default_rng(0))
+        one_hot_pop = gene_translation.index_to_one_hot(index_pop)
+        number = 3 if pop_size >= 10000 else 10
+        one_hot_ms = timeit.timeit(lambda: gene_change.crossover(one_hot_pop, CROSSOVER_RATE), number=number) / number * 1000
+        index_ms = [
+            timeit.timeit(lambda: gene_change.crossover_index_pop(index_pop, CROSSOVER_RATE, method), number=number)
+            / number * 1000
+            for method in GeneChange.CROSSOVER_METHODS
+        ]
+        print(f"{pop_size:>10}{one_hot_ms:>14.2f}" + "".join(f"{ms:>18.2f}" for ms in index_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""This file benchmarks the batched GA of many sites against one GA run per site.
+
+Run it with `python -m benchmarks.multi_site`.
+"""
+import time
+from functools import partial
+
+import numpy as np
+
+from src.service.optimizer.fitness import weighted_cost_batch
+from src.service.optimizer.genetic_optimizer import GeneticOptimizer
+from src.service.optimizer.multi_site import MultiSiteGeneticOptimizer
+
+ACCURACY = [10, 2]
+ACTIONS = [list(range(1, 11)), [1, 2]]
+FUTURE_STEP = 48
+GENERATIONS = 100
+
+
+def main():
+    """Print the run time of each number of sites and population size."""
+    print(f"{'sites':>8}{'pop size':>10}{'per site s':>14}{'batched s':>12}{'speedup':>10}")
+    for sites, pop_size in ((10, 100), (50, 100), (200, 30)):
+        cost_weights = np.random.default_rng(0).random((sites, len(ACCURACY), FUTURE_STEP)) + 0.5
+        kwargs = dict(pop_size=pop_size, generations=GENERATIONS, mutation_rate=0.02, seed=0)
+
+        started_at = time.perf_counter()
+        for site in range(sites):
+            GeneticOptimizer(
+                ACCURACY, FUTURE_STEP, ACTIONS, partial(weighted_cost_batch, cost_weights=cost_weights[site]), **kwargs
+            ).run()
+        per_site_seconds = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        MultiSiteGeneticOptimizer(
+            [ACCURACY] * sites, FUTURE_STEP, [ACTIONS] * sites, partial(weighted_cost_batch, cost_weights=cost_weights),
+            **kwargs
+        ).run()
+        batched_seconds = time.perf_counter() - started_at
+        print(f"{sites:>8}{pop_size:>10}{per_site_seconds:>14.2f}{batched_seconds:>12.2f}"
+              f"{per_site_seconds / batched_seconds:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""This file benchmarks the parallel fitness evaluation by the number of workers.
+
+Run it with `python -m benchmarks.parallel_fitness`. The fitness simulates the room
+temperature step by step, heavy enough for the pool to pay off.
+"""
+import os
+import time
+from functools import partial
+
+import numpy as np
+
+from src.service.optimizer.parallel_fitness import ParallelFitnessEvaluator
+
+POP_SIZE = 20000
+FUTURE_STEP = 96
+
+
+def thermal_cost(phenotypes: np.ndarray, outdoor_temperature: np.ndarray) -> np.ndarray:
+    """Energy of the set points plus the discomfort of the simulated room temperature."""
+    set_points, ac_status = phenotypes[:, 0], phenotypes[:, 1]
+    temperature = np.full(len(phenotypes), 28.0)
+    discomfort = np.zeros(len(phenotypes))
+    for step in range(phenotypes.shape[2]):
+        for _ in range(20):  # sub-steps of the room model
+            cooling = ac_status[:, step] * (temperature - set_points[:, step]) * 0.05
+            temperature += (outdoor_temperature[step] - temperature) * 0.01 - cooling
+        discomfort += np.maximum(temperature - 26.0, 0.0)
+    return 1.0 + ac_status.sum(axis=1) * 0.5 + discomfort
+
+
+def main():
+    """Print the evaluation time of each number of workers."""
+    rng = np.random.default_rng(0)
+    phenotypes = np.stack([rng.integers(20, 27, (POP_SIZE, FUTURE_STEP)), rng.integers(0, 2, (POP_SIZE, FUTURE_STEP))], axis=1)
+    fitness_function = partial(thermal_cost, outdoor_temperature=30 + 3 * np.sin(np.linspace(0, np.pi, FUTURE_STEP)))
+    baseline = None
+    print(f"{'workers':>8}{'seconds':>10}{'speedup':>10}")
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        with ParallelFitnessEvaluator(fitness_function, workers=workers) as evaluator:
+            evaluator.evaluate(phenotypes)  # start the pool
+            start = time.perf_counter()
+            evaluator.evaluate(phenotypes)
+            seconds = time.perf_counter() - start
+        baseline = baseline or seconds
+        print(f"{workers:>8}{seconds:>10.3f}{baseline / seconds:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
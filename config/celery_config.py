@@ -1,13 +1,30 @@
 import os
 
+from kombu import Queue
+
 class BaseConfig(object):
     """This class define the celery baseconfig"""
     timezone = 'Asia/Taipei'
     include=[
-        ''  # Import tasks from service_a/tasks.py or service_b/tasks.py
+        'src.service.event.tasks.notification',
+        'src.service.event.tasks.optimization'
     ]
     worker_hijack_root_logger = False
 
+    # short tasks (notifications, cache refreshes) never wait behind the long optimizations,
+    # start a worker on one queue with `celery -A src.service.event.celery_app worker -Q short`
+    task_queues = (
+        Queue('short', routing_key='short'),
+        Queue('long', routing_key='long'),
+    )
+    task_default_queue = 'short'
+    task_routes = {
+        'src.service.event.tasks.notification.*': {'queue': 'short'},
+        'src.service.event.tasks.optimization.*': {'queue': 'long'},
+    }
+    # with the redis broker 0 is the highest priority
+    task_default_priority = 6
+
 
 class ProdConfig(BaseConfig):
     """This class define the celery ProdConfig"""
@@ -16,5 +33,24 @@ class ProdConfig(BaseConfig):
 
     broker_url = f'redis://{redis_host}:{redis_port}/0'
     result_backend = f'redis://{redis_host}:{redis_port}/1'
+    # each priority step is a redis list named "{queue}:{priority}", priority 0 is "{queue}"
+    broker_transport_options = {
+        'priority_steps': [0, 3, 6, 9],
+        'sep': ':',
+        'queue_order_strategy': 'priority',
+        # a late acknowledged task (the optimizations) is redelivered when it isn't acknowledged
+        # within visibility_timeout seconds, it should be longer than the longest optimization
+        'visibility_timeout': int(os.getenv("CELERY_VISIBILITY_TIMEOUT", 43200)),
+    }
 
     result_expires = 3600  # 1小時，可以根據實際需求調整
+
+    # set it to 1 for the workers of the long queue, so a worker doesn't reserve
+    # optimizations while it is running one
+    worker_prefetch_multiplier = int(os.getenv("CELERY_PREFETCH_MULTIPLIER", 4))
+
+    # numpy arrays are sent as raw buffers, see src/service/event/serializer.py
+    task_serializer = 'msgpack-numpy'
+    result_serializer = 'msgpack-numpy'
+    accept_content = ['msgpack-numpy', 'json']
+    result_accept_content = ['msgpack-numpy', 'json']
@@ -40,6 +40,7 @@ def get_logger():
     )
     # commente first because we need to look
     logging.getLogger('apscheduler.executors.default').propagate = False
+    logging.getLogger('apscheduler.executors.processpool').propagate = False
     return logging
 
 
@@ -1,5 +1,5 @@
 """This file is for application config"""
-from typing import List
+from typing import List, Optional
 from pydantic import BaseSettings, Field
 
 
@@ -20,6 +20,11 @@ class SecurityConfigSettings(BaseSettings):
     # User's password rule is to contain at least 1 upper case, 1 lower case alphabet, and in length between 8 to 12
     # 2022/03/11 新增@$!%*?&於\d之後，否則會無法輸入標點符號當密碼
     password_rule_regex: str = r'^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)[a-zA-Z\d@$!%*?&]{8,12}$'
+    # revoked token ids are kept in a bloom filter on each worker, redis is only asked on a filter hit
+    revoked_token_bloom_capacity: int = 100000
+    revoked_token_bloom_error_rate: float = 0.001
+    # rebuild the bloom filter from redis periodically, drop expired ids and catch up missed messages
+    revoked_token_resync_seconds: int = 300
 
 class DatabaseConfigSettings(BaseSettings):
     """This class define the database baseconfig"""
@@ -43,8 +48,56 @@ class RedisConfigSettings(BaseSettings):
     port: int = Field(6379, env="REDIS_PORT")
     password: str = Field(None, env="REDIS_PASSWORD")
     db: int = Field(0, env="REDIS_DB")
+    # connection pool parameter, one pool is shared by the process
+    max_connections: int = Field(50, env="REDIS_MAX_CONNECTIONS")
+    socket_timeout: Optional[float] = Field(None, env="REDIS_SOCKET_TIMEOUT")
+    socket_connect_timeout: Optional[float] = Field(5, env="REDIS_SOCKET_CONNECT_TIMEOUT")
+    socket_keepalive: bool = Field(True, env="REDIS_SOCKET_KEEPALIVE")
+    health_check_interval: int = Field(30, env="REDIS_HEALTH_CHECK_INTERVAL")
+    # log a warning when the ratio of in use connections reaches this value
+    pool_saturation_warning_ratio: float = Field(0.8, env="REDIS_POOL_SATURATION_WARNING_RATIO")
 
 
+class ScheduleConfigSettings(BaseSettings):
+    """This class define the schedule config"""
+    # only the leader runs the scheduler, the lease expires if the leader stops renewing it
+    leader_lease_seconds: int = 30
+    leader_renew_interval_seconds: int = 10
+    # the scheduler runs in its own process (src/service/schedule/runner.py) unless this is set
+    run_in_web_worker: bool = False
+    # executors, CPU heavy jobs run in the process pool
+    thread_pool_workers: int = 10
+    process_pool_workers: int = 2
+    # job defaults: run missed runs once, never run a job twice at the same time,
+    # and skip a run which is later than misfire_grace_time seconds (None to always catch up)
+    coalesce: bool = True
+    max_instances: int = 1
+    misfire_grace_time: Optional[int] = None
+    # jobs are stored in postgresql, with the run history of the last job_run_history_days days
+    job_run_history_days: int = 30
+    # lease of the redis locks limiting the concurrent runs of a job on all nodes
+    job_lock_lease_seconds: int = 3600
+
+
+class OptimizationConfigSettings(BaseSettings):
+    """This class define the optimization config"""
+    # identical requests get the task of the first one within dedup_ttl_seconds,
+    # it should not be longer than the celery result_expires
+    dedup_ttl_seconds: int = 3600
+    # processes evaluating the fitness of a population, 1 evaluates it in the task process,
+    # the celery worker should use a threads or solo pool (-P) for more
+    fitness_workers: int = 1
+    # individuals per evaluation chunk, None to split a population into 4 chunks per worker
+    fitness_chunk_size: Optional[int] = None
+    # fit values of the last fitness_cache_size distinct genotypes are cached, 0 to disable
+    fitness_cache_size: int = 100000
+    # runs are checkpointed into checkpoint_dir/{task_id} every checkpoint_interval generations
+    # and keep the last checkpoint_keep checkpoints, a task redelivered after a worker restart
+    # resumes from them. None to disable
+    checkpoint_dir: Optional[str] = "data/optimization_checkpoints"
+    checkpoint_interval: int = 10
+    checkpoint_keep: int = 2
+
 
 database_config = DatabaseConfigSettings()
 
@@ -54,3 +107,7 @@ service_config = ServiceConfig()
 redis_config = RedisConfigSettings()
 
 security_config = SecurityConfigSettings()
+
+schedule_config = ScheduleConfigSettings()
+
+optimization_config = OptimizationConfigSettings()
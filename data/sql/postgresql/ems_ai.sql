@@ -13,4 +13,34 @@ COMMENT ON COLUMN users.account IS '帳號';
 COMMENT ON COLUMN users.email_address IS '電子郵件';
 COMMENT ON COLUMN users.hashed_password IS '密碼';
 COMMENT ON COLUMN users.authority IS '權限';
-COMMENT ON COLUMN users.additional_info IS '其他資訊';
\ No newline at end of file
+COMMENT ON COLUMN users.additional_info IS '其他資訊';
+
+create table if not exists schedule_jobs (
+    id varchar(191) NOT NULL CONSTRAINT schedule_jobs_pkey PRIMARY KEY,
+    next_run_time double precision,
+    job_state bytea NOT NULL
+);
+create index if not exists ix_schedule_jobs_next_run_time on schedule_jobs (next_run_time);
+
+COMMENT ON COLUMN schedule_jobs.id IS '排程工作ID';
+COMMENT ON COLUMN schedule_jobs.next_run_time IS '下次執行時間(UTC timestamp), 暫停時為空';
+COMMENT ON COLUMN schedule_jobs.job_state IS '排程工作定義(pickle)';
+
+create table if not exists schedule_job_runs (
+    id varchar(36) NOT NULL CONSTRAINT schedule_job_runs_pkey PRIMARY KEY,
+    job_id varchar(191) NOT NULL,
+    scheduled_run_time double precision,
+    started_at double precision,
+    finished_at double precision,
+    status varchar(16),
+    error varchar
+);
+create index if not exists ix_schedule_job_runs_job_id_finished_at on schedule_job_runs (job_id, finished_at);
+
+COMMENT ON COLUMN schedule_job_runs.id IS '流水號';
+COMMENT ON COLUMN schedule_job_runs.job_id IS '排程工作ID';
+COMMENT ON COLUMN schedule_job_runs.scheduled_run_time IS '預定執行時間(UTC timestamp)';
+COMMENT ON COLUMN schedule_job_runs.started_at IS '開始時間(UTC timestamp)';
+COMMENT ON COLUMN schedule_job_runs.finished_at IS '結束時間(UTC timestamp)';
+COMMENT ON COLUMN schedule_job_runs.status IS '執行結果: success, error, missed';
+COMMENT ON COLUMN schedule_job_runs.error IS '錯誤訊息';
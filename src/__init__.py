@@ -21,12 +21,17 @@ from src.router.model import create_model_router
 from src.router.user import create_user_router
 from src.router.device import create_device_router
 from src.router.data_receiver import create_data_receive_router
+from src.router.schedule import create_schedule_router
+from src.router.optimization import create_optimization_router
 
 
 # import project package.
 from config.logger_setting import log
+from config.project_setting import schedule_config
+from src.service.event.redis.leader_election import LeaderElection
 from src.service.event.redis.lock_admin import LockAdmin
 from src.operator.redis import RedisOperator
+from src.security.auth import token_revocation_admin
 from src.service.schedule.apschedule import ScheduleWork
 from src.util import function_utils
 
@@ -46,21 +51,42 @@ def create_app():
         # pylint: disable=W0613,W0612
         return JSONResponse(status_code=400, content=jsonable_encoder({'errCode': '601', 'errMsg': 'Invalid Input', 'errDetail': exc.errors()}),)
 
+    schedule_work = ScheduleWork()
+    apschedule_election = LeaderElection(
+        LockAdmin(RedisOperator()),
+        name=ScheduleWork.LEADER_NAME,
+        lease_seconds=schedule_config.leader_lease_seconds,
+        renew_interval_seconds=schedule_config.leader_renew_interval_seconds,
+        on_elected=schedule_work.start,
+        on_revoked=schedule_work.pause
+    )
+
     @app.on_event("startup")
     def startup_event():
         """startup events"""
-        redis_operator = RedisOperator()
+        # only the elected worker among all workers and nodes runs the scheduler,
+        # by default it runs in the scheduler process instead of the web workers
+        if schedule_config.run_in_web_worker:
+            apschedule_election.start()
+
+        token_revocation_admin.start_listener()
 
-        apschedule_locker = LockAdmin(redis_operator)
-        apschedule_lock = apschedule_locker.set_lock(value="apscheduler", ex=1, nx=True)
-        if apschedule_lock:
-            ScheduleWork().schedule_task_pipeline()
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        """shutdown events"""
+        apschedule_election.stop()
+        schedule_work.shutdown()
+        token_revocation_admin.stop_listener()
+        await RedisOperator().close_async_conn()
 
     # Health check router for this service
     health_check_router = create_health_check_router()
     user_router = create_user_router()
     login_router = create_login_router()
     auth_router = create_auth_router()
+    schedule_router = create_schedule_router()
+    optimization_router = create_optimization_router()
+    task_router = create_task_router()
 
 
     api_version = f"/v1/"
@@ -73,6 +99,12 @@ def create_app():
                             tags=["Login Endpoint"])
     app.include_router(auth_router, prefix=f"{api_version}auth",
                             tags=["Auth"])
+    app.include_router(schedule_router, prefix=f"{api_version}schedule",
+                            tags=["Schedule"])
+    app.include_router(optimization_router, prefix=f"{api_version}optimization",
+                            tags=["Optimization"])
+    app.include_router(task_router, prefix=f"{api_version}task",
+                            tags=["Task"])
 
     log.info("start fastapi service.")
     return app
\ No newline at end of file
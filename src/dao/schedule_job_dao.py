@@ -0,0 +1,151 @@
+"""This module contains class to for schedule job dao."""
+from typing import List, Optional
+
+from config.logger_setting import log
+from src.dao.abstract_dao import AbstractDao
+from src.data_models.entities import ScheduleJob, TableName
+
+
+class ScheduleJobDao(AbstractDao):
+    """An class for schedule job dao, used as the APScheduler job store.
+
+    Attributes:
+        table_name: str
+            name of the binding table.
+        conn_pool: ConnectionPool
+            a ConnectionPool instance to get / put psycopg2 connection.
+
+    Methods:
+        save(data: EntityBaseModel) -> bool:
+            Insert a row of data.
+        find_all() -> List[ScheduleJob]:
+            Read all rows of data ordered by next run time.
+        find_by_id(job_id: str) -> Optional[ScheduleJob]:
+            Read a row of data by id.
+        find_due(timestamp: float) -> List[ScheduleJob]:
+            Read rows of data which next run time is not later than timestamp.
+        find_next_run_time() -> Optional[float]:
+            Read the earliest next run time.
+        update_by_id(job_id: str, new_job: ScheduleJob) -> bool:
+            Update whole row of data with input by job id.
+        delete_job(job_id: str) -> bool:
+            Delete a row of data by id.
+        delete_all() -> bool:
+            Delete all rows of data.
+    """
+    def __init__(self):
+        super().__init__(TableName.SCHEDULE_JOBS, ScheduleJob)
+
+    def _find_ordered(self, condition: str = "", values: tuple = ()) -> List[ScheduleJob]:
+        """Read rows of data ordered by next run time, paused jobs come last."""
+        result_tuples = []
+        sql_text = f"SELECT {', '.join(self.col_names)} FROM {self.table_name} "\
+                   f"{condition} ORDER BY next_run_time NULLS LAST"
+        conn = self._get_conn()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(sql_text, values)
+            result_tuples = cursor.fetchall()
+        except Exception as exc:
+            log.error(f"Exception when SELECT data in table({self.table_name}): {exc}")
+            log.debug(f"SQL query: {cursor.query}")
+        finally:
+            conn.close()
+            self._put_conn(conn)
+
+        return list(map(self.to_entity_model, result_tuples))
+
+    def find_all(self) -> List[ScheduleJob]:
+        """Read all rows of data ordered by next run time.
+
+        Returns:
+            all of ScheduleJobs in a list.
+        """
+        return self._find_ordered()
+
+    def find_by_id(self, job_id: str) -> Optional[ScheduleJob]:
+        """Read a row of data by job id.
+
+        Parameters:
+            job_id: id of target job.
+
+        Returns:
+            a ScheduleJob entity if there is corresponding data to job_id, else return None.
+        """
+        result_tuple = self._find_by_id(job_id, ", ".join(self.col_names))
+        if not result_tuple:
+            return None
+        return self.to_entity_model(result_tuple)
+
+    def find_due(self, timestamp: float) -> List[ScheduleJob]:
+        """Read rows of data which next run time is not later than timestamp.
+
+        Parameters:
+            timestamp: UTC timestamp.
+
+        Returns:
+            due ScheduleJobs in a list.
+        """
+        return self._find_ordered("WHERE next_run_time <= %s", (timestamp,))
+
+    def find_next_run_time(self) -> Optional[float]:
+        """Read the earliest next run time of jobs which are not paused.
+
+        Returns:
+            the UTC timestamp, or None if there is no job to run.
+        """
+        result_tuples = self._find_all("MIN(next_run_time)")
+        if not result_tuples:
+            return None
+        return result_tuples[0][0]
+
+    def update_by_id(self, job_id: str, new_job: ScheduleJob) -> bool:
+        """Update next run time and job state by job id.
+
+        Parameters:
+            job_id: id of target job.
+            new_job: a ScheduleJob entity to update database with.
+
+        Returns:
+            True if a row is updated.
+        """
+        return self._execute_with_rowcount(
+            f"UPDATE {self.table_name} SET next_run_time = %s, job_state = %s WHERE id = %s",
+            (new_job.next_run_time, new_job.job_state, job_id)
+        )
+
+    def delete_job(self, job_id: str) -> bool:
+        """Delete a row of data by job id.
+
+        Returns:
+            True if a row is deleted.
+        """
+        return self._execute_with_rowcount(f"DELETE FROM {self.table_name} WHERE id = %s", (job_id,))
+
+    def delete_all(self) -> bool:
+        """Delete all rows of data.
+
+        Returns:
+            status of database command execution.
+        """
+        self._execute_with_rowcount(f"DELETE FROM {self.table_name}", ())
+        return True
+
+    def _execute_with_rowcount(self, sql_text: str, values: tuple) -> bool:
+        """Execute a command and return True if any row is affected."""
+        rowcount = 0
+        conn = self._get_conn()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(sql_text, values)
+            rowcount = cursor.rowcount
+            conn.commit()
+        except Exception as exc:
+            conn.rollback()
+            log.error(f"Exception when executing command on table({self.table_name}): {exc}")
+            log.debug(f"SQL query: {cursor.query}")
+        finally:
+            conn.close()
+            self._put_conn(conn)
+
+        return rowcount > 0
@@ -0,0 +1,81 @@
+"""This module contains class to for schedule job run dao."""
+from typing import List, Optional
+
+from config.logger_setting import log
+from src.dao.abstract_dao import AbstractDao
+from src.data_models.entities import ScheduleJobRun, TableName
+
+
+class ScheduleJobRunDao(AbstractDao):
+    """An class for schedule job run dao, the run history of scheduled jobs.
+
+    Attributes:
+        table_name: str
+            name of the binding table.
+        conn_pool: ConnectionPool
+            a ConnectionPool instance to get / put psycopg2 connection.
+
+    Methods:
+        save(data: EntityBaseModel) -> bool:
+            Insert a row of data.
+        find_recent_by_job_id(job_id: str, limit: int) -> List[ScheduleJobRun]:
+            Read the latest rows of data of a job.
+        find_last_by_job_id(job_id: str) -> Optional[ScheduleJobRun]:
+            Read the latest row of data of a job.
+        delete_finished_before(timestamp: float) -> bool:
+            Delete rows of data finished before timestamp.
+    """
+    def __init__(self):
+        super().__init__(TableName.SCHEDULE_JOB_RUNS, ScheduleJobRun)
+
+    def find_recent_by_job_id(self, job_id: str, limit: int = 20) -> List[ScheduleJobRun]:
+        """Read the latest rows of data of a job.
+
+        Parameters:
+            job_id: id of target job.
+            limit: max number of rows.
+
+        Returns:
+            ScheduleJobRuns in a list, the latest first.
+        """
+        result_tuples = []
+        sql_text = f"SELECT {', '.join(self.col_names)} FROM {self.table_name} "\
+                   f"WHERE job_id = %s ORDER BY finished_at DESC LIMIT %s"
+        conn = self._get_conn()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(sql_text, (job_id, limit))
+            result_tuples = cursor.fetchall()
+        except Exception as exc:
+            log.error(f"Exception when SELECT data in table({self.table_name}): {exc}")
+            log.debug(f"SQL query: {cursor.query}")
+        finally:
+            conn.close()
+            self._put_conn(conn)
+
+        return list(map(self.to_entity_model, result_tuples))
+
+    def find_last_by_job_id(self, job_id: str) -> Optional[ScheduleJobRun]:
+        """Read the latest row of data of a job.
+
+        Parameters:
+            job_id: id of target job.
+
+        Returns:
+            a ScheduleJobRun entity, or None if the job has never run.
+        """
+        job_runs = self.find_recent_by_job_id(job_id, limit=1)
+        if not job_runs:
+            return None
+        return job_runs[0]
+
+    def delete_finished_before(self, timestamp: float) -> bool:
+        """Delete rows of data finished before timestamp.
+
+        Parameters:
+            timestamp: UTC timestamp.
+
+        Returns:
+            status of database command execution.
+        """
+        return self._delete_small_than({"finished_at": timestamp})
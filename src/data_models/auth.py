@@ -1,6 +1,6 @@
 """This module contains models that define input / output of Auth Controller."""
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, constr
 
@@ -15,6 +15,7 @@ class TokenData(BaseModel):
     user_id: str
     iat: datetime
     exp: datetime
+    jti: Optional[str] = None
 
 
 class ChangePasswordRequest(BaseModel):
@@ -4,4 +4,10 @@ from pydantic import BaseModel
 class CeleryResponse(BaseModel):
     """A class to represent CeleryResponse."""
     message: str
-    task_id: str
\ No newline at end of file
+    task_id: str
+
+class QueueStats(BaseModel):
+    """A class to represent the depth and wait time of a celery queue."""
+    name: str
+    depth: int
+    oldest_wait_seconds: Optional[float] = None
@@ -25,6 +25,30 @@ class User(EntityBaseModel):
     additional_info: Optional[str] = ""
 
 
+class ScheduleJob(EntityBaseModel):
+    """A class to represent a ScheduleJob entity, job_state is a pickled APScheduler job."""
+    next_run_time: Optional[float]
+    job_state: bytes
+
+    @validator("job_state", pre=True)
+    def memoryview_to_bytes(cls, v):
+        # pylint: disable=E0213,R0201
+        """Turn bytea column value into bytes."""
+        if isinstance(v, memoryview):
+            return v.tobytes()
+        return v
+
+
+class ScheduleJobRun(EntityBaseModel):
+    """A class to represent a ScheduleJobRun entity."""
+    job_id: str
+    scheduled_run_time: Optional[float]
+    started_at: Optional[float]
+    finished_at: Optional[float]
+    status: str
+    error: Optional[str]
+
+
 class TableName:
     """A class to define table names."""
     # pylint: disable=too-few-public-methods
@@ -36,4 +60,6 @@ class TableName:
     METER_3P = "meter_3p"
     AC = "ac"
     SENSOR = "sensor"
-    MODEL = "model"
\ No newline at end of file
+    MODEL = "model"
+    SCHEDULE_JOBS = "schedule_jobs"
+    SCHEDULE_JOB_RUNS = "schedule_job_runs"
\ No newline at end of file
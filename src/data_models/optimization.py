@@ -0,0 +1,105 @@
+"""This module contains models that define input / output of Optimization Controller."""
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field, root_validator
+
+
+class OptimizationRequest(BaseModel):
+    """A class to represent an optimization request.
+
+    The GA chooses one of accuracy[feature] actions for each feature at each future step,
+    minimizing sum(action value * cost_weights[feature][step]), which should be positive.
+    mutation_rate is the probability of mutating an individual, which mutates one step of
+    each feature, so each gene mutates with the probability mutation_rate / future_step.
+    When current_ac_status and ac_opend are given, the feature 1 is repaired as the AC switch.
+    The run stops early when the best fit value has not improved for patience generations,
+    or after time_budget_seconds. A run with a seed is reproducible.
+    With islands > 1, islands of pop_size individuals evolve in separate processes and
+    their best individuals migrate every migration_interval generations.
+    With surrogate_top_fraction, a surrogate model ranks the offspring and only this
+    fraction of them are evaluated, for expensive fitness functions.
+    With memetic_interval, the best individuals are refined by a short simulated annealing
+    every memetic_interval generations.
+    With contract_objective, the normal demand contract (the action value of the feature 0
+    at the first step, bigger is better) is a second objective of a NSGA-II run, and the
+    result has the Pareto front of cost vs contract.
+    Identical requests share one task, change data_version when the input data changes.
+    """
+    future_step: int
+    accuracy: List[int]
+    actions: List[List[float]]
+    cost_weights: List[List[float]]
+    pop_size: int = 100
+    generations: int = 100
+    crossover_rate: float = 0.8
+    mutation_rate: float = 0.1
+    current_ac_status: Optional[int] = None
+    ac_opend: Optional[List[int]] = None
+    patience: Optional[int] = None
+    time_budget_seconds: Optional[float] = None
+    seed: Optional[int] = None
+    islands: int = 1
+    migration_interval: int = 10
+    migration_topology: Literal["ring", "random"] = "ring"
+    surrogate_top_fraction: Optional[float] = Field(None, gt=0, le=1)
+    memetic_interval: Optional[int] = Field(None, gt=0)
+    contract_objective: bool = False
+    data_version: Optional[str] = None
+
+    @root_validator(skip_on_failure=True)
+    def check_shapes(cls, values):
+        # pylint: disable=E0213,R0201
+        """Check actions and cost_weights match accuracy and future_step."""
+        accuracy, actions = values["accuracy"], values["actions"]
+        if len(actions) != len(accuracy) or any(len(a) != n for a, n in zip(actions, accuracy)):
+            raise ValueError("actions should have accuracy[feature] values for each feature")
+        cost_weights = values["cost_weights"]
+        if len(cost_weights) != len(accuracy) or any(len(w) != values["future_step"] for w in cost_weights):
+            raise ValueError("cost_weights should have future_step values for each feature")
+        if (values["current_ac_status"] is None) != (values["ac_opend"] is None):
+            raise ValueError("current_ac_status and ac_opend should be given together")
+        if values["ac_opend"] is not None and len(values["ac_opend"]) != values["future_step"]:
+            raise ValueError("ac_opend should have future_step values")
+        if values["contract_objective"] and (
+            values["islands"] > 1 or values["surrogate_top_fraction"] or values["memetic_interval"]
+        ):
+            raise ValueError("contract_objective can't be used with islands, surrogate_top_fraction or memetic_interval")
+        return values
+
+
+class OptimizationSubmitResponse(BaseModel):
+    """A class to represent the task of a submitted optimization."""
+    message: str
+    task_id: str
+    deduplicated: bool = False
+
+
+class OptimizationProgress(BaseModel):
+    """A class to represent the progress of an optimization."""
+    generation: int
+    generations: int
+    best_fit: Optional[float]
+
+
+class ParetoSolution(BaseModel):
+    """A class to represent a non-dominated solution of a multi-objective optimization."""
+    phenotype: List[List[float]]
+    objectives: List[float]
+
+
+class OptimizationResult(BaseModel):
+    """A class to represent the result of an optimization."""
+    best_fit: float
+    best_phenotype: List[List[float]]
+    generations: int
+    stop_reason: Optional[str] = None
+    pareto_front: Optional[List[ParetoSolution]] = None
+
+
+class OptimizationStatusResponse(BaseModel):
+    """A class to represent the status of an optimization task."""
+    task_id: str
+    status: str
+    progress: Optional[OptimizationProgress] = None
+    result: Optional[OptimizationResult] = None
+    error: Optional[str] = None
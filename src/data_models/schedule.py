@@ -0,0 +1,27 @@
+"""This module contains models that define input / output of Schedule Controller."""
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ScheduleJobRun(BaseModel):
+    """A class to represent a run of a scheduled job."""
+    job_id: str
+    scheduled_run_time: Optional[datetime]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    status: str
+    error: Optional[str] = None
+
+
+class ScheduleJob(BaseModel):
+    """A class to represent a scheduled job."""
+    id: str
+    name: str
+    func: str
+    trigger: str
+    executor: str
+    next_run_time: Optional[datetime]
+    paused: bool
+    last_run: Optional[ScheduleJobRun] = None
@@ -1,13 +1,22 @@
 """Contains a Redis Operator class."""
 # pylint: disable=no-member
+import os
+from typing import Dict, List, Optional
+
 import redis
+import redis.asyncio
 
+from config.logger_setting import log
 from config.project_setting import redis_config
 
 
 class RedisOperator:
     #pylint: disable=too-many-public-methods
-    """Operator with Redis backend."""
+    """Operator with Redis backend.
+
+    One connection pool and one client are kept per process, they are rebuilt after a fork.
+    Use pipeline() to batch commands in one round-trip, and async_redis_conn in coroutines.
+    """
 
     _instance = None
 
@@ -18,18 +27,169 @@ class RedisOperator:
         return cls._instance
 
     def __init__(self):
+        if getattr(self, "_pid", None) == os.getpid():
+            return
         self._set_conn_pool()
 
+    @staticmethod
+    def _connection_info() -> dict:
+        """Return the keyword arguments of the connection pools."""
+        return redis_config.dict(exclude={"pool_saturation_warning_ratio"})
+
     def _set_conn_pool(self):
-        connection_info = redis_config.dict()
-        # connection_info["password"] = os.environ.get("REDIS_PASSWORD")
-        self._redis_conn_pool = redis.ConnectionPool(**connection_info)
+        self._pid = os.getpid()
+        self._redis_conn_pool = redis.ConnectionPool(**self._connection_info())
+        self._redis_conn = redis.Redis(connection_pool=self._redis_conn_pool)
+        self._async_redis_conn = None
+
+    @property
+    def redis_conn(self) -> redis.Redis:
+        """Return the redis client of this process."""
+        if self._pid != os.getpid():
+            self._set_conn_pool()
+        return self._redis_conn
 
     @property
-    def redis_conn(self):
-        """Return a redis connection object."""
-        return redis.Redis(connection_pool=self._redis_conn_pool)
+    def async_redis_conn(self) -> redis.asyncio.Redis:
+        """Return the asyncio redis client of this process, created with the same config."""
+        if self._pid != os.getpid():
+            self._set_conn_pool()
+        if self._async_redis_conn is None:
+            async_conn_pool = redis.asyncio.ConnectionPool(**self._connection_info())
+            self._async_redis_conn = redis.asyncio.Redis(connection_pool=async_conn_pool)
+        return self._async_redis_conn
+
+    async def close_async_conn(self):
+        """Disconnect the asyncio redis client."""
+        if self._async_redis_conn is not None:
+            await self._async_redis_conn.connection_pool.disconnect()
+            self._async_redis_conn = None
+
+    def pool_stats(self) -> Dict[str, float]:
+        """Return the usage of the connection pool, and log a warning when it is nearly saturated."""
+        pool = self._redis_conn_pool
+        in_use = len(pool._in_use_connections)
+        stats = {
+            "max_connections": pool.max_connections,
+            "created_connections": pool._created_connections,
+            "in_use_connections": in_use,
+            "available_connections": len(pool._available_connections),
+            "saturation": in_use / pool.max_connections,
+        }
+        if stats["saturation"] >= redis_config.pool_saturation_warning_ratio:
+            log.warning(f"Redis connection pool is nearly saturated: {stats}")
+        return stats
+
+    def pipeline(self, transaction: bool = True):
+        """Return a pipeline to buffer commands and send them in one round-trip.
+
+        Commands are wrapped in MULTI/EXEC when transaction is True.
+
+        Examples:
+            >>> with RedisOperator().pipeline() as pipe:
+            ...     pipe.set("a", 1).incr("b")
+            ...     results = pipe.execute()
+        """
+        return self.redis_conn.pipeline(transaction=transaction)
+
+    def transaction(self, func, *watches: str, value_from_callable: bool = False):
+        """Run func(pipe) as an optimistic transaction, retry while the watched keys change."""
+        return self.redis_conn.transaction(func, *watches, value_from_callable=value_from_callable)
+
+    def register_script(self, script: str):
+        """Return a callable Lua script, which is run with EVALSHA and falls back to EVAL."""
+        return self.redis_conn.register_script(script)
 
     def set(self, name: str, value, ex=None, px=None, nx=False, xx=False):
-        """Append one or multiple elements to a list."""
+        """Set the value at key ``name`` to ``value``."""
         return self.redis_conn.set(name=name, value=value, ex=ex, px=px, nx=nx, xx=xx)
+
+    def get(self, name: str):
+        """Return the value at key ``name``, or None if the key doesn't exist."""
+        return self.redis_conn.get(name=name)
+
+    def mget(self, keys: List[str]) -> list:
+        """Return a list of values ordered identically to ``keys``."""
+        return self.redis_conn.mget(keys)
+
+    def mset(self, mapping: Dict[str, object], ex: Optional[int] = None) -> bool:
+        """Set key/values in ``mapping``, all keys expire after ``ex`` seconds if given."""
+        if ex is None:
+            return self.redis_conn.mset(mapping)
+        with self.pipeline() as pipe:
+            for name, value in mapping.items():
+                pipe.set(name, value, ex=ex)
+            return all(pipe.execute())
+
+    def delete(self, *names: str) -> int:
+        """Delete one or more keys specified by ``names``."""
+        return self.redis_conn.delete(*names)
+
+    def exists(self, *names: str) -> int:
+        """Return the number of ``names`` that exist."""
+        return self.redis_conn.exists(*names)
+
+    def expire(self, name: str, time: int) -> bool:
+        """Set an expire flag on key ``name`` for ``time`` seconds."""
+        return self.redis_conn.expire(name, time)
+
+    def incr(self, name: str, amount: int = 1) -> int:
+        """Increment the value of key ``name`` by ``amount``."""
+        return self.redis_conn.incr(name, amount)
+
+    def scan_iter(self, match: str = None, count: int = None):
+        """Make an iterator using the SCAN command."""
+        return self.redis_conn.scan_iter(match=match, count=count)
+
+    def hget(self, name: str, key: str):
+        """Return the value of ``key`` within the hash ``name``."""
+        return self.redis_conn.hget(name, key)
+
+    def hmget(self, name: str, keys: List[str]) -> list:
+        """Return a list of values ordered identically to ``keys`` within the hash ``name``."""
+        return self.redis_conn.hmget(name, keys)
+
+    def hgetall(self, name: str) -> dict:
+        """Return a Python dict of the hash's name/value pairs."""
+        return self.redis_conn.hgetall(name)
+
+    def hset(self, name: str, key: str = None, value=None, mapping: Dict[str, object] = None) -> int:
+        """Set ``key`` to ``value`` and/or the pairs of ``mapping`` within the hash ``name``."""
+        return self.redis_conn.hset(name, key=key, value=value, mapping=mapping)
+
+    def hincrby(self, name: str, key: str, amount: int = 1) -> int:
+        """Increment the value of ``key`` in hash ``name`` by ``amount``."""
+        return self.redis_conn.hincrby(name, key, amount)
+
+    def hdel(self, name: str, *keys: str) -> int:
+        """Delete ``keys`` from hash ``name``."""
+        return self.redis_conn.hdel(name, *keys)
+
+    def xadd(self, name: str, fields: Dict[str, object], maxlen: int = None, approximate: bool = True):
+        """Add to a stream, the stream is trimmed to about ``maxlen`` entries if given."""
+        return self.redis_conn.xadd(name, fields, maxlen=maxlen, approximate=approximate)
+
+    def xlen(self, name: str) -> int:
+        """Return the number of elements in a given stream."""
+        return self.redis_conn.xlen(name)
+
+    def xrange(self, name: str, min: str = "-", max: str = "+", count: int = None) -> list:
+        """Read stream values within an interval."""
+        # pylint: disable=redefined-builtin
+        return self.redis_conn.xrange(name, min=min, max=max, count=count)
+
+    def xread(self, streams: Dict[str, str], count: int = None, block: int = None) -> list:
+        """Block and monitor multiple streams for new data."""
+        return self.redis_conn.xread(streams, count=count, block=block)
+
+    def xtrim(self, name: str, maxlen: int, approximate: bool = True) -> int:
+        """Trim old messages from a stream."""
+        return self.redis_conn.xtrim(name, maxlen, approximate=approximate)
+
+    def publish(self, channel: str, message) -> int:
+        """Publish ``message`` on ``channel``."""
+        return self.redis_conn.publish(channel, message)
+
+    def pubsub(self, **kwargs):
+        """Return a Publish/Subscribe object."""
+        return self.redis_conn.pubsub(**kwargs)
@@ -6,7 +6,7 @@ from config.logger_setting import log
 from src.data_models.auth import ChangePasswordRequest
 from src.data_models.common import BaseResponse
 from src.data_models.user import User
-from src.security.auth import get_current_user
+from src.security.auth import get_current_user, revoke_token
 from src.service.user import UserService
 
 
@@ -45,11 +45,16 @@ def create_auth_router():
         return BaseResponse()
 
     @router.post("/logout")
-    def logout(current_user: User = Depends(get_current_user)):
+    def logout(
+            current_user: User = Depends(get_current_user),
+            revoked: bool = Depends(revoke_token)
+        ):
         """Special API call to record the 'logout' of the user to the Audit Logs.
-        Since platform uses JWT,
-        the actual logout is the procedure of clearing the JWT token on the client side.
+        The JWT token used to perform this REST API call is revoked until it expires,
+        the client side should still clear the JWT token.
         """
+        if not revoked:
+            log.warning(f"{current_user.account} logged out without revoking the token.")
         log.info(f"{current_user.account} logged out.")
 
     return router
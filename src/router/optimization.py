@@ -0,0 +1,98 @@
+"""This module contains function to create the optimization router."""
+# pylint: disable=unused-variable
+from fastapi import APIRouter, HTTPException, Security, status
+
+from config.logger_setting import log
+from src.data_models.common import BaseResponse
+from src.data_models.optimization import (
+    OptimizationRequest,
+    OptimizationStatusResponse,
+    OptimizationSubmitResponse
+)
+from src.data_models.user import User
+from src.security.auth import get_current_user
+from src.service.optimization import OptimizationService
+from src.util.authorities import Authorities
+
+
+def create_optimization_router():
+    """Create the optimization API router.
+    Returns an instance of fastapi.routing.APIRouter.
+    """
+    router = APIRouter()
+    service = OptimizationService()
+
+    @router.post("/", response_model=OptimizationSubmitResponse)
+    def submit_optimization(
+            optimization_request: OptimizationRequest,
+            current_user: User = Security(get_current_user, scopes=[Authorities.MEMBER_USER])
+        ):
+        """Submit an optimization, it runs on the celery workers.
+        Poll the status API with the returned task_id to get the progress and result.
+        The task of an identical request is returned if there is one (deduplicated).
+        """
+        try:
+            task_id, deduplicated = service.submit(optimization_request)
+            return OptimizationSubmitResponse(
+                message="Optimization of an identical request" if deduplicated else "Optimization submitted",
+                task_id=task_id,
+                deduplicated=deduplicated
+            )
+        except Exception as e:
+            log.error(e)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error"
+            )
+
+    @router.delete("/cache", response_model=BaseResponse)
+    def invalidate_optimization_cache(
+            current_user: User = Security(get_current_user, scopes=[Authorities.SYS_ADMIN])
+        ):
+        """Forget the tasks of all requests, so the next identical requests run again.
+        Use it when the input data changes without a new data_version.
+        """
+        try:
+            service.invalidate()
+            return BaseResponse()
+        except Exception as e:
+            log.error(e)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error"
+            )
+
+    @router.get("/{task_id}", response_model=OptimizationStatusResponse)
+    def get_optimization_status(
+            task_id: str,
+            current_user: User = Security(get_current_user, scopes=[Authorities.MEMBER_USER])
+        ):
+        """Get the status of an optimization.
+        The progress is given while it is running (PROGRESS), and the result when it succeeds (SUCCESS).
+        """
+        try:
+            return service.get_status(task_id)
+        except Exception as e:
+            log.error(e)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error"
+            )
+
+    @router.delete("/{task_id}", response_model=BaseResponse)
+    def cancel_optimization(
+            task_id: str,
+            current_user: User = Security(get_current_user, scopes=[Authorities.MEMBER_USER])
+        ):
+        """Cancel an optimization, it is terminated if it is running."""
+        try:
+            service.cancel(task_id)
+            return BaseResponse()
+        except Exception as e:
+            log.error(e)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error"
+            )
+
+    return router
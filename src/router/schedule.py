@@ -0,0 +1,89 @@
+"""This module contains function to create the schedule router."""
+# pylint: disable=unused-variable
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Security, status
+
+from config.logger_setting import log
+from src.data_models.common import BaseResponse
+from src.data_models.schedule import ScheduleJob, ScheduleJobRun
+from src.data_models.user import User
+from src.security.auth import get_current_user
+from src.service.schedule_job import ScheduleJobService
+from src.util.authorities import Authorities
+
+
+def create_schedule_router():
+    """Create the schedule API router.
+    Returns an instance of fastapi.routing.APIRouter.
+    """
+    router = APIRouter()
+    service = ScheduleJobService()
+
+    @router.get("/jobs", response_model=List[ScheduleJob])
+    def get_jobs(
+            current_user: User = Security(get_current_user, scopes=[Authorities.SYS_ADMIN])
+        ):
+        """Get all scheduled jobs with their next run time and last run."""
+        try:
+            return service.find_all()
+        except Exception as e:
+            log.error(e)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error"
+            )
+
+    @router.get("/jobs/{job_id}/runs", response_model=List[ScheduleJobRun])
+    def get_job_runs(
+            job_id: str,
+            limit: int = 20,
+            current_user: User = Security(get_current_user, scopes=[Authorities.SYS_ADMIN])
+        ):
+        """Get the latest runs of the job, the latest first."""
+        try:
+            job_runs = service.get_job_runs(job_id, limit)
+            if job_runs is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Job not found"
+                )
+            return job_runs
+        except HTTPException as http_ex:
+            raise http_ex
+        except Exception as e:
+            log.error(e)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error"
+            )
+
+    @router.post("/jobs/{job_id}/run", response_model=BaseResponse)
+    def run_job(
+            job_id: str,
+            current_user: User = Security(get_current_user, scopes=[Authorities.SYS_ADMIN])
+        ):
+        """Run the job now on the running scheduler, its following runs are not changed."""
+        try:
+            triggered = service.trigger_job(job_id)
+            if triggered is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Job not found"
+                )
+            if not triggered:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="No scheduler is running"
+                )
+            return BaseResponse()
+        except HTTPException as http_ex:
+            raise http_ex
+        except Exception as e:
+            log.error(e)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error"
+            )
+
+    return router
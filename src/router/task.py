@@ -0,0 +1,37 @@
+"""This module contains function to create the celery task router."""
+# pylint: disable=unused-variable
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Security, status
+
+from config.logger_setting import log
+from src.data_models.celery import QueueStats
+from src.data_models.user import User
+from src.security.auth import get_current_user
+from src.service.event.celery_app import celery_app
+from src.service.event.queue_metrics import QueueMetrics
+from src.util.authorities import Authorities
+
+
+def create_task_router():
+    """Create the celery task API router.
+    Returns an instance of fastapi.routing.APIRouter.
+    """
+    router = APIRouter()
+    queue_metrics = QueueMetrics(celery_app)
+
+    @router.get("/queues", response_model=List[QueueStats])
+    def get_queue_stats(
+            current_user: User = Security(get_current_user, scopes=[Authorities.SYS_ADMIN])
+        ):
+        """Get the number of waiting tasks and the wait time of the oldest one of every queue."""
+        try:
+            return queue_metrics.get_queue_stats()
+        except Exception as e:
+            log.error(e)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error"
+            )
+
+    return router
@@ -8,10 +8,13 @@ from jose import JWTError, jwt
 from config.project_setting import security_config
 from src.data_models.auth import TokenData
 from src.data_models.user import User
+from src.operator.redis import RedisOperator
+from src.service.event.redis.token_revocation import TokenRevocationAdmin
 from src.service.user import UserService
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="v1/auth/login")
 user_service = UserService()
+token_revocation_admin = TokenRevocationAdmin(RedisOperator())
 
 
 def get_current_user(security_scopes: SecurityScopes, token: str = Depends(oauth2_scheme)) -> User:
@@ -27,7 +30,7 @@ def get_current_user(security_scopes: SecurityScopes, token: str = Depends(oauth
 
         Raises:
             HTTPException: Raises a 401_UNAUTHORIZED if the token can not be validate,
-                           or the scopes do not match.
+                           or has been revoked, or the scopes do not match.
 
         Examples:
             Requires to use the API with the authority of ADMIN_GROUP:
@@ -54,6 +57,9 @@ def get_current_user(security_scopes: SecurityScopes, token: str = Depends(oauth
     except JWTError:
         raise credentials_exception
 
+    if token_revocation_admin.is_revoked(token_data.jti):
+        raise credentials_exception
+
     if not _check_scopes(security_scopes.scopes, token_data.scopes):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -66,6 +72,24 @@ def get_current_user(security_scopes: SecurityScopes, token: str = Depends(oauth
         raise credentials_exception
     return user
 
+def revoke_token(token: str = Depends(oauth2_scheme)) -> bool:
+    """Revoke the JWT token until it expires, typically called by FastAPI.Depends.
+
+        Parameters:
+            token: JWT token get from request header.
+
+        Returns:
+            True if the token is revoked, False if the token has no `jti` claim or can not be revoked.
+    """
+    try:
+        payload = jwt.decode(token, security_config.secret_key, algorithms=[security_config.algorithm])
+        token_data = TokenData(**payload)
+    except JWTError:
+        return False
+    if not token_data.jti:
+        return False
+    return token_revocation_admin.revoke(token_data.jti, token_data.exp)
+
 def _check_scopes(expected_scopes: List[str], actual_scopes: List[str]) -> bool:
     """Check if all the expected scopes match to the actual ones.
 
@@ -6,6 +6,7 @@ from jose import jwt
 from passlib.context import CryptContext
 import secrets
 import string
+import uuid
 from config.project_setting import security_config
 from src.data_models.auth import TokenData
 from src.data_models.user import User
@@ -58,7 +59,8 @@ def get_access_token(user: User, expires_delta: Optional[timedelta] = None) -> s
         account=user.account,
         user_id=str(user.id),
         iat=issued,
-        exp=expire
+        exp=expire,
+        jti=uuid.uuid4().hex
     )
     encoded_jwt = jwt.encode(token_data.dict(), security_config.secret_key, algorithm=security_config.algorithm)
     return encoded_jwt
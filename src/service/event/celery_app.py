@@ -1,6 +1,11 @@
 """This file is the celery application."""
 from celery import Celery
+from celery.signals import before_task_publish
 from config.celery_config import ProdConfig
+from src.service.event.queue_metrics import stamp_enqueued_at
+from src.service.event.serializer import register_serializer
 
+register_serializer()
 celery_app = Celery('celery_app')
 celery_app.config_from_object(ProdConfig)
+before_task_publish.connect(stamp_enqueued_at, weak=False)
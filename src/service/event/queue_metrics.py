@@ -0,0 +1,71 @@
+"""This file reads the depth and the wait time of the celery queues from the redis broker."""
+import json
+import time
+from typing import List, Optional
+
+from celery import Celery
+
+from src.data_models.celery import QueueStats
+
+ENQUEUED_AT_HEADER = "enqueued_at"
+
+
+def stamp_enqueued_at(headers: Optional[dict] = None, **kwargs) -> None:
+    """before_task_publish signal handler, stamp the publish time on the message headers."""
+    if headers is not None:
+        headers.setdefault(ENQUEUED_AT_HEADER, time.time())
+
+
+class QueueMetrics:
+    """This class reads the queue metrics of a celery app using the redis broker.
+
+    A queue is stored as one redis list per priority step, messages are pushed on the
+    left and consumed from the right, so the oldest message of a list is its last item.
+    """
+
+    def __init__(self, app: Celery):
+        self.app = app
+
+    def get_queue_stats(self) -> List[QueueStats]:
+        """Get the number of waiting messages and the wait time of the oldest one of every queue."""
+        with self.app.connection_for_read() as connection:
+            channel = connection.default_channel
+            client = channel.client
+            queue_keys = {
+                queue.name: [self._priority_key(queue.name, priority, channel.sep) for priority in channel.priority_steps]
+                for queue in self.app.conf.task_queues
+            }
+            pipeline = client.pipeline(transaction=False)
+            for keys in queue_keys.values():
+                for key in keys:
+                    pipeline.llen(key)
+                    pipeline.lindex(key, -1)
+            replies = iter(pipeline.execute())
+
+        now = time.time()
+        queue_stats = []
+        for name, keys in queue_keys.items():
+            depth, enqueued_at = 0, []
+            for _ in keys:
+                depth += next(replies)
+                oldest_message = next(replies)
+                if oldest_message is not None:
+                    enqueued_at.append(self._get_enqueued_at(oldest_message))
+            enqueued_at = [value for value in enqueued_at if value is not None]
+            queue_stats.append(QueueStats(
+                name=name,
+                depth=depth,
+                oldest_wait_seconds=now - min(enqueued_at) if enqueued_at else None
+            ))
+        return queue_stats
+
+    @staticmethod
+    def _priority_key(queue: str, priority: int, sep: str) -> str:
+        return f"{queue}{sep}{priority}" if priority else queue
+
+    @staticmethod
+    def _get_enqueued_at(message: bytes) -> Optional[float]:
+        try:
+            return json.loads(message)["headers"].get(ENQUEUED_AT_HEADER)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return None
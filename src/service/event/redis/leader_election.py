@@ -0,0 +1,110 @@
+"""Contains a leader election class."""
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Callable, Optional
+
+from config.logger_setting import log
+from src.service.event.redis.lock_admin import LockAdmin
+
+
+class LeaderElection:
+    """Lease based leader election on a named redis lock.
+
+    A background thread renews the lease while this process is the leader, or tries to
+    acquire it otherwise. If the leader dies, its lease expires and another candidate
+    takes over within `lease_seconds + renew_interval_seconds`.
+
+    Attributes:
+        name: str
+            name of the lock to elect on.
+        owner: str
+            unique value of this candidate.
+        fencing_token: int
+            fencing token of the current leadership, 0 if this process is not the leader.
+    """
+    def __init__(
+            self,
+            lock_admin: LockAdmin,
+            name: str,
+            lease_seconds: int,
+            renew_interval_seconds: float,
+            on_elected: Optional[Callable[[int], None]] = None,
+            on_revoked: Optional[Callable[[], None]] = None
+        ):
+        if renew_interval_seconds >= lease_seconds:
+            raise ValueError("renew_interval_seconds should be shorter than lease_seconds")
+        self.lock_admin = lock_admin
+        self.name = name
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+        self.lease_ms = int(lease_seconds * 1000)
+        self.renew_interval_seconds = renew_interval_seconds
+        self.on_elected = on_elected
+        self.on_revoked = on_revoked
+        self.fencing_token = 0
+        self._renewed_at = 0.0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def is_leader(self) -> bool:
+        """Return True if this process holds an unexpired lease."""
+        return self.fencing_token > 0 and time.monotonic() - self._renewed_at < self.lease_ms / 1000
+
+    def start(self) -> None:
+        """Start campaigning in a daemon thread."""
+        if self._thread:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=f"leader-election-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop campaigning, and release the lease if this process is the leader."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.renew_interval_seconds)
+            self._thread = None
+        if self.fencing_token:
+            try:
+                self.lock_admin.release(self.name, self.owner)
+            except Exception as exc:
+                log.error(f"Failed to release the leader lease of {self.name}: {exc}")
+            self._step_down()
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self._campaign()
+            except Exception as exc:
+                log.error(f"Leader election of {self.name} failed: {exc}")
+                # the lease may have expired on redis while it is unreachable
+                if self.fencing_token and not self.is_leader:
+                    self._step_down()
+            self._stop_event.wait(self.renew_interval_seconds)
+
+    def _campaign(self) -> None:
+        if self.fencing_token:
+            renewed_at = time.monotonic()
+            if self.lock_admin.renew(self.name, self.owner, self.lease_ms):
+                self._renewed_at = renewed_at
+            else:
+                self._step_down()
+            return
+
+        acquired_at = time.monotonic()
+        fencing_token = self.lock_admin.acquire(self.name, self.owner, self.lease_ms)
+        if fencing_token:
+            self.fencing_token = fencing_token
+            self._renewed_at = acquired_at
+            log.info(f"{self.owner} is elected as the leader of {self.name}, fencing token: {fencing_token}.")
+            if self.on_elected:
+                self.on_elected(fencing_token)
+
+    def _step_down(self) -> None:
+        log.warning(f"{self.owner} is no more the leader of {self.name}.")
+        self.fencing_token = 0
+        if self.on_revoked:
+            self.on_revoked()
@@ -1,18 +1,104 @@
 """Contains a lock class."""
-# pylint: disable=too-few-public-methods
+from typing import Optional
 
 from src.operator.redis import RedisOperator
 
 
 class LockAdmin:
-    """A lock class define a lock function."""
+    """A lock class define a lock function.
+
+    Named locks are leases owned by a unique owner value, they expire unless renewed.
+    Each successful acquire increases a fencing token of the lock, so a former owner
+    whose lease has expired can be detected by comparing its token with the current one.
+    """
 
     SET_NAME = "lock"
+    KEY_PREFIX = "lock"
+    FENCING_PREFIX = "lock_fencing"
+
+    # SET NX PX and INCR the fencing token atomically, return 0 if the lock is taken.
+    ACQUIRE_SCRIPT = """
+    if redis.call('set', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then
+        return redis.call('incr', KEYS[2])
+    end
+    return 0
+    """
+    # Compare-and-expire, only the owner can renew the lock.
+    RENEW_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('pexpire', KEYS[1], ARGV[2])
+    end
+    return 0
+    """
+    # Compare-and-delete, only the owner can release the lock.
+    RELEASE_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('del', KEYS[1])
+    end
+    return 0
+    """
 
     """A class for set lock."""
     def __init__(self, operator: RedisOperator):
         self.operator = operator
+        self._acquire_script = operator.register_script(self.ACQUIRE_SCRIPT)
+        self._renew_script = operator.register_script(self.RENEW_SCRIPT)
+        self._release_script = operator.register_script(self.RELEASE_SCRIPT)
 
     def set_lock(self, value: str, ex: int = None, nx: bool = False) -> bool:
         """Set a lock"""
         return self.operator.set(self.SET_NAME, value=value, ex=ex, nx=nx)
+
+    def _lock_key(self, name: str) -> str:
+        return f"{self.KEY_PREFIX}:{name}"
+
+    def _fencing_key(self, name: str) -> str:
+        return f"{self.FENCING_PREFIX}:{name}"
+
+    def acquire(self, name: str, owner: str, ttl_ms: int) -> int:
+        """Acquire a named lock.
+
+        Parameters:
+            name: name of the lock.
+            owner: unique value of the caller, needed to renew and release the lock.
+            ttl_ms: lease of the lock in milliseconds.
+
+        Returns:
+            the fencing token of this ownership, or 0 if the lock is held by others.
+        """
+        return int(self._acquire_script(
+            keys=[self._lock_key(name), self._fencing_key(name)],
+            args=[owner, ttl_ms],
+            client=self.operator.redis_conn
+        ))
+
+    def renew(self, name: str, owner: str, ttl_ms: int) -> bool:
+        """Extend the lease of a lock, fail if the lock is no more held by owner."""
+        return bool(self._renew_script(
+            keys=[self._lock_key(name)],
+            args=[owner, ttl_ms],
+            client=self.operator.redis_conn
+        ))
+
+    def release(self, name: str, owner: str) -> bool:
+        """Release a lock, fail if the lock is no more held by owner."""
+        return bool(self._release_script(
+            keys=[self._lock_key(name)],
+            args=[owner],
+            client=self.operator.redis_conn
+        ))
+
+    def get_owner(self, name: str) -> Optional[str]:
+        """Return the owner of a lock, or None if the lock is free."""
+        owner = self.operator.get(self._lock_key(name))
+        if isinstance(owner, bytes):
+            owner = owner.decode("utf-8")
+        return owner
+
+    def get_fencing_token(self, name: str) -> int:
+        """Return the fencing token of the latest acquire of a lock."""
+        return int(self.operator.get(self._fencing_key(name)) or 0)
+
+    def is_fencing_token_valid(self, name: str, fencing_token: int) -> bool:
+        """Check no one has acquired the lock since the acquire that returned fencing_token."""
+        return fencing_token > 0 and fencing_token == self.get_fencing_token(name)
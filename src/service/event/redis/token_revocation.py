@@ -0,0 +1,136 @@
+"""Contains a token revocation class."""
+import threading
+import time
+from datetime import datetime
+
+from config.logger_setting import log
+from config.project_setting import security_config
+from src.operator.redis import RedisOperator
+from src.util.bloom_filter import BloomFilter
+
+
+class TokenRevocationAdmin:
+    """A class to revoke JWT tokens by their `jti` claim.
+
+    Revoked ids are stored in redis until the token expires, and published to the other workers.
+    Each worker keeps a local bloom filter of revoked ids, so only a filter hit costs a redis round-trip.
+    """
+
+    KEY_PREFIX = "revoked_token"
+    CHANNEL = "revoked_token"
+
+    def __init__(self, operator: RedisOperator):
+        self.operator = operator
+        self._bloom_filter = self._new_bloom_filter()
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        # the ids revoked while sync rebuilds the bloom filter, None when no sync is running
+        self._pending = None
+        self._pubsub = None
+        self._pubsub_thread = None
+        self._resync_thread = None
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def _new_bloom_filter() -> BloomFilter:
+        return BloomFilter(
+            capacity=security_config.revoked_token_bloom_capacity,
+            error_rate=security_config.revoked_token_bloom_error_rate
+        )
+
+    def _key(self, jti: str) -> str:
+        return f"{self.KEY_PREFIX}:{jti}"
+
+    def revoke(self, jti: str, expires_at: datetime) -> bool:
+        """Revoke a token until it expires.
+
+        Parameters:
+            jti: the `jti` claim of the token.
+            expires_at: the `exp` claim of the token.
+
+        Returns:
+            status of revoking the token.
+        """
+        ttl = int(expires_at.timestamp() - time.time()) + 1
+        if ttl <= 0:
+            return True
+        with self.operator.pipeline() as pipe:
+            pipe.set(self._key(jti), value=1, ex=ttl)
+            pipe.publish(self.CHANNEL, jti)
+            stored, _ = pipe.execute()
+        if not stored:
+            return False
+        self._add(jti)
+        return True
+
+    def is_revoked(self, jti: str) -> bool:
+        """Check if a token is revoked, redis is only asked when the bloom filter hits."""
+        if not jti or jti not in self._bloom_filter:
+            return False
+        return bool(self.operator.exists(self._key(jti)))
+
+    def _add(self, jti: str) -> None:
+        """add a revoked id to the bloom filter, and to the pending ids of a running sync"""
+        with self._lock:
+            self._bloom_filter.add(jti)
+            if self._pending is not None:
+                self._pending.add(jti)
+
+    def sync(self) -> None:
+        """Rebuild the bloom filter from the revoked ids stored in redis.
+
+        The ids revoked during the scan are added to the new bloom filter before it replaces the old one.
+        """
+        with self._sync_lock:
+            with self._lock:
+                self._pending = set()
+            try:
+                bloom_filter = self._new_bloom_filter()
+                prefix_len = len(self.KEY_PREFIX) + 1
+                for key in self.operator.scan_iter(match=self._key("*"), count=1000):
+                    if isinstance(key, bytes):
+                        key = key.decode("utf-8")
+                    bloom_filter.add(key[prefix_len:])
+                with self._lock:
+                    for jti in self._pending:
+                        bloom_filter.add(jti)
+                    self._bloom_filter = bloom_filter
+            finally:
+                with self._lock:
+                    self._pending = None
+
+    def start_listener(self) -> None:
+        """Load the revoked ids and keep the bloom filter in sync through pub/sub."""
+        if self._pubsub_thread:
+            return
+        self._stop_event.clear()
+        self._pubsub = self.operator.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{self.CHANNEL: self._on_message})
+        self.sync()
+        self._pubsub_thread = self._pubsub.run_in_thread(sleep_time=1, daemon=True)
+        self._resync_thread = threading.Thread(target=self._resync_loop, name="token-revocation-resync", daemon=True)
+        self._resync_thread.start()
+        log.info("Start token revocation listener.")
+
+    def stop_listener(self) -> None:
+        """Stop the pub/sub listener."""
+        self._stop_event.set()
+        if self._pubsub_thread:
+            self._pubsub_thread.stop()
+            self._pubsub_thread = None
+        if self._pubsub:
+            self._pubsub.close()
+            self._pubsub = None
+
+    def _on_message(self, message) -> None:
+        jti = message["data"]
+        if isinstance(jti, bytes):
+            jti = jti.decode("utf-8")
+        self._add(jti)
+
+    def _resync_loop(self) -> None:
+        while not self._stop_event.wait(security_config.revoked_token_resync_seconds):
+            try:
+                self.sync()
+            except Exception as exc:
+                log.error(f"Failed to sync revoked tokens: {exc}")
@@ -0,0 +1,66 @@
+"""This file defines a compact binary serializer for celery messages and results.
+
+Numpy arrays are packed as msgpack extensions holding the dtype, the shape and the raw
+buffer instead of nested JSON lists, buffers larger than COMPRESS_THRESHOLD bytes are
+compressed with zlib.
+"""
+import os
+import zlib
+from datetime import datetime
+
+import msgpack
+import numpy as np
+from kombu.serialization import register
+
+SERIALIZER_NAME = "msgpack-numpy"
+CONTENT_TYPE = "application/x-msgpack-numpy"
+COMPRESS_THRESHOLD = int(os.getenv("CELERY_COMPRESS_THRESHOLD", 4096))
+COMPRESS_LEVEL = 1
+
+NDARRAY_EXT_CODE = 1
+DATETIME_EXT_CODE = 2
+
+
+def _default(obj):
+    """Pack the objects which msgpack doesn't support."""
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.hasobject:
+            return obj.tolist()
+        buffer = np.ascontiguousarray(obj).tobytes()
+        compressed = len(buffer) > COMPRESS_THRESHOLD
+        if compressed:
+            buffer = zlib.compress(buffer, COMPRESS_LEVEL)
+        header = [obj.dtype.str, list(obj.shape), compressed]
+        return msgpack.ExtType(NDARRAY_EXT_CODE, msgpack.packb(header + [buffer], use_bin_type=True))
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, datetime):
+        return msgpack.ExtType(DATETIME_EXT_CODE, obj.isoformat().encode("utf-8"))
+    raise TypeError(f"Object of type {type(obj).__name__} is not msgpack serializable")
+
+
+def _ext_hook(code: int, data: bytes):
+    """Unpack the extensions packed by _default."""
+    if code == NDARRAY_EXT_CODE:
+        dtype, shape, compressed, buffer = msgpack.unpackb(data, raw=False)
+        if compressed:
+            buffer = zlib.decompress(buffer)
+        return np.frombuffer(buffer, dtype=np.dtype(dtype)).reshape(shape).copy()
+    if code == DATETIME_EXT_CODE:
+        return datetime.fromisoformat(data.decode("utf-8"))
+    return msgpack.ExtType(code, data)
+
+
+def dumps(obj) -> bytes:
+    """Serialize obj into msgpack bytes."""
+    return msgpack.packb(obj, default=_default, use_bin_type=True)
+
+
+def loads(data: bytes):
+    """Deserialize msgpack bytes."""
+    return msgpack.unpackb(data, ext_hook=_ext_hook, raw=False, strict_map_key=False)
+
+
+def register_serializer() -> None:
+    """Register the serializer to kombu, so celery accepts it by SERIALIZER_NAME."""
+    register(SERIALIZER_NAME, dumps, loads, content_type=CONTENT_TYPE, content_encoding="binary")
@@ -0,0 +1,15 @@
+"""This file defines the celery tasks of notifications, they are routed to the short queue."""
+from typing import Dict
+
+from src.service.event.celery_app import celery_app
+from src.util.notify import notify_groups_by_notify_task
+
+
+@celery_app.task(priority=0)
+def send_line_notify(line_notify_task: Dict[str, str]) -> None:
+    """Notify groups by line notify.
+
+    Parameters:
+        line_notify_task: the information contains line notify info and tokens.
+    """
+    notify_groups_by_notify_task(line_notify_task)
@@ -0,0 +1,102 @@
+"""This file defines the celery tasks of the optimizer."""
+import os
+from functools import partial
+
+import numpy as np
+
+from config.logger_setting import log
+from config.project_setting import optimization_config
+from src.service.event.celery_app import celery_app
+from src.service.optimizer.fitness import cost_and_contract_batch, weighted_cost_batch
+from src.service.optimizer.gene_change import GeneChange
+from src.service.optimizer.genetic_optimizer import GeneticOptimizer
+from src.service.optimizer.island_model import IslandModel
+
+
+@celery_app.task(bind=True, acks_late=True, reject_on_worker_lost=True)
+def run_optimization(self, request: dict) -> dict:
+    """Run a GA optimization, the progress is written to the result backend every generation
+    (every migration with islands).
+
+    The task is acknowledged when it ends, so the broker redelivers it if the worker is lost,
+    and a single population run resumes from its last checkpoint (see optimization_config).
+
+    Parameters:
+        request: an OptimizationRequest in dict.
+
+    Returns:
+        an OptimizationResult in dict, best_phenotype is a numpy array, and pareto_front is a dict
+        of the phenotypes and objectives arrays with contract_objective.
+    """
+    def report_progress(optimizer) -> None:
+        self.update_state(state="PROGRESS", meta={
+            "generation": optimizer.generation,
+            "generations": optimizer.generations,
+            "best_fit": optimizer.best_fit
+        })
+
+    cost_weights = np.array(request["cost_weights"], dtype=float)
+    contract_objective = request.get("contract_objective", False)
+    optimizer_kwargs = dict(
+        accuracy=request["accuracy"],
+        future_step=request["future_step"],
+        actions=request["actions"],
+        fitness_function=partial(cost_and_contract_batch if contract_objective else weighted_cost_batch, cost_weights=cost_weights),
+        pop_size=request["pop_size"],
+        generations=request["generations"],
+        crossover_rate=request["crossover_rate"],
+        mutation_rate=GeneChange.get_gene_mutation_rate(request["mutation_rate"], request["future_step"]),
+        patience=request.get("patience"),
+        time_budget_seconds=request.get("time_budget_seconds"),
+        current_ac_status=request["current_ac_status"],
+        ac_opend=request["ac_opend"],
+        seed=request.get("seed"),
+        workers=optimization_config.fitness_workers,
+        chunk_size=optimization_config.fitness_chunk_size,
+        fitness_cache_size=optimization_config.fitness_cache_size,
+        surrogate_top_fraction=request.get("surrogate_top_fraction"),
+        memetic_interval=request.get("memetic_interval"),
+        multi_objective=contract_objective
+    )
+    if request.get("islands", 1) > 1:
+        seed = optimizer_kwargs.pop("seed")
+        optimizer = IslandModel(
+            optimizer_kwargs,
+            islands=request["islands"],
+            migration_interval=request["migration_interval"],
+            topology=request["migration_topology"],
+            seed=seed,
+            callbacks=[report_progress]
+        )
+    else:
+        checkpoint_dir = None
+        if optimization_config.checkpoint_dir:
+            checkpoint_dir = os.path.join(optimization_config.checkpoint_dir, self.request.id)
+        optimizer = GeneticOptimizer(
+            callbacks=[report_progress],
+            checkpoint_dir=checkpoint_dir,
+            checkpoint_interval=optimization_config.checkpoint_interval,
+            checkpoint_keep=optimization_config.checkpoint_keep,
+            **optimizer_kwargs
+        )
+        if optimizer.resume():
+            log.info(f"Optimization {self.request.id} resumed from generation {optimizer.generation}.")
+    result = optimizer.run()
+    # the checkpoints are kept when the run raises, so a retry or a redelivery resumes from them
+    if getattr(optimizer, "checkpoint_manager", None) is not None:
+        optimizer.checkpoint_manager.clear()
+    if result["best_fit"] is None:
+        raise ValueError("No individual has a positive fitness")
+    log.info(f"Optimization {self.request.id} finished, best fit: {result['best_fit']}, "
+             f"stopped by {result['stop_reason']} after {result['generations']} generations, timings: {result['timings']}, "
+             f"fitness cache: {result.get('fitness_cache')}.")
+    return {
+        "best_fit": result["best_fit"],
+        "best_phenotype": result["best_phenotype"],
+        "generations": result["generations"],
+        "stop_reason": result["stop_reason"],
+        "pareto_front": {
+            "phenotypes": result["pareto_front"]["phenotypes"],
+            "objectives": result["pareto_front"]["objectives"]
+        } if result.get("pareto_front") is not None else None
+    }
@@ -0,0 +1,177 @@
+"""This module contains class to for optimization service."""
+import hashlib
+import json
+import uuid
+from typing import Optional, Tuple
+
+import numpy as np
+from celery import states
+from celery.result import AsyncResult
+
+from config.logger_setting import log
+from config.project_setting import optimization_config
+from src.data_models.optimization import (
+    OptimizationProgress,
+    OptimizationRequest,
+    OptimizationResult,
+    OptimizationStatusResponse,
+    ParetoSolution
+)
+from src.operator.redis import RedisOperator
+from src.service.event.celery_app import celery_app
+from src.service.event.tasks.optimization import run_optimization
+
+
+class OptimizationService:
+    """Provide functions to run optimizations on the celery workers.
+
+    Identical requests are deduplicated: the canonical JSON of a request is hashed, and
+    the hash is mapped to the task of the first request in redis for
+    optimization_config.dedup_ttl_seconds. Later requests get that task, running or
+    finished, unless it has failed or has been cancelled.
+    """
+
+    DEDUP_KEY_PREFIX = "optimization:dedup"
+    TASK_KEY_PREFIX = "optimization:dedup_task"
+    RERUN_STATES = frozenset([states.FAILURE, states.REVOKED])
+
+    # Replace the task of a hash only if it is still the one which has been checked.
+    REPLACE_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        redis.call('set', KEYS[1], ARGV[2], 'EX', ARGV[3])
+        return 1
+    end
+    return 0
+    """
+    # Delete the hash of a task if it still maps to the task.
+    FORGET_SCRIPT = """
+    local request_hash = redis.call('get', KEYS[1])
+    redis.call('del', KEYS[1])
+    if request_hash then
+        local dedup_key = ARGV[1] .. ':' .. request_hash
+        if redis.call('get', dedup_key) == ARGV[2] then
+            redis.call('del', dedup_key)
+        end
+    end
+    return 1
+    """
+
+    def __init__(self):
+        self.redis_operator = RedisOperator()
+        self._replace_script = self.redis_operator.register_script(self.REPLACE_SCRIPT)
+        self._forget_script = self.redis_operator.register_script(self.FORGET_SCRIPT)
+
+    @staticmethod
+    def get_request_hash(optimization_request: OptimizationRequest) -> str:
+        """Hash the canonical JSON of a request, identical requests have the same hash."""
+        canonical = json.dumps(optimization_request.dict(), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _dedup_key(self, request_hash: str) -> str:
+        return f"{self.DEDUP_KEY_PREFIX}:{request_hash}"
+
+    def _task_key(self, task_id: str) -> str:
+        return f"{self.TASK_KEY_PREFIX}:{task_id}"
+
+    def submit(self, optimization_request: OptimizationRequest) -> Tuple[str, bool]:
+        """Submit an optimization task, or get the task of an identical request.
+
+        Parameters:
+            optimization_request: inputs of the optimization.
+
+        Returns:
+            the task id, and whether it is the task of an identical request.
+        """
+        request_hash = self.get_request_hash(optimization_request)
+        dedup_key = self._dedup_key(request_hash)
+        ttl = optimization_config.dedup_ttl_seconds
+        task_id = uuid.uuid4().hex
+
+        if not self.redis_operator.set(dedup_key, task_id, ex=ttl, nx=True):
+            existing_task_id = self._decode(self.redis_operator.get(dedup_key))
+            if existing_task_id is not None:
+                if AsyncResult(existing_task_id, app=celery_app).state not in self.RERUN_STATES:
+                    return existing_task_id, True
+                replaced = self._replace_script(
+                    keys=[dedup_key],
+                    args=[existing_task_id, task_id, ttl],
+                    client=self.redis_operator.redis_conn
+                )
+                if not replaced:
+                    # another request has replaced it at the same time
+                    return self.submit(optimization_request)
+            elif not self.redis_operator.set(dedup_key, task_id, ex=ttl, nx=True):
+                return self.submit(optimization_request)
+
+        self.redis_operator.set(self._task_key(task_id), request_hash, ex=ttl)
+        try:
+            run_optimization.apply_async(args=[optimization_request.dict()], task_id=task_id)
+        except Exception:
+            self._forget_task(task_id)
+            raise
+        return task_id, False
+
+    def get_status(self, task_id: str) -> OptimizationStatusResponse:
+        """Get the status, progress and result of an optimization task.
+
+        Parameters:
+            task_id: id of the task, an unknown id is reported as PENDING.
+
+        Returns:
+            an OptimizationStatusResponse object.
+        """
+        async_result = AsyncResult(task_id, app=celery_app)
+        response = OptimizationStatusResponse(task_id=task_id, status=async_result.state)
+        if async_result.state == "PROGRESS":
+            response.progress = OptimizationProgress(**async_result.info)
+        elif async_result.successful():
+            result = dict(async_result.result)
+            result["best_phenotype"] = np.asarray(result["best_phenotype"]).tolist()
+            if result.get("pareto_front") is not None:
+                result["pareto_front"] = [
+                    ParetoSolution(phenotype=phenotype.tolist(), objectives=objectives.tolist())
+                    for phenotype, objectives in zip(
+                        np.asarray(result["pareto_front"]["phenotypes"]), np.asarray(result["pareto_front"]["objectives"])
+                    )
+                ]
+            response.result = OptimizationResult(**result)
+        elif async_result.failed():
+            response.error = repr(async_result.result)
+        return response
+
+    def cancel(self, task_id: str) -> None:
+        """Cancel an optimization task, a running task is terminated.
+
+        Parameters:
+            task_id: id of the task.
+        """
+        self._forget_task(task_id)
+        celery_app.control.revoke(task_id, terminate=True)
+
+    def invalidate(self, optimization_request: Optional[OptimizationRequest] = None) -> int:
+        """Forget the task of a request, or of all requests, so the next one runs again.
+
+        Parameters:
+            optimization_request: the request to forget, None to forget all requests.
+
+        Returns:
+            the number of forgotten requests.
+        """
+        if optimization_request is not None:
+            keys = [self._dedup_key(self.get_request_hash(optimization_request))]
+        else:
+            keys = list(self.redis_operator.scan_iter(match=f"{self.DEDUP_KEY_PREFIX}:*", count=1000))
+        count = self.redis_operator.delete(*keys) if keys else 0
+        log.info(f"Invalidate {count} deduplicated optimization requests.")
+        return count
+
+    def _forget_task(self, task_id: str) -> None:
+        self._forget_script(
+            keys=[self._task_key(task_id)],
+            args=[self.DEDUP_KEY_PREFIX, task_id],
+            client=self.redis_operator.redis_conn
+        )
+
+    @staticmethod
+    def _decode(value) -> Optional[str]:
+        return value.decode("utf-8") if isinstance(value, bytes) else value
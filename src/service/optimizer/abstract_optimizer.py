@@ -0,0 +1,144 @@
+"""
+This scrip define the generation loop shared by the GA drivers
+
+initialize -> step * generations
+
+The run stops after generations, or earlier when the best fit value has not improved
+for patience generations, when time_budget_seconds has passed or when a callback returns True.
+"""
+import abc
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+
+class AbstractGeneticOptimizer(abc.ABC):
+    """An abstract class of GA driver, running the generation loop with early stopping and operator timings.
+
+    Its subclasses set gene_change in their constructor and implement initialize, step and
+    get_result. initialize sets the start of the time budget, and step sets _last_improvement
+    to the generation whose best fit value improved by more than tolerance.
+    A callback is called with the optimizer after each generation, the run stops if it
+    returns True.
+    """
+
+    STOP_GENERATIONS = "generations"
+    STOP_PLATEAU = "plateau"
+    STOP_TIME_BUDGET = "time_budget"
+    STOP_CALLBACK = "callback"
+
+    def __init__(
+        self,
+        pop_size: int,
+        generations: int,
+        crossover_rate: float,
+        mutation_rate: float,
+        crossover_method: str,
+        selection_method: str,
+        elite_size: int,
+        patience: Optional[int],
+        tolerance: float,
+        time_budget_seconds: Optional[float],
+        current_ac_status,
+        ac_opend,
+        callbacks: Sequence[Callable[["AbstractGeneticOptimizer"], Optional[bool]]]
+    ) -> None:
+        if not 0 < elite_size < pop_size:
+            raise ValueError("elite_size should be between 1 and pop_size - 1")
+        self.pop_size = pop_size
+        self.generations = generations
+        self.crossover_rate = crossover_rate
+        self.mutation_rate = mutation_rate
+        self.crossover_method = crossover_method
+        self.selection_method = selection_method
+        self.elite_size = elite_size
+        self.patience = patience
+        self.tolerance = tolerance
+        self.time_budget_seconds = time_budget_seconds
+        self.current_ac_status = current_ac_status
+        self.ac_opend = ac_opend
+        self.callbacks = list(callbacks)
+        self.gene_change = None
+
+        self.pop = None
+        self.fit_value = None
+        self.generation = 0
+        self.history = []
+        self.timings: Dict[str, float] = {}
+        self.stop_reason = None
+        self._last_improvement = 0
+        self._started_at = None
+
+    @contextmanager
+    def timed(self, operator: str):
+        """Add the time spent in the block to the timings of operator."""
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[operator] = self.timings.get(operator, 0.0) + time.perf_counter() - started_at
+
+    def repair(self, pop: np.ndarray) -> np.ndarray:
+        """Repair the AC switch of a population, if current_ac_status is given."""
+        if self.current_ac_status is None:
+            return pop
+        with self.timed("repair"):
+            return self.gene_change.repair_ac_status_index_pop(pop, self.ac_opend, self.current_ac_status)
+
+    def get_parents(self, indexes: np.ndarray) -> np.ndarray:
+        """Get the individuals of the selected indexes."""
+        return self.pop[indexes]
+
+    def get_offspring(self, indexes: np.ndarray) -> np.ndarray:
+        """Crossover, mutate and repair the selected parents."""
+        with self.timed("crossover"):
+            offspring = self.gene_change.crossover_index_pop(self.get_parents(indexes), self.crossover_rate, self.crossover_method)
+        with self.timed("mutation"):
+            offspring = self.gene_change.mutation_index_pop(offspring, self.mutation_rate)
+        return self.repair(offspring)
+
+    @abc.abstractmethod
+    def initialize(self) -> None:
+        """Create and evaluate the first population."""
+
+    @abc.abstractmethod
+    def step(self) -> None:
+        """Run one generation."""
+
+    @abc.abstractmethod
+    def get_result(self) -> dict:
+        """Get the result of the generations run so far."""
+
+    def close(self) -> None:
+        """Release the resources of the run, when it ends."""
+
+    def _should_stop(self) -> Optional[str]:
+        if self.generation >= self.generations:
+            return self.STOP_GENERATIONS
+        if self.patience is not None and self.generation - self._last_improvement >= self.patience:
+            return self.STOP_PLATEAU
+        if self.time_budget_seconds is not None and time.perf_counter() - self._started_at >= self.time_budget_seconds:
+            return self.STOP_TIME_BUDGET
+        return None
+
+    def run(self) -> dict:
+        """Run the GA until it stops.
+
+        Returns:
+            the result of get_result.
+        """
+        try:
+            if self.pop is None:
+                self.initialize()
+            self.stop_reason = self._should_stop()
+            while self.stop_reason is None:
+                self.step()
+                if any([callback(self) for callback in self.callbacks]):
+                    self.stop_reason = self.STOP_CALLBACK
+                else:
+                    self.stop_reason = self._should_stop()
+        finally:
+            self.close()
+        return self.get_result()
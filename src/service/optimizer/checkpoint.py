@@ -0,0 +1,209 @@
+"""
+This scrip define the checkpoints of long optimizer runs, to resume them after a worker restart
+
+A checkpoint is a directory generation_{generation} holding one memory-mapped .npy file per
+array (population, fit values, ...) and a state.json of the generation counter, the RNG
+states and the other scalars. It is written into a temporary directory in a background
+thread, then renamed, so a checkpoint is either complete or absent.
+"""
+import json
+import os
+import shutil
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config.logger_setting import log
+from src.service.optimizer.generation import GenerationHook
+
+
+class CheckpointManager:
+    """This class writes, lists and loads the checkpoints of a run, the last keep are retained.
+
+    save only copies the arrays in the calling thread, so the run never waits for the disk.
+    A checkpoint asked while the former one is being written waits for it, and replaces the
+    checkpoint waiting before it if any (counted in skipped).
+
+    Examples:
+        >>> checkpoint_manager = CheckpointManager("data/optimization_checkpoints/task_id", keep=2)
+        >>> checkpoint_manager.save(10, {"pop": pop, "fit_value": fit_value}, {"generation": 10})
+        >>> arrays, state = checkpoint_manager.load()
+    """
+
+    PREFIX = "generation_"
+    TEMPORARY_PREFIX = ".tmp-"
+    STATE_FILE = "state.json"
+
+    def __init__(self, directory: str, keep: int = 2) -> None:
+        if keep < 1:
+            raise ValueError("keep should be at least 1")
+        self.directory = directory
+        self.keep = keep
+        self.saved = 0
+        self.skipped = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint")
+        self._pending: Optional[Future] = None
+        self._lock = threading.Lock()
+        self._writing = False
+        self._waiting: Optional[tuple] = None
+        os.makedirs(directory, exist_ok=True)
+        # the temporary directories of writes interrupted by a restart
+        for name in os.listdir(directory):
+            if name.startswith(self.TEMPORARY_PREFIX):
+                shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+    def get_checkpoints(self) -> List[str]:
+        """Get the paths of the complete checkpoints, from the oldest."""
+        names = [name for name in os.listdir(self.directory) if name.startswith(self.PREFIX)]
+        names.sort(key=lambda name: int(name[len(self.PREFIX):]))
+        return [os.path.join(self.directory, name) for name in names]
+
+    def latest(self) -> Optional[str]:
+        """Get the path of the last complete checkpoint, None if there is none."""
+        checkpoints = self.get_checkpoints()
+        return checkpoints[-1] if checkpoints else None
+
+    def save(self, generation: int, arrays: Dict[str, np.ndarray], state: dict) -> None:
+        """Write a checkpoint in the background.
+
+        Parameters:
+            generation: the generation counter, naming the checkpoint.
+            arrays: the arrays to write into .npy files, they are copied before returning.
+            state: the JSON serializable scalars, such as RNG states (bit_generator.state).
+        """
+        checkpoint = (
+            generation,
+            {name: np.array(array, copy=True) for name, array in arrays.items() if array is not None},
+            json.loads(json.dumps(state))
+        )
+        with self._lock:
+            if self._writing:
+                if self._waiting is not None:
+                    self.skipped += 1
+                self._waiting = checkpoint
+                return
+            self._writing = True
+        self._pending = self._executor.submit(self._write_all, checkpoint)
+
+    def _write_all(self, checkpoint: tuple) -> None:
+        """write a checkpoint, then the one which has been waiting for it if any"""
+        while checkpoint is not None:
+            self._write(*checkpoint)
+            with self._lock:
+                checkpoint, self._waiting = self._waiting, None
+                if checkpoint is None:
+                    self._writing = False
+
+    def _write(self, generation: int, arrays: Dict[str, np.ndarray], state: dict) -> None:
+        path = os.path.join(self.directory, f"{self.PREFIX}{generation:08d}")
+        temporary_path = os.path.join(self.directory, f"{self.TEMPORARY_PREFIX}{uuid.uuid4().hex}")
+        try:
+            os.makedirs(temporary_path)
+            for name, array in arrays.items():
+                self._write_array(os.path.join(temporary_path, f"{name}.npy"), array)
+            with open(os.path.join(temporary_path, self.STATE_FILE), "w") as state_file:
+                json.dump(state, state_file)
+                state_file.flush()
+                os.fsync(state_file.fileno())
+            if os.path.exists(path):
+                shutil.rmtree(path)
+            os.rename(temporary_path, path)
+            self._fsync_directory()
+            self.saved += 1
+            self.remove_old_checkpoints()
+        except Exception:  # pylint: disable=broad-except
+            log.exception(f"Checkpoint of generation {generation} in {self.directory} failed.")
+            shutil.rmtree(temporary_path, ignore_errors=True)
+
+    @staticmethod
+    def _write_array(path: str, array: np.ndarray) -> None:
+        if array.size == 0:
+            np.save(path, array)
+            return
+        memmap = np.lib.format.open_memmap(path, mode="w+", dtype=array.dtype, shape=array.shape)
+        memmap[...] = array
+        memmap.flush()
+        del memmap
+
+    def _fsync_directory(self) -> None:
+        descriptor = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+    def remove_old_checkpoints(self) -> None:
+        """Remove the checkpoints older than the last keep ones."""
+        for path in self.get_checkpoints()[:-self.keep]:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def load(self, path: Optional[str] = None) -> Tuple[Dict[str, np.ndarray], dict]:
+        """Load a checkpoint, the latest one if path is None.
+
+        Returns:
+            the read-only memory-mapped arrays and the state.
+        """
+        path = self.latest() if path is None else path
+        if path is None:
+            raise FileNotFoundError(f"No checkpoint in {self.directory}")
+        arrays = {
+            name[:-len(".npy")]: np.load(os.path.join(path, name), mmap_mode="r")
+            for name in os.listdir(path) if name.endswith(".npy")
+        }
+        with open(os.path.join(path, self.STATE_FILE)) as state_file:
+            state = json.load(state_file)
+        return arrays, state
+
+    def wait(self) -> None:
+        """Wait for the checkpoint being written."""
+        if self._pending is not None:
+            self._pending.result()
+
+    def close(self) -> None:
+        """Wait for the checkpoint being written and stop the writer thread."""
+        self.wait()
+        self._executor.shutdown(wait=True)
+
+    def clear(self) -> None:
+        """Remove all checkpoints and the directory, when the run has finished."""
+        self.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class CheckpointHook(GenerationHook):
+    """This class checkpoints an optimizer every interval generations, and resumes it.
+
+    It should be the last hook, so the checkpoints hold the changes of the other hooks.
+    """
+
+    name = "checkpoint"
+
+    def __init__(self, checkpoint_manager: CheckpointManager, interval: int = 10) -> None:
+        self.checkpoint_manager = checkpoint_manager
+        self.interval = interval
+
+    def after_generation(self, optimizer) -> None:
+        if optimizer.generation % self.interval == 0:
+            self.save(optimizer)
+
+    def save(self, optimizer) -> None:
+        """Checkpoint the current generation of the optimizer in the background."""
+        arrays, state = optimizer.get_state()
+        self.checkpoint_manager.save(optimizer.generation, arrays, state)
+
+    def resume(self, optimizer, path: Optional[str] = None) -> bool:
+        """Restore the optimizer from a checkpoint, the last one if path is None.
+
+        Returns:
+            False if there is no checkpoint to resume from.
+        """
+        if path is None and self.checkpoint_manager.latest() is None:
+            return False
+        optimizer.set_state(*self.checkpoint_manager.load(path))
+        return True
+
+    def close(self) -> None:
+        self.checkpoint_manager.close()
@@ -0,0 +1,22 @@
+"""
+This scrip define the fitness functions of the optimizer, lower is better and non-positive is invalid
+"""
+import numpy as np
+
+
+def weighted_cost(phenotype: np.array, cost_weights: np.array) -> float:
+    """Sum of the action values of each feature at each step weighted by their cost"""
+    return float(np.sum(phenotype * cost_weights))
+
+
+def weighted_cost_batch(phenotypes: np.ndarray, cost_weights: np.ndarray) -> np.ndarray:
+    """weighted_cost of each phenotype of a (pop_size, number_of_features, future_step) array,
+    or of a (sites, pop_size, number_of_features, future_step) batch with (sites, number_of_features,
+    future_step) cost_weights, giving (sites, pop_size) fit values"""
+    return np.einsum("...nfs,...fs->...n", phenotypes, cost_weights)
+
+
+def cost_and_contract_batch(phenotypes: np.ndarray, cost_weights: np.ndarray, contract_feature: int = 0) -> np.ndarray:
+    """The (pop_size, 2) objectives of each phenotype: weighted_cost, and minus the normal demand
+    contract, the action value of contract_feature at the first step, as a bigger contract is better"""
+    return np.stack([weighted_cost_batch(phenotypes, cost_weights), -phenotypes[:, contract_feature, 0]], axis=1)
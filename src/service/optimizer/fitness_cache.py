@@ -0,0 +1,95 @@
+"""
+This scrip define a bounded cache of fit values keyed by the hash of the genotype
+
+The genotypes of an index population are hashed from their contiguous bytes, so the
+duplicated individuals of a population, or of former generations, are evaluated once.
+The fit value of a genotype may be a row of objectives too.
+"""
+import hashlib
+from collections import OrderedDict
+from typing import Callable, Dict, Union
+
+import numpy as np
+
+
+class FitnessCache:
+    """This class memoizes the fit values of genotypes, the least recently used ones are evicted.
+
+    Examples:
+        >>> fitness_cache = FitnessCache(max_size=100000)
+        >>> fit_value = fitness_cache.evaluate(index_pop, evaluate)
+    """
+
+    DIGEST_SIZE = 16
+
+    def __init__(self, max_size: int = 100000) -> None:
+        if max_size <= 0:
+            raise ValueError("max_size should be positive")
+        self.max_size = max_size
+        self._fit_values: "OrderedDict[bytes, Union[float, np.ndarray]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._fit_values)
+
+    @classmethod
+    def get_key(cls, genotype: np.ndarray) -> bytes:
+        """Hash a genotype, the buffer of a contiguous genotype is hashed without a copy."""
+        return hashlib.blake2b(np.ascontiguousarray(genotype), digest_size=cls.DIGEST_SIZE).digest()
+
+    @property
+    def hit_rate(self) -> float:
+        """The ratio of the genotypes which haven't been evaluated."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def evaluate(self, pop: np.ndarray, evaluate: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+        """Get the fit values of a population, only the unknown genotypes are evaluated.
+
+        Parameters:
+            pop: the index population.
+            evaluate: the function evaluating an index population.
+
+        Returns:
+            the fit values (or objectives) of the population.
+        """
+        known_individuals, known_fit_value = [], []
+        missing: Dict[bytes, list] = {}
+        for individual, genotype in enumerate(pop):
+            key = self.get_key(genotype)
+            known = self._fit_values.get(key)
+            if known is None:
+                missing.setdefault(key, []).append(individual)
+            else:
+                self._fit_values.move_to_end(key)
+                known_individuals.append(individual)
+                known_fit_value.append(known)
+        # the duplicates of an unknown genotype in the population are hits too
+        self.hits += len(pop) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            first_individuals = [individuals[0] for individuals in missing.values()]
+            missing_fit_value = np.asarray(evaluate(pop[first_individuals]), dtype=float)
+            fit_value = np.empty((len(pop),) + missing_fit_value.shape[1:], dtype=float)
+            for (key, individuals), fit in zip(missing.items(), missing_fit_value):
+                fit_value[individuals] = fit
+                self._fit_values[key] = fit.copy() if fit.ndim else float(fit)
+            while len(self._fit_values) > self.max_size:
+                self._fit_values.popitem(last=False)
+        else:
+            fit_value = np.empty((len(pop),) + np.shape(known_fit_value[0] if known_fit_value else 0.0), dtype=float)
+        if known_individuals:
+            fit_value[known_individuals] = known_fit_value
+        return fit_value
+
+    def clear(self) -> None:
+        """Forget all fit values and reset the statistics."""
+        self._fit_values.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> dict:
+        """Get the size, hits, misses and hit rate of the cache."""
+        return {"size": len(self), "hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate}
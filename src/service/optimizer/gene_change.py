@@ -1,22 +1,33 @@
 """
 This scrip define GA crossover, mutation and repair 
+
+The *_index_pop operators work on a whole index population of shape
+(pop_size, number_of_features, future_step) at once, see GeneTranslation.create_index_pop,
+or on a batch of sites (sites, pop_size, number_of_features, future_step), each site
+evolving its own population with its own accuracy.
 """
 import random
-from typing import Tuple
+from typing import Optional, Sequence, Tuple, Union
 import numpy as np
 
+from src.service.optimizer.gene_translation import get_index_upper_bound
+
 class GeneChange:
     """
     crossover: 將選出來的解部分互換 
     mutation: 將選出來的解部分突變
     """
+    CROSSOVER_METHODS = ("single_point", "two_point", "uniform")
+
     def __init__(
         self,
         accuracy: np.array,
-        future_step: int
+        future_step: int,
+        rng: Optional[np.random.Generator] = None
     ) -> None:
         self.accuracy = accuracy
         self.future_step = future_step
+        self.rng = np.random.default_rng() if rng is None else rng
     
     def crossover(self, pop: np.array, crossover_rate: float)-> np.array:
         """crossover part population chromosome"""
@@ -49,6 +60,57 @@ class GeneChange:
             genotype2[chrom] = new_chromosome2
         return genotype, genotype2
 
+    def crossover_index_pop(
+        self,
+        index_pop: np.ndarray,
+        crossover_rate: float,
+        method: str = "single_point"
+    ) -> np.ndarray:
+        """crossover an index population, all chromosomes of the mating pairs are crossed.
+
+        The individuals are paired at random, each pair mates with crossover_rate and
+        swaps the genes selected by method:
+            single_point: the genes after a random cut point of each chromosome.
+            two_point: the genes between two random cut points of each chromosome.
+            uniform: each gene with the probability 0.5.
+
+        Returns:
+            a new index population, an individual left without a pair is kept. The
+            individuals of a batch of sites are paired within their site.
+        """
+        if method not in self.CROSSOVER_METHODS:
+            raise ValueError(f"method should be one of {self.CROSSOVER_METHODS}, got {method}")
+        *batch_shape, pop_size, number_of_features, future_step = index_pop.shape
+        batch_shape = tuple(batch_shape)
+        if batch_shape:
+            order = self.rng.permuted(np.broadcast_to(np.arange(pop_size), batch_shape + (pop_size,)), axis=-1)
+        else:
+            order = self.rng.permutation(pop_size)
+        number_of_pairs = pop_size // 2
+        pairs_shape = batch_shape + (number_of_pairs,)
+        # the site of each pair for a batch of sites
+        sites = (np.arange(batch_shape[0])[:, np.newaxis],) if batch_shape else ()
+        parents1 = sites + (order[..., :number_of_pairs],)
+        parents2 = sites + (order[..., number_of_pairs:2 * number_of_pairs],)
+
+        steps = np.arange(future_step)
+        if method == "uniform":
+            swap_mask = self.rng.random(pairs_shape + (number_of_features, future_step)) < 0.5
+        else:
+            cut_points = self.rng.integers(0, future_step + 1, size=pairs_shape + (number_of_features, 2))
+            if method == "single_point":
+                swap_mask = steps >= cut_points[..., :1]
+            else:
+                cut_points.sort(axis=-1)
+                swap_mask = (steps >= cut_points[..., :1]) & (steps < cut_points[..., 1:])
+        swap_mask &= (self.rng.random(pairs_shape) < crossover_rate)[..., np.newaxis, np.newaxis]
+
+        genes1, genes2 = index_pop[parents1], index_pop[parents2]
+        new_pop = index_pop.copy()
+        new_pop[parents1] = np.where(swap_mask, genes2, genes1)
+        new_pop[parents2] = np.where(swap_mask, genes1, genes2)
+        return new_pop
+
     def mutation(self, pop: np.array, mutation_rate: float)-> np.array:
         """mutation part population chromosome"""
         for individual in range(len(pop)):
@@ -57,7 +119,52 @@ class GeneChange:
                 mutation_genotype = self.mutation_each_chromosome(genotype)
                 pop[individual] = mutation_genotype
         return pop
+
+    @staticmethod
+    def get_gene_mutation_rate(mutation_rate: float, future_step: int) -> float:
+        """the mutation rate of each gene of mutation_index_pop equivalent to the mutation rate of
+        mutation, which mutates one step of each feature of an individual with mutation_rate"""
+        return mutation_rate / future_step
     
+    def mutation_index_pop(
+        self,
+        index_pop: np.ndarray,
+        mutation_rate: Union[float, np.ndarray],
+        creep: Union[int, Sequence[int]] = 0
+    ) -> np.ndarray:
+        """mutation an index population, each gene mutates with its mutation rate.
+
+        Parameters:
+            index_pop: the index population.
+            mutation_rate: the mutation rate of all genes, of each feature (number_of_features,),
+                or of each gene (number_of_features, future_step).
+            creep: the creep step k of all features or of each feature. A mutated gene of a
+                feature with k > 0 moves by ±1..k (clipped to the actions), for ordinal
+                settings, and is redrawn among all actions if k is 0.
+
+        Returns:
+            a new index population.
+        """
+        number_of_features = index_pop.shape[-2]
+        mutation_rate = np.asarray(mutation_rate, dtype=float)
+        if mutation_rate.ndim == 1:
+            mutation_rate = mutation_rate[:, np.newaxis]
+        creep = np.broadcast_to(np.asarray(creep, dtype=np.int64), (number_of_features,))[:, np.newaxis]
+        high = get_index_upper_bound(self.accuracy, number_of_features)
+
+        # the new values are drawn for the mutated genes only
+        mutated = np.nonzero(self.rng.random(index_pop.shape) < mutation_rate)
+        number_of_mutated = len(mutated[0])
+        gene_high = np.broadcast_to(high, index_pop.shape)[mutated]
+        gene_creep = np.broadcast_to(creep, index_pop.shape)[mutated]
+        reset_values = self.rng.integers(0, gene_high, size=number_of_mutated)
+        creep_steps = self.rng.integers(1, np.maximum(gene_creep, 1) + 1, size=number_of_mutated)
+        creep_steps *= np.where(self.rng.random(number_of_mutated) < 0.5, -1, 1)
+        creep_values = np.clip(index_pop[mutated] + creep_steps, 0, gene_high - 1)
+        new_pop = index_pop.copy()
+        new_pop[mutated] = np.where(gene_creep > 0, creep_values, reset_values)
+        return new_pop
+
     def mutation_each_chromosome(self, genotype: np.array)-> np.array:
         """mutation this genotype chromosome"""
         for chrom in range(len(self.accuracy)):
@@ -120,4 +227,44 @@ class GeneChange:
             genotype[1] = ac_repair_array
             pop[individual] = genotype
         return pop
-        
+
+    def repair_ac_status_index_pop(
+        self,
+        index_pop: np.ndarray,
+        ac_opend: list,
+        current_ac_status: int,
+        ac_feature: int = 1
+    ) -> np.ndarray:
+        """repair ac status of an index population, only open or close once.
+
+        It applies the rules of repair_ac_status to all individuals at once, the index
+        of the ac feature is its status (0 closed, 1 opened):
+            1. if ac_opend is current_ac_status at all time steps, keep the current status.
+            2. after the first time step whose status differs from the current status,
+               keep the new status.
+            3. except the last time step, keep the current status where ac_opend is the
+               current status.
+
+        For a batch of sites, ac_opend is (sites, future_step) and current_ac_status is
+        (sites,), each site is repaired with its own.
+
+        Returns:
+            a new index population.
+        """
+        ac_opend = np.asarray(ac_opend)
+        # the status of each site, broadcastable to the (..., pop_size, future_step) ac genes
+        current = np.asarray(current_ac_status)[..., np.newaxis, np.newaxis]
+        new_pop = index_pop.copy()
+        if ac_opend.ndim == 1 and np.all(ac_opend == current_ac_status):
+            new_pop[..., ac_feature, :] = current_ac_status
+            return new_pop
+
+        changed = np.logical_or.accumulate(index_pop[..., ac_feature, :] != current, axis=-1)
+        repaired = np.where(changed, 1 - current, current)
+        opend_current = ac_opend[..., np.newaxis, :] == current
+        keep_current = opend_current.copy()
+        keep_current[..., -1] = False
+        # rule 1 for the sites of a batch
+        keep_current |= opend_current.all(axis=-1, keepdims=True)
+        new_pop[..., ac_feature, :] = np.where(keep_current, current, repaired)
+        return new_pop
@@ -3,11 +3,28 @@ This scrip is for encoding and decoding the phenotype and genotype
 
 step_solution -> chromosome -> genotype -> pop
 
+A population is encoded either as one-hot lists, pop[individual][feature] is a
+(future_step, accuracy[feature]) one-hot array, or as an index array of shape
+(pop_size, number_of_features, future_step) holding the index of the chosen action.
+A batch of sites is an index array of shape (sites, pop_size, number_of_features, future_step),
+its accuracy is given per site as a (sites, number_of_features) array.
 """
-from typing import Dict
+from typing import List, Optional
 import random
 import numpy as np
 
+
+def get_index_upper_bound(accuracy, number_of_features: int) -> np.ndarray:
+    """The number of actions of each feature, broadcastable to an index population.
+
+    It is a (number_of_features, 1) array, or (sites, 1, number_of_features, 1) for the
+    (sites, number_of_features) accuracy of a batch of sites.
+    """
+    accuracy = np.asarray(accuracy, dtype=np.int64)[..., :number_of_features]
+    batch_shape = accuracy.shape[:-1]
+    return accuracy.reshape(batch_shape + (1,) * len(batch_shape) + (number_of_features, 1))
+
+
 class GeneTranslation():
     """This class is to define model structure, and training model."""
     def __init__(self,
@@ -55,6 +72,42 @@ class GeneTranslation():
         return chromosomes
 
 
+    @property
+    def index_dtype(self) -> np.dtype:
+        """The smallest unsigned integer dtype holding the action indexes."""
+        return np.min_scalar_type(int(np.max(self.accuracy)) - 1)
+
+    def create_index_pop(self, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """Create population genotype as an index array of shape (pop_size, number_of_features, future_step),
+        or (sites, pop_size, number_of_features, future_step) with a per site accuracy.
+
+        Parameters:
+            rng: the random generator, a new unseeded one if None.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        high = get_index_upper_bound(self.accuracy, self.number_of_features)
+        return rng.integers(
+            0, high,
+            size=high.shape[:-3] + (self.pop_size, self.number_of_features, self.future_step),
+            dtype=self.index_dtype
+        )
+
+    def one_hot_to_index(self, pop: list) -> np.ndarray:
+        """Convert a one-hot population into an index population."""
+        index_pop = np.empty((len(pop), self.number_of_features, self.future_step), dtype=self.index_dtype)
+        for individual, genotype in enumerate(pop):
+            for feature in range(self.number_of_features):
+                index_pop[individual, feature] = np.argmax(genotype[feature], axis=-1)
+        return index_pop
+
+    def index_to_one_hot(self, index_pop: np.ndarray) -> List[list]:
+        """Convert an index population into a one-hot population."""
+        identities = [np.eye(self.accuracy[feature], dtype=int) for feature in range(self.number_of_features)]
+        return [
+            [identities[feature][genotype[feature]] for feature in range(self.number_of_features)]
+            for genotype in index_pop
+        ]
+
     def decode_chrom(self, pop: np.array, actions: list) -> list:
         """decode genotype to phenotype"""
         pop_phenotype = []
@@ -80,3 +133,46 @@ class GeneTranslation():
             phenotype.append(action_phenotype)
         return np.array(phenotype)
 
+
+
+class PhenotypeDecoder:
+    """This class decodes index populations into phenotypes with one gather.
+
+    The actions of all features are kept in one flat lookup table, and the phenotype
+    of a population is written into a buffer which is reused while the population is
+    not larger than before, so decoding each generation doesn't allocate.
+    actions are the actions of each feature, or of each site then each feature to decode
+    a (sites, pop_size, number_of_features, future_step) batch of sites.
+    """
+
+    def __init__(self, actions: list) -> None:
+        self.actions = actions
+        self.batched = len(actions) > 0 and np.ndim(actions[0][0]) > 0
+        feature_actions = [action for site_actions in actions for action in site_actions] if self.batched else actions
+        self.lookup_table = np.concatenate([np.asarray(action, dtype=float) for action in feature_actions])
+        offsets = np.cumsum([0] + [len(action) for action in feature_actions[:-1]]).astype(np.intp)
+        if self.batched:
+            self.offsets = offsets.reshape(len(actions), 1, -1, 1)
+        else:
+            self.offsets = offsets[:, np.newaxis]
+        self._index_buffer = None
+        self._phenotype_buffer = None
+
+    def decode(self, index_pop: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """decode an index population into phenotypes of its shape, (pop_size, number_of_features, future_step)
+        or (sites, pop_size, number_of_features, future_step).
+
+        Parameters:
+            index_pop: the index population.
+            out: the array to write into, the internal buffer if None. The internal
+                buffer is overwritten by the next decode, copy it to keep it.
+        """
+        buffer = self._index_buffer
+        if buffer is None or buffer.shape[1:] != index_pop.shape[1:] or len(buffer) < len(index_pop):
+            self._index_buffer = np.empty(index_pop.shape, dtype=np.intp)
+            self._phenotype_buffer = np.empty(index_pop.shape, dtype=float)
+        index_buffer = self._index_buffer[:len(index_pop)]
+        if out is None:
+            out = self._phenotype_buffer[:len(index_pop)]
+        np.add(index_pop, self.offsets, out=index_buffer)
+        return np.take(self.lookup_table, index_buffer, out=out)
@@ -0,0 +1,99 @@
+"""
+This scrip define the extension points of GeneticOptimizer, its generation strategy and its hooks
+
+A generation strategy breeds, evaluates and ranks the population of each generation:
+    ElitistGeneration: select -> crossover -> mutation -> repair -> evaluate, the elite_size
+        best individuals are kept unchanged.
+    SurrogateGeneration (surrogate.py): an ElitistGeneration evaluating the screened offspring only.
+    NSGA2Generation (nsga2.py): the multi-objective generations.
+A hook runs after each generation, such as MemeticRefiner (memetic.py) and CheckpointHook (checkpoint.py).
+"""
+import abc
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+class GenerationStrategy(abc.ABC):
+    """This class is the interface of a generation strategy, ranking the population by fit value.
+
+    A strategy works on the pop, fit_value and evaluated arrays of the optimizer it is given,
+    its subclasses implement evaluate and step.
+    """
+
+    @abc.abstractmethod
+    def evaluate(self, optimizer, pop: np.ndarray) -> None:
+        """Evaluate the first population pop of the optimizer."""
+
+    @abc.abstractmethod
+    def step(self, optimizer) -> None:
+        """Replace the population of the optimizer with the next generation."""
+
+    def get_ranking_key(self, optimizer) -> np.ndarray:
+        """The key ordering the population from the best, inf for the invalid or predicted individuals."""
+        return np.where((optimizer.fit_value > 0) & optimizer.evaluated, optimizer.fit_value, np.inf)
+
+    def get_values(self, optimizer) -> np.ndarray:
+        """The values of the individuals sent to another population, their fit values."""
+        return optimizer.fit_value
+
+    def set_values(self, optimizer, indexes: np.ndarray, values: np.ndarray) -> None:
+        """Set the values of the individuals received from another population."""
+        optimizer.fit_value[indexes] = values
+        optimizer.evaluated[indexes] = True
+
+    def get_arrays(self) -> Dict[str, np.ndarray]:
+        """The arrays of the strategy to checkpoint."""
+        return {}
+
+    def set_arrays(self, optimizer, arrays: Dict[str, np.ndarray]) -> None:
+        """Restore the arrays of a checkpoint, once the population of the optimizer is restored."""
+
+    def get_result(self, optimizer) -> dict:
+        """The entries of the strategy in the result of the run."""
+        return {"pareto_front": None}
+
+
+class ElitistGeneration(GenerationStrategy):
+    """This class breeds the pop_size - elite_size offspring of each generation, the elites survive
+    unchanged with their fit values, so only the offspring are evaluated."""
+
+    def evaluate(self, optimizer, pop: np.ndarray) -> None:
+        optimizer.fit_value, optimizer.evaluated = self.get_fit_value(optimizer, pop)
+
+    def get_fit_value(self, optimizer, pop: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the fit values of the new individuals pop and whether each one is evaluated."""
+        return optimizer.evaluate(pop), np.ones(len(pop), dtype=bool)
+
+    def step(self, optimizer) -> None:
+        with optimizer.timed("select"):
+            indexes = optimizer.selection.select_indices(
+                optimizer.fit_value, optimizer.selection_method, optimizer.pop_size - optimizer.elite_size
+            )
+            elites = optimizer.get_elite_indices()
+        offspring = optimizer.get_offspring(indexes)
+
+        optimizer.generation += 1
+        fit_value, evaluated = self.get_fit_value(optimizer, offspring)
+        optimizer.pop = np.concatenate([offspring, optimizer.pop[elites]])
+        optimizer.fit_value = np.concatenate([fit_value, optimizer.fit_value[elites]])
+        optimizer.evaluated = np.concatenate([evaluated, optimizer.evaluated[elites]])
+
+
+class GenerationHook:
+    """This class is the interface of a hook, run by the optimizer after each generation once its
+    best fit value is in the history.
+
+    name names the timing of the hook, its phase in phase_improvements (see
+    GeneticOptimizer.update_best) and, if it has a random stream rng, the state of rng in the
+    checkpoints.
+    """
+
+    name = "hook"
+    rng: Optional[np.random.Generator] = None
+
+    def after_generation(self, optimizer) -> None:
+        """Run the hook on the optimizer after a generation."""
+
+    def close(self) -> None:
+        """Release the resources of the hook at the end of the run."""
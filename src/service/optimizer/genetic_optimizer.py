@@ -0,0 +1,328 @@
+"""
+This scrip define the GA driver, which runs the generation loop on index populations
+
+initialize -> (select -> crossover -> mutation -> repair -> evaluate) * generations
+
+The loop and its stop conditions are those of AbstractGeneticOptimizer, see abstract_optimizer.py.
+
+How a generation is bred and ranked is a GenerationStrategy, and the features run after
+each generation are GenerationHooks, see generation.py.
+"""
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.service.optimizer.abstract_optimizer import AbstractGeneticOptimizer
+from src.service.optimizer.checkpoint import CheckpointHook, CheckpointManager
+from src.service.optimizer.fitness_cache import FitnessCache
+from src.service.optimizer.gene_change import GeneChange
+from src.service.optimizer.gene_translation import GeneTranslation, PhenotypeDecoder
+from src.service.optimizer.generation import ElitistGeneration, GenerationHook
+from src.service.optimizer.memetic import MemeticRefiner
+from src.service.optimizer.nsga2 import NSGA2Generation
+from src.service.optimizer.parallel_fitness import ParallelFitnessEvaluator
+from src.service.optimizer.selection_method import SelectionMethod
+from src.service.optimizer.surrogate import SurrogateGeneration, SurrogateScreener
+
+
+class GeneticOptimizer(AbstractGeneticOptimizer):
+    """This class runs the GA with elitism, early stopping and operator timings, see AbstractGeneticOptimizer.
+
+    fitness_function takes a (n, number_of_features, future_step) phenotype array and
+    returns the n fit values, lower is better and a fit value <= 0 is invalid.
+    mutation_rate is the probability of mutating each gene, see GeneChange.get_gene_mutation_rate
+    for the rate equivalent to the mutation rate of an individual.
+    The random streams of the initialization, the selection and the variation are spawned
+    from seed, so a run with the same seed is reproduced.
+    With fitness_cache_size, the fit values of the last fitness_cache_size distinct
+    genotypes are cached and their duplicates are not evaluated again.
+    The generations are ElitistGeneration ones, or:
+        with surrogate_top_fraction, SurrogateGeneration ones, a surrogate regressor ranks
+            the offspring and only the top fraction are evaluated.
+        with multi_objective, NSGA2Generation ones, fitness_function returns (n,
+            number_of_objectives) objectives and fit_value and best_fit are those of the
+            first objective, the result has the Pareto front of the population.
+    The hooks run after each generation:
+        with memetic_interval, a MemeticRefiner refines the memetic_top_k best individuals
+            by short SA runs every memetic_interval generations.
+        the given hooks.
+        with checkpoint_dir, a CheckpointHook checkpoints the run every checkpoint_interval
+            generations, the last checkpoint_keep are kept, and resume continues the run
+            from the last one.
+
+    Examples:
+        >>> optimizer = GeneticOptimizer([5, 2], 24, actions, partial(weighted_cost_batch, cost_weights=weights),
+        ...                              patience=20, seed=1)
+        >>> result = optimizer.run()
+    """
+
+    def __init__(
+        self,
+        accuracy: List[int],
+        future_step: int,
+        actions: List[List[float]],
+        fitness_function: Callable[[np.ndarray], np.ndarray],
+        pop_size: int = 100,
+        generations: int = 100,
+        crossover_rate: float = 0.8,
+        mutation_rate: float = 0.02,
+        crossover_method: str = "single_point",
+        selection_method: str = "roulette",
+        elite_size: int = 1,
+        patience: Optional[int] = None,
+        tolerance: float = 1e-6,
+        time_budget_seconds: Optional[float] = None,
+        current_ac_status: Optional[int] = None,
+        ac_opend: Optional[List[int]] = None,
+        seed: Union[None, int, np.random.SeedSequence] = None,
+        workers: int = 1,
+        chunk_size: Optional[int] = None,
+        fitness_cache_size: Optional[int] = None,
+        surrogate_top_fraction: Optional[float] = None,
+        surrogate_retrain_interval: int = 5,
+        surrogate_min_samples: int = 200,
+        memetic_interval: Optional[int] = None,
+        memetic_top_k: int = 5,
+        memetic_steps: int = 20,
+        multi_objective: bool = False,
+        checkpoint_dir: Optional[str] = None,
+        checkpoint_interval: int = 10,
+        checkpoint_keep: int = 2,
+        hooks: Sequence[GenerationHook] = (),
+        callbacks: Sequence[Callable[["GeneticOptimizer"], Optional[bool]]] = ()
+    ) -> None:
+        super().__init__(
+            pop_size, generations, crossover_rate, mutation_rate, crossover_method, selection_method, elite_size,
+            patience, tolerance, time_budget_seconds, current_ac_status, ac_opend, callbacks
+        )
+        if multi_objective and (surrogate_top_fraction or memetic_interval):
+            raise ValueError("the surrogate and the memetic refinement need a single objective")
+        self.accuracy = accuracy
+        self.future_step = future_step
+
+        seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        init_seed, selection_seed, variation_seed, surrogate_seed, memetic_seed = seed_sequence.spawn(5)
+        self.init_rng = np.random.default_rng(init_seed)
+        self.gene_translation = GeneTranslation(pop_size, len(accuracy), future_step, accuracy)
+        self.selection = SelectionMethod(pop_size, rng=np.random.default_rng(selection_seed))
+        self.gene_change = GeneChange(accuracy, future_step, rng=np.random.default_rng(variation_seed))
+        self.decoder = PhenotypeDecoder(actions)
+        self.evaluator = ParallelFitnessEvaluator(fitness_function, workers=workers, chunk_size=chunk_size)
+        self.fitness_cache = FitnessCache(fitness_cache_size) if fitness_cache_size else None
+
+        self.generation_strategy = ElitistGeneration()
+        if multi_objective:
+            self.generation_strategy = NSGA2Generation()
+        elif surrogate_top_fraction:
+            self.generation_strategy = SurrogateGeneration(SurrogateScreener(
+                top_fraction=surrogate_top_fraction,
+                retrain_interval=surrogate_retrain_interval,
+                min_samples=surrogate_min_samples,
+                random_state=int(surrogate_seed.generate_state(1)[0])
+            ))
+        self.hooks: List[GenerationHook] = []
+        if memetic_interval:
+            self.hooks.append(MemeticRefiner(
+                interval=memetic_interval, top_k=memetic_top_k, steps=memetic_steps,
+                rng=np.random.default_rng(memetic_seed)
+            ))
+        self.hooks.extend(hooks)
+        if checkpoint_dir:
+            self.hooks.append(CheckpointHook(CheckpointManager(checkpoint_dir, keep=checkpoint_keep), checkpoint_interval))
+
+        # whether the fit value of each individual is evaluated, not predicted by the surrogate
+        self.evaluated = None
+        # the number of individuals evaluated by the fitness function, see _evaluate_pop
+        self.true_evaluations = 0
+        self.best_individual = None
+        self.best_fit = None
+        self.history: List[Optional[float]] = []
+        # decrease of the best fit value made by the GA and by each hook, see update_best
+        self.phase_improvements: Dict[str, float] = {"ga": 0.0}
+
+    def get_hook(self, hook_type: type) -> Optional[GenerationHook]:
+        """Get the first hook of type hook_type, None if there is none."""
+        return next((hook for hook in self.hooks if isinstance(hook, hook_type)), None)
+
+    @property
+    def checkpoint_manager(self) -> Optional[CheckpointManager]:
+        """The CheckpointManager of the checkpoint hook, None without checkpoint_dir."""
+        checkpoint_hook = self.get_hook(CheckpointHook)
+        return checkpoint_hook.checkpoint_manager if checkpoint_hook is not None else None
+
+    def evaluate(self, pop: np.ndarray) -> np.ndarray:
+        """Evaluate a population, the cached genotypes are not evaluated again."""
+        if self.fitness_cache is None:
+            return self._evaluate_pop(pop)
+        return self.fitness_cache.evaluate(pop, self._evaluate_pop)
+
+    def _evaluate_pop(self, pop: np.ndarray) -> np.ndarray:
+        """decode and evaluate a population, the phenotypes are decoded into the evaluator buffer
+
+        It only gets the cache misses, so it counts the true evaluations.
+        """
+        self.true_evaluations += len(pop)
+        with self.timed("decode"):
+            phenotypes = self.decoder.decode(pop, out=self.evaluator.get_buffer(pop.shape))
+        with self.timed("evaluate"):
+            return self.evaluator.evaluate(phenotypes)
+
+    def get_ranking_key(self) -> np.ndarray:
+        """The key ordering the population from the best, inf for the invalid or predicted
+        individuals, see GenerationStrategy.get_ranking_key."""
+        return self.generation_strategy.get_ranking_key(self)
+
+    def update_best(self, phase: str) -> None:
+        """Update the best individual after phase changed the population.
+
+        The decrease of the best fit value is added to phase_improvements[phase], and the
+        history of the current generation is updated if it is already recorded.
+        """
+        best_fit = self.best_fit
+        self._update_best()
+        if best_fit is not None and self.best_fit is not None:
+            self.phase_improvements[phase] = self.phase_improvements.get(phase, 0.0) + best_fit - self.best_fit
+        if len(self.history) > self.generation:
+            self.history[self.generation] = self.best_fit
+
+    def _update_best(self) -> None:
+        key = np.where((self.fit_value > 0) & self.evaluated, self.fit_value, np.inf)
+        best_index = int(np.argmin(key))
+        if not np.isfinite(key[best_index]):
+            return
+        fit = float(self.fit_value[best_index])
+        if self.best_fit is None or fit < self.best_fit - self.tolerance * abs(self.best_fit):
+            self._last_improvement = self.generation
+        if self.best_fit is None or fit < self.best_fit:
+            self.best_fit = fit
+            self.best_individual = self.pop[best_index].copy()
+
+    def get_elite_indices(self) -> np.ndarray:
+        """Get the indexes of the elite_size best individuals."""
+        return np.argsort(self.get_ranking_key(), kind="stable")[:self.elite_size]
+
+    def initialize(self) -> None:
+        """Create and evaluate the first population."""
+        self._started_at = time.perf_counter()
+        with self.timed("initialize"):
+            pop = self.gene_translation.create_index_pop(self.init_rng)
+        self.pop = self.repair(pop)
+        self.generation_strategy.evaluate(self, self.pop)
+        self._update_best()
+        self.history.append(self.best_fit)
+
+    def step(self) -> None:
+        """Run one generation of the generation strategy, then the hooks."""
+        if self.pop is None:
+            self.initialize()
+        self.generation_strategy.step(self)
+        self.update_best("ga")
+        self.history.append(self.best_fit)
+        for hook in self.hooks:
+            with self.timed(hook.name):
+                hook.after_generation(self)
+
+    def get_emigrants(self, number: int):
+        """Get copies of the number best individuals and their fit values (objectives in
+        multi-objective mode), to migrate to another population."""
+        indexes = np.argsort(self.get_ranking_key(), kind="stable")[:number]
+        return self.pop[indexes].copy(), self.generation_strategy.get_values(self)[indexes].copy()
+
+    def accept_immigrants(self, immigrants: np.ndarray, immigrant_fit_value: np.ndarray) -> None:
+        """Replace the worst individuals with immigrants of another population."""
+        if len(immigrants) == 0:
+            return
+        indexes = np.argsort(self.get_ranking_key(), kind="stable")[-len(immigrants):]
+        self.pop[indexes] = immigrants
+        self.generation_strategy.set_values(self, indexes, immigrant_fit_value)
+        self._update_best()
+
+    def _get_rngs(self) -> Dict[str, np.random.Generator]:
+        rngs = {"init": self.init_rng, "selection": self.selection.rng, "variation": self.gene_change.rng}
+        rngs.update({hook.name: hook.rng for hook in self.hooks if hook.rng is not None})
+        return rngs
+
+    def get_state(self) -> Tuple[Dict[str, np.ndarray], dict]:
+        """Get the arrays and the JSON serializable state of the run, see CheckpointManager.save."""
+        arrays = {
+            "pop": self.pop, "fit_value": self.fit_value, "evaluated": self.evaluated,
+            "best_individual": self.best_individual, **self.generation_strategy.get_arrays()
+        }
+        state = {
+            "generation": self.generation,
+            "best_fit": self.best_fit,
+            "history": self.history,
+            "last_improvement": self._last_improvement,
+            "true_evaluations": self.true_evaluations,
+            "phase_improvements": self.phase_improvements,
+            "rng_states": {name: rng.bit_generator.state for name, rng in self._get_rngs().items()}
+        }
+        return arrays, state
+
+    def set_state(self, arrays: Dict[str, np.ndarray], state: dict) -> None:
+        """Restore the run from the arrays and the state of get_state.
+
+        The fitness cache and the surrogate restart empty, and the time budget counts from now.
+        """
+        self.pop = np.array(arrays["pop"])
+        self.evaluated = np.array(arrays["evaluated"])
+        self.fit_value = np.array(arrays["fit_value"])
+        self.generation_strategy.set_arrays(self, arrays)
+        self.best_individual = np.array(arrays["best_individual"]) if "best_individual" in arrays else None
+        self.best_fit = state["best_fit"]
+        self.generation = state["generation"]
+        self.history = state["history"]
+        self._last_improvement = state["last_improvement"]
+        self.true_evaluations = state["true_evaluations"]
+        self.phase_improvements = state["phase_improvements"]
+        for name, rng in self._get_rngs().items():
+            rng.bit_generator.state = state["rng_states"][name]
+        self._started_at = time.perf_counter()
+
+    def checkpoint(self) -> None:
+        """Checkpoint the current generation in the background, see CheckpointHook.save."""
+        self.get_hook(CheckpointHook).save(self)
+
+    def resume(self, path: Optional[str] = None) -> bool:
+        """Continue from a checkpoint, the last one if path is None, see CheckpointHook.resume.
+
+        Returns:
+            False if there is no checkpoint to resume from.
+        """
+        checkpoint_hook = self.get_hook(CheckpointHook)
+        return checkpoint_hook is not None and checkpoint_hook.resume(self, path)
+
+    def close(self) -> None:
+        """Close the evaluator and the hooks, when the run ends."""
+        self.evaluator.close()
+        for hook in self.hooks:
+            hook.close()
+
+    def get_result(self) -> dict:
+        """Get the result of the generations run so far.
+
+        Returns:
+            a dict of best_fit, best_individual (index genotype), best_phenotype, generations
+            (the number of generations run), stop_reason, timings (seconds per operator) and
+            fitness_cache (the cache statistics, None without cache) and true_evaluations (the
+            number of individuals evaluated by the fitness function, the cache hits excluded) and
+            phase_improvements (the decrease of the best fit value made by the GA and the
+            hooks, see update_best) and pareto_front (None in single-objective mode, else the dict of
+            the distinct non-dominated individuals, phenotypes and objectives, by first objective).
+        """
+        best_phenotype = None
+        if self.best_individual is not None:
+            best_phenotype = self.decoder.decode(self.best_individual[np.newaxis], out=np.empty((1,) + self.best_individual.shape))[0]
+        return {
+            "best_fit": self.best_fit,
+            "best_individual": self.best_individual,
+            "best_phenotype": best_phenotype,
+            "generations": self.generation,
+            "stop_reason": self.stop_reason,
+            "timings": dict(self.timings),
+            "fitness_cache": self.fitness_cache.get_stats() if self.fitness_cache else None,
+            "true_evaluations": self.true_evaluations,
+            "phase_improvements": dict(self.phase_improvements),
+            **self.generation_strategy.get_result(self)
+        }
@@ -0,0 +1,225 @@
+"""
+This scrip define the island model GA, each island is a GeneticOptimizer in its own process
+
+Every migration_interval generations the islands send copies of their migration_size best
+individuals to another island, which replace its worst individuals:
+    ring: island i sends to island i + 1.
+    random: the islands send to a random permutation of the islands, none to itself, so
+        each island receives the emigrants of exactly one other island.
+"""
+import multiprocessing
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.service.optimizer.gene_translation import PhenotypeDecoder
+from src.service.optimizer.genetic_optimizer import GeneticOptimizer
+
+
+class _Island:
+    """an island, which runs the generations asked by the coordinator between two migrations"""
+
+    def __init__(self, optimizer_kwargs: dict, seed) -> None:
+        self.optimizer = GeneticOptimizer(seed=seed, **optimizer_kwargs)
+        self.optimizer.initialize()
+
+    def migrate(self, generations: int, immigrants: np.ndarray, immigrant_fit_value: np.ndarray, migration_size: int) -> tuple:
+        """accept the immigrants, run the generations and return the emigrants, best and timings"""
+        optimizer = self.optimizer
+        optimizer.accept_immigrants(immigrants, immigrant_fit_value)
+        for _ in range(generations):
+            optimizer.step()
+        emigrants, emigrant_fit_value = optimizer.get_emigrants(migration_size)
+        return emigrants, emigrant_fit_value, optimizer.best_fit, optimizer.best_individual, dict(optimizer.timings)
+
+    def close(self) -> None:
+        self.optimizer.evaluator.close()
+
+
+def _run_island(connection, optimizer_kwargs: dict, seed) -> None:
+    """Evolve an island in its process, answering the migrations sent by the coordinator."""
+    island = _Island(optimizer_kwargs, seed)
+    try:
+        while True:
+            message = connection.recv()
+            if message is None:
+                break
+            connection.send(island.migrate(*message))
+    finally:
+        island.close()
+        connection.close()
+
+
+class IslandModel:
+    """This class runs islands of GeneticOptimizer in separate processes with periodic migration.
+
+    optimizer_kwargs are the GeneticOptimizer parameters of each island, pop_size is the
+    size of each island. Its generations, patience, tolerance and time_budget_seconds
+    apply to the whole run, and each island evaluates its fitness in its own process
+    (workers is 1). A callback is called with the model after each migration, the run
+    stops if it returns True.
+
+    With use_processes None, the islands run in their own processes unless the current
+    process is a daemon, such as a celery prefork worker, which can't have children. There
+    they run one after another in the current process, with the same results.
+    """
+
+    TOPOLOGIES = ("ring", "random")
+
+    def __init__(
+        self,
+        optimizer_kwargs: dict,
+        islands: int = 4,
+        migration_interval: int = 10,
+        migration_size: int = 2,
+        topology: str = "ring",
+        seed: Optional[int] = None,
+        use_processes: Optional[bool] = None,
+        callbacks: Sequence[Callable[["IslandModel"], Optional[bool]]] = ()
+    ) -> None:
+        if topology not in self.TOPOLOGIES:
+            raise ValueError(f"topology should be one of {self.TOPOLOGIES}, got {topology}")
+        self.optimizer_kwargs = dict(optimizer_kwargs)
+        self.generations = self.optimizer_kwargs.get("generations", 100)
+        self.patience = self.optimizer_kwargs.pop("patience", None)
+        self.tolerance = self.optimizer_kwargs.get("tolerance", 1e-6)
+        self.time_budget_seconds = self.optimizer_kwargs.pop("time_budget_seconds", None)
+        self.optimizer_kwargs.pop("callbacks", None)
+        self.optimizer_kwargs.update(workers=1, chunk_size=None)
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.topology = topology
+        self.use_processes = use_processes
+        self.callbacks = list(callbacks)
+
+        migration_seed, *self.island_seeds = np.random.SeedSequence(seed).spawn(islands + 1)
+        self.rng = np.random.default_rng(migration_seed)
+        self.decoder = PhenotypeDecoder(self.optimizer_kwargs["actions"])
+
+        self.generation = 0
+        self.best_fit = None
+        self.best_individual = None
+        self.island_best_fit: List[Optional[float]] = [None] * islands
+        self.history: List[Optional[float]] = []
+        # the timings of each island since its start
+        self.island_timings: List[Dict[str, float]] = [{} for _ in range(islands)]
+        self.stop_reason = None
+        self._last_improvement = 0
+
+    def get_destinations(self) -> np.ndarray:
+        """Get the island which each island sends its emigrants to."""
+        if self.topology == "ring":
+            return (np.arange(self.islands) + 1) % self.islands
+        # a random derangement, a permutation without fixed point
+        while True:
+            destinations = self.rng.permutation(self.islands)
+            if self.islands == 1 or not np.any(destinations == np.arange(self.islands)):
+                return destinations
+
+    def route_emigrants(self, emigrants: List[Tuple[np.ndarray, np.ndarray]]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Get the immigrants and their fit values of each island from the emigrants of each island."""
+        received: List[list] = [[] for _ in range(self.islands)]
+        for destination, pair in zip(self.get_destinations(), emigrants):
+            received[destination].append(pair)
+        return [
+            (np.concatenate([pop for pop, _ in pairs]), np.concatenate([fit_value for _, fit_value in pairs]))
+            for pairs in received
+        ]
+
+    def _update_best(self, island: int, best_fit: Optional[float], best_individual: Optional[np.ndarray]) -> None:
+        self.island_best_fit[island] = best_fit
+        if best_fit is None:
+            return
+        if self.best_fit is None or best_fit < self.best_fit - self.tolerance * abs(self.best_fit):
+            self._last_improvement = self.generation
+        if self.best_fit is None or best_fit < self.best_fit:
+            self.best_fit, self.best_individual = best_fit, best_individual
+
+    def _should_stop(self, started_at: float) -> Optional[str]:
+        if self.generation >= self.generations:
+            return GeneticOptimizer.STOP_GENERATIONS
+        if self.patience is not None and self.generation - self._last_improvement >= self.patience:
+            return GeneticOptimizer.STOP_PLATEAU
+        if self.time_budget_seconds is not None and time.perf_counter() - started_at >= self.time_budget_seconds:
+            return GeneticOptimizer.STOP_TIME_BUDGET
+        return None
+
+    def run(self) -> dict:
+        """Run the islands until they stop, see GeneticOptimizer.run for the result."""
+        started_at = time.perf_counter()
+        use_processes = self.use_processes
+        if use_processes is None:
+            use_processes = not multiprocessing.current_process().daemon
+        islands, connections, processes = [], [], []
+        try:
+            for seed in self.island_seeds:
+                if not use_processes:
+                    islands.append(_Island(self.optimizer_kwargs, seed))
+                    continue
+                connection, island_connection = multiprocessing.Pipe()
+                process = multiprocessing.Process(
+                    target=_run_island, args=(island_connection, self.optimizer_kwargs, seed), daemon=True
+                )
+                process.start()
+                island_connection.close()
+                connections.append(connection)
+                processes.append(process)
+
+            empty = np.empty((0, len(self.optimizer_kwargs["accuracy"]), self.optimizer_kwargs["future_step"]), dtype=np.uint8)
+            immigrants = [(empty, np.empty(0))] * self.islands
+            self.stop_reason = self._should_stop(started_at)
+            while self.stop_reason is None:
+                generations = min(self.migration_interval, self.generations - self.generation)
+                messages = [(generations, pop, fit_value, self.migration_size) for pop, fit_value in immigrants]
+                if use_processes:
+                    for connection, message in zip(connections, messages):
+                        connection.send(message)
+                    replies = [connection.recv() for connection in connections]
+                else:
+                    replies = [island.migrate(*message) for island, message in zip(islands, messages)]
+                self.generation += generations
+
+                for island, (_, _, best_fit, best_individual, timings) in enumerate(replies):
+                    self._update_best(island, best_fit, best_individual)
+                    self.island_timings[island] = timings
+                immigrants = self.route_emigrants([(emigrants, fit_value) for emigrants, fit_value, *_ in replies])
+                self.history.append(self.best_fit)
+
+                if any([callback(self) for callback in self.callbacks]):
+                    self.stop_reason = GeneticOptimizer.STOP_CALLBACK
+                else:
+                    self.stop_reason = self._should_stop(started_at)
+        finally:
+            for island in islands:
+                island.close()
+            for connection in connections:
+                try:
+                    connection.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+                connection.close()
+            for process in processes:
+                process.join(timeout=10)
+                if process.is_alive():
+                    process.terminate()
+        return self.get_result()
+
+    def get_result(self) -> dict:
+        """Get the result of the generations run so far, timings are summed over the islands."""
+        best_phenotype = None
+        if self.best_individual is not None:
+            best_phenotype = self.decoder.decode(self.best_individual[np.newaxis], out=np.empty((1,) + self.best_individual.shape))[0]
+        timings: Dict[str, float] = {}
+        for island_timings in self.island_timings:
+            for operator, seconds in island_timings.items():
+                timings[operator] = timings.get(operator, 0.0) + seconds
+        return {
+            "best_fit": self.best_fit,
+            "best_individual": self.best_individual,
+            "best_phenotype": best_phenotype,
+            "generations": self.generation,
+            "stop_reason": self.stop_reason,
+            "timings": timings
+        }
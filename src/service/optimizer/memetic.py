@@ -0,0 +1,90 @@
+"""
+This scrip define the memetic refinement, a local search of the GA elites by simulated annealing
+
+Every interval generations the top_k individuals are each annealed by chains_per_individual
+short SA chains, and replaced by the best state of their chains if it is better.
+"""
+from typing import Optional
+
+import numpy as np
+
+from src.service.optimizer.generation import GenerationHook
+from src.service.optimizer.sa_method import VectorizedSA
+
+
+class MemeticRefiner(GenerationHook):
+    """This class refines the best individuals of a GeneticOptimizer with VectorizedSA.
+
+    move_probability is the probability of moving each gene at each SA step, the default
+    moves about 2 genes of an individual per step.
+    """
+
+    name = "memetic"
+
+    def __init__(
+        self,
+        interval: int = 10,
+        top_k: int = 5,
+        chains_per_individual: int = 4,
+        steps: int = 20,
+        initial_temperature: float = 1.0,
+        final_temperature: float = 0.01,
+        move_probability: Optional[float] = None,
+        rng: Optional[np.random.Generator] = None
+    ) -> None:
+        self.interval = interval
+        self.top_k = top_k
+        self.chains_per_individual = chains_per_individual
+        self.steps = steps
+        self.initial_temperature = initial_temperature
+        self.final_temperature = final_temperature
+        self.move_probability = move_probability
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.refinements = 0
+
+    def after_generation(self, optimizer) -> None:
+        if self.should_refine(optimizer.generation):
+            self.refine(optimizer)
+            optimizer.update_best(self.name)
+
+    def should_refine(self, generation: int) -> bool:
+        """Whether the population of generation is refined."""
+        return generation > 0 and generation % self.interval == 0
+
+    def refine(self, optimizer) -> int:
+        """Anneal the top_k evaluated individuals of the optimizer population in place.
+
+        Returns:
+            the number of improved individuals.
+        """
+        key = optimizer.get_ranking_key()
+        top = np.argsort(key, kind="stable")[:self.top_k]
+        top = top[np.isfinite(key[top])]
+        if len(top) == 0:
+            return 0
+
+        _, number_of_features, future_step = optimizer.pop.shape
+        sa = VectorizedSA(
+            optimizer.accuracy,
+            evaluate=optimizer.evaluate,
+            steps=self.steps,
+            initial_temperature=self.initial_temperature,
+            final_temperature=self.final_temperature,
+            move_probability=self.move_probability or 2 / (number_of_features * future_step),
+            repair=optimizer.repair,
+            rng=self.rng
+        )
+        result = sa.run(np.repeat(optimizer.pop[top], self.chains_per_individual, axis=0))
+        chain_fit_value = result["chain_best_fit_value"].reshape(len(top), self.chains_per_individual)
+        chain_fit_value = np.where(chain_fit_value > 0, chain_fit_value, np.inf)
+        best_chain = np.argmin(chain_fit_value, axis=1)
+        refined_fit_value = chain_fit_value[np.arange(len(top)), best_chain]
+        refined_states = result["chain_best_states"].reshape((len(top), self.chains_per_individual) + optimizer.pop.shape[1:])
+        refined_states = refined_states[np.arange(len(top)), best_chain]
+
+        improved = refined_fit_value < optimizer.fit_value[top]
+        optimizer.pop[top[improved]] = refined_states[improved]
+        optimizer.fit_value[top[improved]] = refined_fit_value[improved]
+        optimizer.evaluated[top[improved]] = True
+        self.refinements += 1
+        return int(improved.sum())
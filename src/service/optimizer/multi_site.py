@@ -0,0 +1,162 @@
+"""
+This scrip define the GA driver of a batch of sites, which evolves one population per site in one run
+
+The populations are a (sites, pop_size, number_of_features, future_step) index array, so
+selection, crossover, mutation, repair, decoding and evaluation run for all sites at once,
+and the Python overhead of a generation is paid once instead of once per site.
+"""
+import time
+from typing import Callable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from src.service.optimizer.abstract_optimizer import AbstractGeneticOptimizer
+from src.service.optimizer.gene_change import GeneChange
+from src.service.optimizer.gene_translation import GeneTranslation, PhenotypeDecoder
+from src.service.optimizer.selection_method import SelectionMethod
+
+
+class MultiSiteGeneticOptimizer(AbstractGeneticOptimizer):
+    """This class runs the GA of many sites with elitism and early stopping, see GeneticOptimizer
+    and AbstractGeneticOptimizer.
+
+    The sites share the number of features and future_step, their accuracy is a
+    (sites, number_of_features) array and actions are the actions of each site then each
+    feature. fitness_function takes a (sites, n, number_of_features, future_step) phenotype
+    array and returns the (sites, n) fit values, lower is better and a fit value <= 0 is
+    invalid. mutation_rate is the probability of mutating each gene.
+    current_ac_status (sites,) and ac_opend (sites, future_step) repair the AC
+    switch of each site. The run stops when no site has improved for patience generations.
+
+    Examples:
+        >>> optimizer = MultiSiteGeneticOptimizer([[5, 2]] * 3, 24, [actions] * 3,
+        ...                                       partial(weighted_cost_batch, cost_weights=weights), seed=1)
+        >>> result = optimizer.run()
+    """
+
+    def __init__(
+        self,
+        accuracy: List[List[int]],
+        future_step: int,
+        actions: List[List[List[float]]],
+        fitness_function: Callable[[np.ndarray], np.ndarray],
+        pop_size: int = 100,
+        generations: int = 100,
+        crossover_rate: float = 0.8,
+        mutation_rate: float = 0.02,
+        crossover_method: str = "single_point",
+        selection_method: str = "roulette",
+        elite_size: int = 1,
+        patience: Optional[int] = None,
+        tolerance: float = 1e-6,
+        time_budget_seconds: Optional[float] = None,
+        current_ac_status: Optional[List[int]] = None,
+        ac_opend: Optional[List[List[int]]] = None,
+        seed: Union[None, int, np.random.SeedSequence] = None,
+        callbacks: Sequence[Callable[["MultiSiteGeneticOptimizer"], Optional[bool]]] = ()
+    ) -> None:
+        super().__init__(
+            pop_size, generations, crossover_rate, mutation_rate, crossover_method, selection_method, elite_size,
+            patience, tolerance, time_budget_seconds,
+            None if current_ac_status is None else np.asarray(current_ac_status),
+            None if ac_opend is None else np.asarray(ac_opend),
+            callbacks
+        )
+        self.accuracy = np.asarray(accuracy)
+        if self.accuracy.ndim != 2 or len(actions) != len(self.accuracy):
+            raise ValueError("accuracy should be (sites, number_of_features) with actions for each site")
+        self.sites, number_of_features = self.accuracy.shape
+        self.future_step = future_step
+        self.fitness_function = fitness_function
+
+        seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        init_seed, selection_seed, variation_seed = seed_sequence.spawn(3)
+        self.init_rng = np.random.default_rng(init_seed)
+        self.gene_translation = GeneTranslation(pop_size, number_of_features, future_step, self.accuracy)
+        self.selection = SelectionMethod(pop_size, rng=np.random.default_rng(selection_seed))
+        self.gene_change = GeneChange(self.accuracy, future_step, rng=np.random.default_rng(variation_seed))
+        self.decoder = PhenotypeDecoder(actions)
+
+        # the best fit value of each site, inf until it has a valid individual
+        self.best_fit = np.full(self.sites, np.inf)
+        self.best_individual = None
+        self.history: List[np.ndarray] = []
+
+    def _evaluate(self, pop: np.ndarray) -> np.ndarray:
+        with self.timed("decode"):
+            phenotypes = self.decoder.decode(pop)
+        with self.timed("evaluate"):
+            return np.asarray(self.fitness_function(phenotypes), dtype=float)
+
+    def _get_ranking_key(self) -> np.ndarray:
+        """the valid fit values, inf for the invalid ones"""
+        return np.where(self.fit_value > 0, self.fit_value, np.inf)
+
+    def get_parents(self, indexes: np.ndarray) -> np.ndarray:
+        """Get the (sites, n) individuals of indexes, the row indexes of each site."""
+        return self.pop[np.arange(self.sites)[:, np.newaxis], indexes]
+
+    def _update_best(self) -> None:
+        key = self._get_ranking_key()
+        best_index = np.argmin(key, axis=1)
+        fit = key[np.arange(self.sites), best_index]
+        # the valid fit values are positive, and the threshold of a site without one is inf
+        if (fit < self.best_fit * (1 - self.tolerance)).any():
+            self._last_improvement = self.generation
+        improved = fit < self.best_fit
+        best_individual = self.get_parents(best_index[:, np.newaxis])[:, 0]
+        if self.best_individual is None:
+            self.best_individual = best_individual.copy()
+        self.best_individual[improved] = best_individual[improved]
+        self.best_fit[improved] = fit[improved]
+
+    def initialize(self) -> None:
+        """Create and evaluate the first population of each site."""
+        self._started_at = time.perf_counter()
+        with self.timed("initialize"):
+            pop = self.gene_translation.create_index_pop(self.init_rng)
+        self.pop = self.repair(pop)
+        self.fit_value = self._evaluate(self.pop)
+        self._update_best()
+        self.history.append(self.best_fit.copy())
+
+    def step(self) -> None:
+        """Run one generation of every site, the elite_size best individuals of each site are kept unchanged."""
+        if self.pop is None:
+            self.initialize()
+        with self.timed("select"):
+            indexes = self.selection.select_indices(
+                self.fit_value, self.selection_method, self.pop_size - self.elite_size
+            )
+            elites = np.argsort(self._get_ranking_key(), axis=1, kind="stable")[:, :self.elite_size]
+        offspring = self.get_offspring(indexes)
+
+        self.generation += 1
+        # the elites keep their fit values, only the offspring are evaluated
+        offspring_fit_value = self._evaluate(offspring)
+        self.fit_value = np.concatenate([offspring_fit_value, np.take_along_axis(self.fit_value, elites, axis=1)], axis=1)
+        self.pop = np.concatenate([offspring, self.get_parents(elites)], axis=1)
+        self._update_best()
+        self.history.append(self.best_fit.copy())
+
+    def get_result(self) -> dict:
+        """Get the result of the generations run so far.
+
+        Returns:
+            a dict of best_fit (the list of the best fit value of each site, None if the site has
+            no valid individual), best_individual and best_phenotype ((sites, number_of_features,
+            future_step) arrays), generations, stop_reason and timings.
+        """
+        best_phenotype = None
+        if self.best_individual is not None:
+            best_phenotype = self.decoder.decode(
+                self.best_individual[:, np.newaxis], out=np.empty(self.best_individual[:, np.newaxis].shape)
+            )[:, 0]
+        return {
+            "best_fit": [float(fit) if np.isfinite(fit) else None for fit in self.best_fit],
+            "best_individual": self.best_individual,
+            "best_phenotype": best_phenotype,
+            "generations": self.generation,
+            "stop_reason": self.stop_reason,
+            "timings": dict(self.timings)
+        }
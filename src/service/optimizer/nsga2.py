@@ -0,0 +1,89 @@
+"""
+This scrip define the NSGA-II generations of a multi-objective GeneticOptimizer
+
+crowded tournament -> crossover -> mutation -> repair -> evaluate -> non-dominated survival
+
+The fitness function returns (n, number_of_objectives) objectives to minimize, the first one
+following the fit value convention, see SelectionMethod.nsga2_sort.
+"""
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.service.optimizer.generation import GenerationStrategy
+
+
+class NSGA2Generation(GenerationStrategy):
+    """This class keeps the pop_size best of the parents and offspring by non-dominated rank and
+    crowding distance.
+
+    The fit values of the optimizer are the first objective, 0 if invalid, and the population
+    is ranked by its NSGA-II order.
+    """
+
+    def __init__(self) -> None:
+        # the objectives, front ranks and crowding distances of the population
+        self.objectives = None
+        self.ranks = None
+        self.crowding = None
+
+    def set_objectives(self, optimizer, objectives: np.ndarray, ranks: Optional[np.ndarray] = None,
+                       crowding: Optional[np.ndarray] = None) -> None:
+        """Keep the objectives of the population, its fit value is the first objective, 0 if invalid."""
+        if ranks is None:
+            _, ranks, crowding = optimizer.selection.nsga2_sort(objectives)
+        self.objectives, self.ranks, self.crowding = objectives, ranks, crowding
+        optimizer.fit_value = np.where(optimizer.selection.get_valid_objectives(objectives), objectives[:, 0], 0.0)
+        optimizer.evaluated = np.ones(len(objectives), dtype=bool)
+
+    def evaluate(self, optimizer, pop: np.ndarray) -> None:
+        self.set_objectives(optimizer, optimizer.evaluate(pop))
+
+    def step(self, optimizer) -> None:
+        with optimizer.timed("select"):
+            indexes = optimizer.selection.crowded_tournament_indices(self.ranks, self.crowding, optimizer.pop_size)
+        offspring = optimizer.get_offspring(indexes)
+        optimizer.generation += 1
+        offspring_objectives = optimizer.evaluate(offspring)
+        with optimizer.timed("select"):
+            pop = np.concatenate([optimizer.pop, offspring])
+            objectives = np.concatenate([self.objectives, offspring_objectives])
+            order, ranks, crowding = optimizer.selection.nsga2_sort(objectives)
+            survivors = order[:optimizer.pop_size]
+        # the survivors keep their ranks, the fronts better than the last kept one are complete
+        optimizer.pop = pop[survivors]
+        self.set_objectives(optimizer, objectives[survivors], ranks[survivors], crowding[survivors])
+
+    def get_ranking_key(self, optimizer) -> np.ndarray:
+        key = np.empty(len(optimizer.pop))
+        key[np.lexsort((-self.crowding, self.ranks))] = np.arange(len(optimizer.pop))
+        return np.where(optimizer.fit_value > 0, key, np.inf)
+
+    def get_values(self, optimizer) -> np.ndarray:
+        return self.objectives
+
+    def set_values(self, optimizer, indexes: np.ndarray, values: np.ndarray) -> None:
+        self.objectives[indexes] = values
+        self.set_objectives(optimizer, self.objectives)
+
+    def get_arrays(self) -> Dict[str, np.ndarray]:
+        return {"objectives": self.objectives}
+
+    def set_arrays(self, optimizer, arrays: Dict[str, np.ndarray]) -> None:
+        self.set_objectives(optimizer, np.array(arrays["objectives"]))
+
+    def get_result(self, optimizer) -> dict:
+        return {"pareto_front": self.get_pareto_front(optimizer) if optimizer.pop is not None else None}
+
+    def get_pareto_front(self, optimizer) -> dict:
+        """Get the distinct valid individuals of the first front, sorted by the first objective."""
+        front = np.flatnonzero((self.ranks == 0) & (optimizer.fit_value > 0))
+        _, distinct = np.unique(optimizer.pop[front].reshape(len(front), -1), axis=0, return_index=True)
+        front = front[distinct]
+        front = front[np.argsort(self.objectives[front, 0], kind="stable")]
+        individuals = optimizer.pop[front]
+        return {
+            "individuals": individuals,
+            "phenotypes": optimizer.decoder.decode(individuals, out=np.empty(individuals.shape)),
+            "objectives": self.objectives[front]
+        }
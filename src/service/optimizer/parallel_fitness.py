@@ -0,0 +1,135 @@
+"""
+This scrip define a fitness evaluation engine running on a process pool
+
+The phenotypes are written into shared memory, the workers read their chunk of it
+without pickling and only send back the fit values of the chunk.
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+# the fitness function and the attached shared memory of each worker process
+_worker_fitness_function = None
+_worker_shared_memory: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def _init_worker(fitness_function: Callable[[np.ndarray], np.ndarray]) -> None:
+    global _worker_fitness_function  # pylint: disable=global-statement
+    _worker_fitness_function = fitness_function
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach a shared memory block once per worker, it is unlinked by its owner only."""
+    if name not in _worker_shared_memory:
+        # the owner has replaced the former block
+        for former_block in _worker_shared_memory.values():
+            former_block.close()
+        _worker_shared_memory.clear()
+        # the pool processes share the resource tracker of the owner, which unlinks the block
+        _worker_shared_memory[name] = shared_memory.SharedMemory(name=name)
+    return _worker_shared_memory[name]
+
+
+def _evaluate_chunk(name: str, shape: Tuple[int, ...], dtype: str, start: int, stop: int) -> np.ndarray:
+    block = _attach(name)
+    phenotypes = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    return np.asarray(_worker_fitness_function(phenotypes[start:stop]), dtype=float)
+
+
+class ParallelFitnessEvaluator:
+    """This class evaluates the fit values of a population on a process pool.
+
+    fitness_function takes a (n, number_of_features, future_step) phenotype array and
+    returns the n fit values, it should be picklable (a module level function or a
+    functools.partial of it). Write the phenotypes into get_buffer(shape) to skip
+    copying them into the shared memory, e.g. PhenotypeDecoder.decode(index_pop, out=buffer).
+
+    The pool processes can't be started in a daemon process such as a celery prefork
+    worker, use workers=1 (evaluate in the calling process) or a threads/solo pool there.
+
+    Examples:
+        >>> with ParallelFitnessEvaluator(partial(weighted_cost_batch, cost_weights=weights), workers=4) as evaluator:
+        ...     fit_value = evaluator.evaluate(phenotypes)
+    """
+
+    def __init__(
+        self,
+        fitness_function: Callable[[np.ndarray], np.ndarray],
+        workers: int = 1,
+        chunk_size: Optional[int] = None
+    ) -> None:
+        self.fitness_function = fitness_function
+        self.workers = max(1, workers)
+        self.chunk_size = chunk_size
+        self._pool = None
+        self._shared_memory = None
+        self._buffer = None
+
+    def get_buffer(self, shape: Tuple[int, ...], dtype=float) -> np.ndarray:
+        """Get a phenotype array in shared memory.
+
+        The memory is reused while the shape of an individual and dtype are the same and
+        the population is not larger than before, so populations of varying sizes don't
+        reallocate it.
+        """
+        dtype = np.dtype(dtype)
+        block = self._buffer
+        if block is None or block.shape[1:] != tuple(shape[1:]) or block.dtype != dtype or len(block) < shape[0]:
+            self._release_shared_memory()
+            if self.workers == 1:
+                self._buffer = np.empty(shape, dtype=dtype)
+            else:
+                nbytes = max(1, int(np.prod(shape)) * dtype.itemsize)
+                self._shared_memory = shared_memory.SharedMemory(create=True, size=nbytes)
+                self._buffer = np.ndarray(shape, dtype=dtype, buffer=self._shared_memory.buf)
+        return self._buffer[:shape[0]]
+
+    def evaluate(self, phenotypes: np.ndarray) -> np.ndarray:
+        """Evaluate the fit values of a (pop_size, number_of_features, future_step) phenotype array."""
+        buffer = self.get_buffer(phenotypes.shape, phenotypes.dtype)
+        if phenotypes.__array_interface__["data"][0] != buffer.__array_interface__["data"][0]:
+            np.copyto(buffer, phenotypes)
+        if self.workers == 1:
+            return np.asarray(self.fitness_function(buffer), dtype=float)
+
+        pop_size = len(buffer)
+        chunk_size = self.chunk_size or math.ceil(pop_size / (self.workers * 4))
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(self.fitness_function,)
+            )
+        futures = [
+            self._pool.submit(
+                _evaluate_chunk, self._shared_memory.name, buffer.shape, buffer.dtype.str,
+                start, min(start + chunk_size, pop_size)
+            )
+            for start in range(0, pop_size, chunk_size)
+        ]
+        return np.concatenate([future.result() for future in futures]) if futures else np.empty(0)
+
+    def _release_shared_memory(self) -> None:
+        self._buffer = None
+        if self._shared_memory is not None:
+            try:
+                self._shared_memory.close()
+            except BufferError:
+                # the caller still holds the buffer, it is unmapped when the buffer is released
+                pass
+            self._shared_memory.unlink()
+            self._shared_memory = None
+
+    def close(self) -> None:
+        """Shutdown the pool and free the shared memory."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        self._release_shared_memory()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -55,4 +55,146 @@ class SA:
         output = []
         output.append(temp);
 
-        return output
\ No newline at end of file
+        return output
+
+class VectorizedSA:
+    """SA method running many independent chains as one index population array.
+
+    Each step moves the genes of all chains by ±1 (clipped to the actions) with
+    move_probability, 1 moves every gene like anneal_stride, and accepts the moves
+    with anneal_prob_batch. evaluate takes a (chains, number_of_features, future_step)
+    index array and returns the fit values, lower is better and <= 0 is invalid.
+
+    With tempering_interval, the chains run on a ladder of temperatures from T to
+    T * tempering_ratio, and adjacent chains of the ladder swap states every
+    tempering_interval steps (parallel tempering). repair, if given, is applied to the
+    moved states before they are evaluated.
+    """
+
+    COOLING_SCHEDULES = ("exponential", "linear", "logarithmic")
+
+    def __init__(
+        self,
+        accuracy: list,
+        evaluate,
+        steps: int = 100,
+        initial_temperature: float = 10.0,
+        final_temperature: float = 0.01,
+        cooling_schedule: str = "exponential",
+        move_probability: float = 1.0,
+        tempering_interval: int = None,
+        tempering_ratio: float = 10.0,
+        repair=None,
+        rng: np.random.Generator = None
+    ) -> None:
+        if cooling_schedule not in self.COOLING_SCHEDULES:
+            raise ValueError(f"cooling_schedule should be one of {self.COOLING_SCHEDULES}, got {cooling_schedule}")
+        self.accuracy = accuracy
+        self.evaluate = evaluate
+        self.steps = steps
+        self.initial_temperature = initial_temperature
+        self.final_temperature = final_temperature
+        self.cooling_schedule = cooling_schedule
+        self.move_probability = move_probability
+        self.tempering_interval = tempering_interval
+        self.tempering_ratio = tempering_ratio
+        self.repair = repair
+        self.rng = np.random.default_rng() if rng is None else rng
+
+    @staticmethod
+    def anneal_prob_batch(delta_c: np.ndarray, temperature) -> np.ndarray:
+        """Anneal prob of each chain, delta_c is the current minus the new fit value"""
+        with np.errstate(invalid="ignore", over="ignore"):
+            return np.exp(np.minimum(np.nan_to_num(delta_c / temperature, nan=-np.inf), 0.0))
+
+    def get_temperature(self, step: int) -> float:
+        """Temperature of the cooling schedule at step"""
+        progress = step / max(self.steps - 1, 1)
+        if self.cooling_schedule == "exponential":
+            return self.initial_temperature * (self.final_temperature / self.initial_temperature) ** progress
+        if self.cooling_schedule == "linear":
+            return self.initial_temperature + (self.final_temperature - self.initial_temperature) * progress
+        return max(self.initial_temperature / np.log(np.e + step), self.final_temperature)
+
+    def stride(self, states: np.ndarray) -> np.ndarray:
+        """Move the genes of all chains by ±1, clipped to the actions"""
+        high = np.asarray(self.accuracy[:states.shape[1]], dtype=np.int64)[:, np.newaxis]
+        moves = np.where(self.rng.random(states.shape) < 0.5, 1, -1)
+        moves *= self.rng.random(states.shape) < self.move_probability
+        return np.clip(states + moves, 0, high - 1).astype(states.dtype)
+
+    def _swap_temperatures(self, states: np.ndarray, energy: np.ndarray, temperature: np.ndarray, offset: int) -> tuple:
+        """Swap the states of adjacent chains of the ladder, chain i has the temperature temperature[i].
+
+        A swap is accepted with the probability min(1, exp((E_l - E_u) * (1 / T_l - 1 / T_u))).
+
+        Returns:
+            the numbers of attempted and accepted swaps.
+        """
+        lower = np.arange(offset, len(temperature) - 1, 2)
+        upper = lower + 1
+        with np.errstate(invalid="ignore", over="ignore"):
+            exponent = (energy[lower] - energy[upper]) * (1 / temperature[lower] - 1 / temperature[upper])
+        swap = self.rng.random(len(lower)) < np.exp(np.minimum(np.nan_to_num(exponent, nan=-np.inf), 0.0))
+        lower, upper = lower[swap], upper[swap]
+        states[lower], states[upper] = states[upper].copy(), states[lower].copy()
+        energy[lower], energy[upper] = energy[upper].copy(), energy[lower].copy()
+        return len(swap), int(swap.sum())
+
+    def run(self, states: np.ndarray) -> dict:
+        """Anneal the chains starting from states.
+
+        Returns:
+            a dict of best_fit, best_individual, states and fit_value (the chains at the
+            end), chain_best_states and chain_best_fit_value (the best state of each chain,
+            0 if none is valid), acceptance_rate, swap_rate (None without tempering) and
+            history (the best fit value after each step).
+        """
+        states = states.copy()
+        energy = np.asarray(self.evaluate(states), dtype=float)
+        energy = np.where(energy > 0, energy, np.inf)
+        ladder = np.ones(len(states))
+        if self.tempering_interval:
+            ladder = np.geomspace(1.0, self.tempering_ratio, len(states))
+
+        chain_best_states, chain_best_energy = states.copy(), energy.copy()
+        history, accepted = [], 0
+        swap_attempts, swaps = 0, 0
+        for step in range(self.steps):
+            temperature = self.get_temperature(step) * ladder
+            candidates = self.stride(states)
+            if self.repair is not None:
+                candidates = self.repair(candidates)
+            candidate_energy = np.asarray(self.evaluate(candidates), dtype=float)
+            candidate_energy = np.where(candidate_energy > 0, candidate_energy, np.inf)
+            accept = (candidate_energy <= energy) | ~np.isfinite(energy)
+            accept |= self.rng.random(len(states)) < self.anneal_prob_batch(energy - candidate_energy, temperature)
+            states[accept], energy[accept] = candidates[accept], candidate_energy[accept]
+            accepted += int(accept.sum())
+
+            if self.tempering_interval and (step + 1) % self.tempering_interval == 0:
+                attempted, swapped = self._swap_temperatures(
+                    states, energy, temperature, offset=((step + 1) // self.tempering_interval) % 2
+                )
+                swap_attempts += attempted
+                swaps += swapped
+
+            improved = energy < chain_best_energy
+            chain_best_states[improved], chain_best_energy[improved] = states[improved], energy[improved]
+            best_fit = chain_best_energy.min()
+            history.append(float(best_fit) if np.isfinite(best_fit) else None)
+
+        best_index = int(np.argmin(chain_best_energy))
+        best_fit, best_individual = chain_best_energy[best_index], chain_best_states[best_index]
+
+        return {
+            "best_fit": float(best_fit) if np.isfinite(best_fit) else None,
+            "best_individual": best_individual if np.isfinite(best_fit) else None,
+            "states": states,
+            "fit_value": np.where(np.isfinite(energy), energy, 0.0),
+            "chain_best_states": chain_best_states,
+            "chain_best_fit_value": np.where(np.isfinite(chain_best_energy), chain_best_energy, 0.0),
+            "acceptance_rate": accepted / max(self.steps * len(states), 1),
+            "swap_rate": swaps / swap_attempts if swap_attempts else None,
+            "history": history
+        }
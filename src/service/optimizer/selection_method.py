@@ -1,16 +1,199 @@
 """
 GA 選擇 : 保留最佳解 
+
+The *_indices methods are vectorized and return the row indexes of the selected
+individuals, so a population array is selected with pop[indexes]. A fitness is
+better when it is lower, and a fitness <= 0 is invalid and never selected.
+The fit values of a batch of sites are a (sites, pop_size) array, the individuals are
+selected within each site and the indexes are (sites, number) row indexes of each site.
+
+The multi-objective (NSGA-II) methods take an (n, number_of_objectives) array of
+objectives to minimize, the first objective follows the fitness convention.
 """
-from typing import List, Tuple
+from typing import List, Optional, Tuple, Union
 import random
 import numpy as np
 
 class SelectionMethod:
     """This class is to define selection method."""
 
+    SELECTION_METHODS = ("roulette", "sus", "tournament")
+
     def __init__(self,
-            pop_size: int = None) -> None:
+            pop_size: int = None,
+            rng: Optional[np.random.Generator] = None) -> None:
         self.pop_size = pop_size
+        self.rng = np.random.default_rng() if rng is None else rng
+
+    @staticmethod
+    def get_best_index(fit_value) -> Union[int, np.ndarray]:
+        """get the index of the best individual, 0 if no fitness is valid like get_best_individual"""
+        fit_value = np.asarray(fit_value, dtype=float)
+        best_index = np.argmin(np.where(fit_value > 0, fit_value, np.inf), axis=-1)
+        return int(best_index) if fit_value.ndim == 1 else best_index
+
+    @staticmethod
+    def get_probability(fit_value) -> np.ndarray:
+        """convert fit values to selection probabilities, proportional to 1 / fit value"""
+        fit_value = np.asarray(fit_value, dtype=float)
+        weight = np.divide(1.0, fit_value, out=np.zeros_like(fit_value), where=fit_value > 0)
+        # uniform if no fitness is valid
+        weight[weight.sum(axis=-1) == 0] = 1.0
+        return weight / weight.sum(axis=-1, keepdims=True)
+
+    @staticmethod
+    def _search_wheel(cumulative: np.ndarray, pointers: np.ndarray) -> np.ndarray:
+        """the indexes of the wheel slots of the pointers, on the wheel of each site"""
+        pop_size = cumulative.shape[-1]
+        if cumulative.ndim == 1:
+            return np.minimum(np.searchsorted(cumulative, pointers, side="right"), pop_size - 1)
+        # the wheels of the sites are laid one after the other, each spans [0, 1]
+        sites = np.arange(int(np.prod(cumulative.shape[:-1])))[:, np.newaxis].reshape(cumulative.shape[:-1] + (1,))
+        indexes = np.searchsorted((cumulative + 2 * sites).ravel(), (pointers + 2 * sites).ravel(), side="right")
+        indexes = indexes.reshape(pointers.shape) - sites * pop_size
+        return np.clip(indexes, 0, pop_size - 1)
+
+    def roulette_indices(self, fit_value, number: int) -> np.ndarray:
+        """Roulette wheel selection, number independent spins of the wheel."""
+        cumulative = np.cumsum(self.get_probability(fit_value), axis=-1)
+        spins = self.rng.random(cumulative.shape[:-1] + (number,)) * cumulative[..., -1:]
+        return self._search_wheel(cumulative, spins)
+
+    def sus_indices(self, fit_value, number: int) -> np.ndarray:
+        """Stochastic universal sampling, number evenly spaced pointers on one spin of the wheel."""
+        cumulative = np.cumsum(self.get_probability(fit_value), axis=-1)
+        spin = self.rng.random() if cumulative.ndim == 1 else self.rng.random(cumulative.shape[:-1] + (1,))
+        pointers = (spin + np.arange(number)) / number * cumulative[..., -1:]
+        return self._search_wheel(cumulative, pointers)
+
+    def tournament_indices(self, fit_value, number: int, tournament_size: int = 2) -> np.ndarray:
+        """Tournament selection, the best of tournament_size random valid individuals wins each tournament."""
+        fit_value = np.asarray(fit_value, dtype=float)
+        if fit_value.ndim == 1:
+            valid = np.flatnonzero(fit_value > 0)
+            if valid.size == 0:
+                valid = np.arange(len(fit_value))
+            candidates = valid[self.rng.integers(0, valid.size, size=(number, tournament_size))]
+            return candidates[np.arange(number), np.argmin(fit_value[candidates], axis=1)]
+
+        # the valid individuals of each site first, all of them if none is valid
+        valid = fit_value > 0
+        valid[~valid.any(axis=-1)] = True
+        valid_order = np.argsort(~valid, axis=-1, kind="stable")
+        number_of_valid = valid.sum(axis=-1)[..., np.newaxis]
+        draws = self.rng.integers(0, number_of_valid, size=fit_value.shape[:-1] + (number * tournament_size,))
+        candidates = np.take_along_axis(valid_order, draws, axis=-1)
+        candidates = candidates.reshape(fit_value.shape[:-1] + (number, tournament_size))
+        candidate_fit_value = np.take_along_axis(fit_value, candidates.reshape(fit_value.shape[:-1] + (-1,)), axis=-1)
+        winners = np.argmin(candidate_fit_value.reshape(candidates.shape), axis=-1)
+        return np.take_along_axis(candidates, winners[..., np.newaxis], axis=-1)[..., 0]
+
+    def select_indices(self, fit_value, method: str = "roulette", number: Optional[int] = None, **kwargs) -> np.ndarray:
+        """Select individuals by method.
+
+        Parameters:
+            fit_value: the fit values of the population.
+            method: one of SELECTION_METHODS.
+            number: the number of individuals to select, pop_size - 1 if None, leaving a
+                place to the best individual like selection.
+
+        Returns:
+            the row indexes of the selected individuals.
+        """
+        if method not in self.SELECTION_METHODS:
+            raise ValueError(f"method should be one of {self.SELECTION_METHODS}, got {method}")
+        number = self.pop_size - 1 if number is None else number
+        return getattr(self, f"{method}_indices")(fit_value, number, **kwargs)
+
+    @staticmethod
+    def get_valid_objectives(objectives) -> np.ndarray:
+        """whether each row of objectives is valid, its first objective > 0 and all finite"""
+        objectives = np.asarray(objectives, dtype=float)
+        return (objectives[:, 0] > 0) & np.isfinite(objectives).all(axis=1)
+
+    @classmethod
+    def non_dominated_sort(cls, objectives) -> np.ndarray:
+        """Fast non-dominated sort, the rank of the front of each individual.
+
+        The front 0 is the Pareto front, the front r is dominated by the fronts < r only.
+        The invalid individuals are ranked after all valid fronts.
+        """
+        objectives = np.asarray(objectives, dtype=float)
+        valid = cls.get_valid_objectives(objectives)
+        values = objectives[valid]
+        # dominates[i, j]: i is not worse than j for every objective and better for one
+        dominates = (
+            (values[:, np.newaxis] <= values[np.newaxis]).all(axis=2)
+            & (values[:, np.newaxis] < values[np.newaxis]).any(axis=2)
+        )
+        domination_count = dominates.sum(axis=0)
+        valid_ranks = np.empty(len(values), dtype=int)
+        rank = 0
+        front = np.flatnonzero(domination_count == 0)
+        while front.size:
+            valid_ranks[front] = rank
+            domination_count[front] = -1
+            domination_count -= dominates[front].sum(axis=0)
+            front = np.flatnonzero(domination_count == 0)
+            rank += 1
+        ranks = np.full(len(objectives), rank, dtype=int)
+        ranks[valid] = valid_ranks
+        return ranks
+
+    @staticmethod
+    def crowding_distance(objectives, ranks) -> np.ndarray:
+        """Crowding distance of each individual in its front, inf at the boundaries of the front.
+
+        It is the sum over the objectives of the gap between the two neighbours of the
+        individual, divided by the range of the objective on the front.
+        """
+        objectives = np.asarray(objectives, dtype=float)
+        number = len(objectives)
+        distance = np.zeros(number)
+        if number == 0:
+            return distance
+        positions = np.arange(number)
+        for values in objectives.T:
+            order = np.lexsort((values, ranks))
+            sorted_values, sorted_ranks = values[order], ranks[order]
+            new_front = sorted_ranks[1:] != sorted_ranks[:-1]
+            first, last = np.r_[True, new_front], np.r_[new_front, True]
+            front_start = np.maximum.accumulate(np.where(first, positions, 0))
+            front_stop = np.minimum.accumulate(np.where(last, positions, number)[::-1])[::-1]
+            with np.errstate(invalid="ignore"):
+                span = sorted_values[front_stop] - sorted_values[front_start]
+                gap = np.zeros(number)
+                gap[1:-1] = sorted_values[2:] - sorted_values[:-2]
+                contribution = np.divide(gap, span, out=np.zeros(number), where=span > 0)
+            contribution[first | last] = np.inf
+            distance[order] += contribution
+        return distance
+
+    @classmethod
+    def nsga2_sort(cls, objectives) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sort individuals by front rank, then by decreasing crowding distance.
+
+        Returns:
+            the sorted row indexes, the ranks and the crowding distances.
+        """
+        ranks = cls.non_dominated_sort(objectives)
+        crowding = cls.crowding_distance(objectives, ranks)
+        return np.lexsort((-crowding, ranks)), ranks, crowding
+
+    @classmethod
+    def get_pareto_front_indices(cls, objectives) -> np.ndarray:
+        """get the indexes of the valid non-dominated individuals"""
+        objectives = np.asarray(objectives, dtype=float)
+        return np.flatnonzero((cls.non_dominated_sort(objectives) == 0) & cls.get_valid_objectives(objectives))
+
+    def crowded_tournament_indices(self, ranks, crowding, number: int, tournament_size: int = 2) -> np.ndarray:
+        """Crowded tournament selection, the lowest rank wins, then the largest crowding distance."""
+        ranks, crowding = np.asarray(ranks), np.asarray(crowding)
+        candidates = self.rng.integers(0, len(ranks), size=(number, tournament_size))
+        candidate_ranks = ranks[candidates]
+        best_rank = candidate_ranks == candidate_ranks.min(axis=1, keepdims=True)
+        winners = np.argmax(np.where(best_rank, crowding[candidates], -np.inf), axis=1)
+        return candidates[np.arange(number), winners]
 
     @staticmethod
     def get_best_individual(pop, fit_value)-> Tuple[list, float]:
@@ -25,7 +208,11 @@ class SelectionMethod:
 
     @staticmethod
     def get_best_individual_for_contract(pop, fit_value)-> Tuple[list, float]:
-        """get best individual"""
+        """get best individual, the ties are broken by the normal demand contract
+
+        To trade the cost off against the contract, use it as a second objective instead,
+        see nsga2_sort and fitness.cost_and_contract_batch.
+        """
         best_individual = pop[0]
         best_fit = fit_value[0]#in case = 0
         for i in range(1, len(pop)):
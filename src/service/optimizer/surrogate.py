@@ -0,0 +1,108 @@
+"""
+This scrip define a surrogate model screening the offspring before the real fitness evaluation
+
+A cheap regressor is fitted online on the (genotype, fit value) pairs evaluated so far,
+and only the offspring with the best predicted fit values are evaluated.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+from sklearn.ensemble import HistGradientBoostingRegressor
+
+from src.service.optimizer.generation import ElitistGeneration
+
+
+class SurrogateScreener:
+    """This class ranks index populations with a regressor of their fit values.
+
+    The regressor is refitted every retrain_interval generations on the last max_samples
+    valid samples, once there are min_samples of them. Any scikit-learn regressor can be
+    given, a small gradient boosting ensemble by default.
+    """
+
+    def __init__(
+        self,
+        top_fraction: float = 0.3,
+        retrain_interval: int = 5,
+        min_samples: int = 200,
+        max_samples: int = 5000,
+        regressor=None,
+        random_state: Optional[int] = None
+    ) -> None:
+        if not 0 < top_fraction <= 1:
+            raise ValueError("top_fraction should be in (0, 1]")
+        self.top_fraction = top_fraction
+        self.retrain_interval = retrain_interval
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.regressor = regressor if regressor is not None else HistGradientBoostingRegressor(
+            max_iter=50, random_state=random_state
+        )
+        self.is_fitted = False
+        self.trainings = 0
+        self._features = None
+        self._fit_value = None
+        self._size = 0
+        self._next = 0
+
+    @staticmethod
+    def get_features(pop: np.ndarray) -> np.ndarray:
+        """The features of the genotypes, their flattened action indexes."""
+        return pop.reshape(len(pop), -1)
+
+    def add_samples(self, pop: np.ndarray, fit_value: np.ndarray) -> None:
+        """Keep the valid (genotype, fit value) pairs, the oldest are replaced after max_samples."""
+        valid = fit_value > 0
+        features, fit_value = self.get_features(pop[valid]), fit_value[valid]
+        if self._features is None:
+            self._features = np.empty((self.max_samples, features.shape[1]), dtype=pop.dtype)
+            self._fit_value = np.empty(self.max_samples, dtype=float)
+        features, fit_value = features[-self.max_samples:], fit_value[-self.max_samples:]
+        positions = (self._next + np.arange(len(fit_value))) % self.max_samples
+        self._features[positions] = features
+        self._fit_value[positions] = fit_value
+        self._next = (self._next + len(fit_value)) % self.max_samples
+        self._size = min(self._size + len(fit_value), self.max_samples)
+
+    def maybe_retrain(self, generation: int) -> bool:
+        """Refit the regressor every retrain_interval generations once there are min_samples samples."""
+        if self._size < self.min_samples or (self.is_fitted and generation % self.retrain_interval):
+            return False
+        self.regressor.fit(self._features[:self._size], self._fit_value[:self._size])
+        self.is_fitted = True
+        self.trainings += 1
+        return True
+
+    def predict(self, pop: np.ndarray) -> np.ndarray:
+        """Predict the fit values of a population."""
+        return self.regressor.predict(self.get_features(pop))
+
+    def screen(self, predicted_fit_value: np.ndarray) -> np.ndarray:
+        """Get the indexes of the top_fraction individuals with the lowest predicted fit values."""
+        number = max(1, int(np.ceil(len(predicted_fit_value) * self.top_fraction)))
+        return np.argsort(predicted_fit_value, kind="stable")[:number]
+
+
+class SurrogateGeneration(ElitistGeneration):
+    """This class evaluates the offspring screened by a SurrogateScreener once it is fitted.
+
+    The elites keep their fit values, the other offspring get their predicted fit values for
+    the selection but never become the best, elite or emigrant individuals.
+    """
+
+    def __init__(self, surrogate: SurrogateScreener) -> None:
+        self.surrogate = surrogate
+
+    def get_fit_value(self, optimizer, pop: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if not self.surrogate.is_fitted:
+            fit_value, evaluated = super().get_fit_value(optimizer, pop)
+        else:
+            evaluated = np.zeros(len(pop), dtype=bool)
+            with optimizer.timed("surrogate"):
+                fit_value = self.surrogate.predict(pop)
+                evaluated[self.surrogate.screen(fit_value)] = True
+            fit_value[evaluated] = optimizer.evaluate(pop[evaluated])
+        with optimizer.timed("surrogate"):
+            self.surrogate.add_samples(pop[evaluated], fit_value[evaluated])
+            self.surrogate.maybe_retrain(optimizer.generation)
+        return fit_value, evaluated
@@ -1,33 +1,142 @@
 """This scrip is for define scheduler work"""
+from datetime import datetime
+from typing import Optional
+
 import pytz
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.executors.pool import ProcessPoolExecutor, ThreadPoolExecutor
+from apscheduler.schedulers.base import STATE_RUNNING
+from apscheduler.triggers.base import BaseTrigger
+from apscheduler.triggers.cron import CronTrigger
 
-from config.project_setting import auto_update_model_settings, auto_delete_data_settings
+from config.project_setting import auto_update_model_settings, auto_delete_data_settings, schedule_config
 from config.logger_setting import log
-from src.service.auto_update_model import AutoUpdateModelService
+from src.operator.redis import RedisOperator
+from src.service.event.redis.lock_admin import LockAdmin
+from src.service.schedule import jobs
+from src.service.schedule.fenced_scheduler import FencedBackgroundScheduler
+from src.service.schedule.job_history import JobRunHistory
+from src.service.schedule.job_metrics import JobMetrics
+from src.service.schedule.job_store import PostgresJobStore
 from src.util.data_management import DataManagement
 
 
 
 class ScheduleWork:
-    """This class is for the schedule task application."""
+    """This class is for the schedule task application.
+
+    CPU heavy jobs should use the "processpool" executor, so they don't hold the GIL
+    of the process running the scheduler. Jobs are kept in PostgreSQL, and a job can be
+    triggered manually by publishing its id on TRIGGER_CHANNEL.
+    When it is started with the fencing token of its election on LEADER_NAME, the due jobs
+    are only run while no other scheduler has been elected since.
+    """
+
+    TIMEZONE = pytz.timezone("Asia/Taipei")
+    TRIGGER_CHANNEL = "schedule_job_trigger"
+    LEADER_NAME = "apscheduler"
+
     def __init__(self):
-        self.scheduler = BackgroundScheduler()
+        self.scheduler = FencedBackgroundScheduler(fencing_check=self.is_fencing_token_valid)
         self.scheduler.configure(
-            timezone=pytz.timezone("Asia/Taipei"),
+            timezone=self.TIMEZONE,
+            jobstores={"default": PostgresJobStore()},
+            executors={
+                "default": ThreadPoolExecutor(schedule_config.thread_pool_workers),
+                "processpool": ProcessPoolExecutor(schedule_config.process_pool_workers)
+            },
+            job_defaults={
+                "coalesce": schedule_config.coalesce,
+                "max_instances": schedule_config.max_instances,
+                "misfire_grace_time": schedule_config.misfire_grace_time
+            }
         )
+        self.redis_operator = RedisOperator()
+        self.lock_admin = LockAdmin(self.redis_operator)
+        self.fencing_token: Optional[int] = None
+        self.job_metrics = JobMetrics(self.redis_operator)
+        self.job_run_history = JobRunHistory()
+        self.scheduler.add_listener(self.job_metrics.listener, JobMetrics.EVENT_MASK)
+        self.scheduler.add_listener(self.job_run_history.listener, JobRunHistory.EVENT_MASK)
+        self._pubsub = None
+        self._pubsub_thread = None
 
     def schedule_task_pipeline(self):
         """schedule_task_pipeline: Use apscheduler to do the cronjob."""
-        
-        auto_update_model_service = AutoUpdateModelService()
-
-        self.scheduler.add_job(
-            auto_update_model_service.schedule_update_model,
-            "cron",
-            day=auto_update_model_settings.day,
-            id=auto_update_model_settings.id
+        # start paused to read the stored jobs before the missed runs are caught up
+        self.scheduler.start(paused=True)
+
+        self._add_or_keep_job(
+            jobs.schedule_update_model,
+            CronTrigger(day=auto_update_model_settings.day, timezone=self.TIMEZONE),
+            job_id=auto_update_model_settings.id,
+            executor="processpool"
         )
         log.info("Successfully setting the APSchedule.")
-        self.scheduler.start()
+        self.scheduler.resume()
+        self._start_trigger_listener()
         log.info("Start the APSchedule.")
+
+    def _add_or_keep_job(self, func, trigger: BaseTrigger, job_id: str, **kwargs):
+        """Add a job, or keep the stored one and its next run time if the trigger is unchanged."""
+        job = self.scheduler.get_job(job_id)
+        if job is None:
+            self.scheduler.add_job(func, trigger, id=job_id, **kwargs)
+        elif str(job.trigger) != str(trigger):
+            self.scheduler.reschedule_job(job_id, trigger=trigger)
+            log.info(f"Reschedule the job {job_id} with {trigger}.")
+
+    def _start_trigger_listener(self):
+        self._pubsub = self.redis_operator.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{self.TRIGGER_CHANNEL: self._on_trigger_message})
+        self._pubsub_thread = self._pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+    def _on_trigger_message(self, message):
+        """Run a job now, only the scheduler which is running (not paused) does it."""
+        job_id = message["data"]
+        if isinstance(job_id, bytes):
+            job_id = job_id.decode("utf-8")
+        if self.scheduler.state != STATE_RUNNING:
+            return
+        try:
+            self.scheduler.modify_job(job_id, next_run_time=datetime.now(self.TIMEZONE))
+            log.info(f"Trigger the job {job_id} manually.")
+        except Exception as exc:
+            log.error(f"Failed to trigger the job {job_id}: {exc}")
+
+    def is_fencing_token_valid(self) -> bool:
+        """Check no other scheduler has been elected since this one, True if it is not elected."""
+        if self.fencing_token is None:
+            return True
+        if self.lock_admin.is_fencing_token_valid(self.LEADER_NAME, self.fencing_token):
+            return True
+        log.warning(f"The fencing token {self.fencing_token} of {self.LEADER_NAME} is outdated, pause the APSchedule.")
+        return False
+
+    def start(self, fencing_token: Optional[int] = None):
+        """Start the scheduler, or resume it if it has been paused.
+
+        Parameters:
+            fencing_token: the fencing token of the election on LEADER_NAME, None without election.
+        """
+        self.fencing_token = fencing_token
+        if self.scheduler.running:
+            self.scheduler.resume()
+            log.info("Resume the APSchedule.")
+        else:
+            self.schedule_task_pipeline()
+
+    def pause(self):
+        """Pause the scheduler, jobs are not run until it is resumed."""
+        if self.scheduler.running:
+            self.scheduler.pause()
+            log.info("Pause the APSchedule.")
+
+    def shutdown(self):
+        """Shutdown the scheduler without waiting for the running jobs."""
+        if self._pubsub_thread:
+            self._pubsub_thread.stop()
+            self._pubsub.close()
+            self._pubsub_thread = None
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+            log.info("Shutdown the APSchedule.")
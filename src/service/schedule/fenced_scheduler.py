@@ -0,0 +1,35 @@
+"""This scrip define a scheduler which only runs the due jobs while its leadership is valid"""
+from typing import Callable, Optional
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.base import STATE_RUNNING
+
+from config.logger_setting import log
+
+
+class FencedBackgroundScheduler(BackgroundScheduler):
+    """This class checks a fencing token before each processing of the due jobs.
+
+    fencing_check returns False once another scheduler has been elected, then the scheduler
+    is paused before any job is submitted or any next run time is written to the job store.
+    If fencing_check raises, the due jobs are not processed and it is retried after
+    RETRY_SECONDS.
+    """
+
+    RETRY_SECONDS = 1
+
+    def __init__(self, fencing_check: Optional[Callable[[], bool]] = None, **options):
+        self.fencing_check = fencing_check
+        super().__init__(**options)
+
+    def _process_jobs(self):
+        if self.state == STATE_RUNNING and self.fencing_check is not None:
+            try:
+                is_valid = self.fencing_check()
+            except Exception as exc:
+                log.error(f"Failed to check the fencing token of the APSchedule: {exc}")
+                return self.RETRY_SECONDS
+            if not is_valid:
+                self.pause()
+                return None
+        return super()._process_jobs()
@@ -0,0 +1,61 @@
+"""This scrip is for recording the run history of scheduled jobs"""
+import threading
+import time
+
+from apscheduler.events import (
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_SUBMITTED,
+    JobEvent
+)
+
+from config.logger_setting import log
+from config.project_setting import schedule_config
+from src.dao.schedule_job_run_dao import ScheduleJobRunDao
+from src.data_models.entities import ScheduleJobRun
+from src.util.function_utils import generate_id
+
+
+class JobRunHistory:
+    """This class saves every finished or missed job run into the schedule_job_runs table.
+
+    Runs older than schedule_config.job_run_history_days are deleted.
+    """
+
+    EVENT_MASK = EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED
+
+    def __init__(self):
+        self.job_run_dao = ScheduleJobRunDao()
+        self._started_at = {}
+        self._lock = threading.Lock()
+
+    def listener(self, event: JobEvent) -> None:
+        """APScheduler listener, register it with EVENT_MASK."""
+        try:
+            self._record(event)
+        except Exception as exc:
+            log.error(f"Failed to record the run history of job {event.job_id}: {exc}")
+
+    def _record(self, event: JobEvent) -> None:
+        now = time.time()
+        if event.code == EVENT_JOB_SUBMITTED:
+            with self._lock:
+                for run_time in event.scheduled_run_times:
+                    self._started_at[(event.job_id, run_time)] = now
+            return
+
+        with self._lock:
+            started_at = self._started_at.pop((event.job_id, event.scheduled_run_time), None)
+        status = {EVENT_JOB_EXECUTED: "success", EVENT_JOB_ERROR: "error", EVENT_JOB_MISSED: "missed"}[event.code]
+        job_run = ScheduleJobRun(
+            id=str(generate_id()),
+            job_id=event.job_id,
+            scheduled_run_time=event.scheduled_run_time.timestamp(),
+            started_at=started_at,
+            finished_at=now,
+            status=status,
+            error=repr(event.exception) if event.code == EVENT_JOB_ERROR else None
+        )
+        self.job_run_dao.save(job_run)
+        self.job_run_dao.delete_finished_before(now - schedule_config.job_run_history_days * 86400)
@@ -0,0 +1,38 @@
+"""This scrip define a concurrency limit of scheduled jobs shared by all nodes"""
+import functools
+import uuid
+
+from config.logger_setting import log
+from config.project_setting import schedule_config
+from src.operator.redis import RedisOperator
+from src.service.event.redis.lock_admin import LockAdmin
+
+
+def concurrency_limit(limit: int = 1):
+    """Decorate a job function, so at most `limit` runs of it are running on all nodes.
+
+    Each run holds one of `limit` redis locks, a run which gets no lock is skipped.
+    The locks expire after schedule_config.job_lock_lease_seconds if a run is killed.
+
+    Examples:
+        >>> @concurrency_limit(limit=1)
+        ... def schedule_update_model():
+        ...     ...
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            lock_admin = LockAdmin(RedisOperator())
+            owner = uuid.uuid4().hex
+            lease_ms = schedule_config.job_lock_lease_seconds * 1000
+            lock_names = [f"schedule_job:{func.__module__}.{func.__qualname__}:{slot}" for slot in range(limit)]
+            lock_name = next((name for name in lock_names if lock_admin.acquire(name, owner, lease_ms)), None)
+            if lock_name is None:
+                log.warning(f"Skip {func.__qualname__}, {limit} runs are already running.")
+                return None
+            try:
+                return func(*args, **kwargs)
+            finally:
+                lock_admin.release(lock_name, owner)
+        return wrapper
+    return decorator
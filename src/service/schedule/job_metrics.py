@@ -0,0 +1,87 @@
+"""This scrip is for recording the run time metrics of scheduled jobs"""
+import threading
+import time
+from typing import Dict
+
+from apscheduler.events import (
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_SUBMITTED,
+    JobEvent
+)
+
+from config.logger_setting import log
+from src.operator.redis import RedisOperator
+
+
+class JobMetrics:
+    """This class records job runs into a redis hash per job.
+
+    Fields of the hash: runs, errors, misses, skipped (max_instances reached),
+    last_status, last_run_at, last_duration, max_duration, total_duration and last_delay,
+    the delay between the scheduled run time and the submission of the run.
+    """
+
+    KEY_PREFIX = "schedule_job_metrics"
+    EVENT_MASK = EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES
+
+    def __init__(self, operator: RedisOperator):
+        self.operator = operator
+        self._submitted_at = {}
+        self._lock = threading.Lock()
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{job_id}"
+
+    def listener(self, event: JobEvent) -> None:
+        """APScheduler listener, register it with EVENT_MASK."""
+        try:
+            self._record(event)
+        except Exception as exc:
+            log.error(f"Failed to record the metrics of job {event.job_id}: {exc}")
+
+    def _record(self, event: JobEvent) -> None:
+        now = time.time()
+        key = self._key(event.job_id)
+        if event.code == EVENT_JOB_SUBMITTED:
+            with self._lock:
+                for run_time in event.scheduled_run_times:
+                    self._submitted_at[(event.job_id, run_time)] = now
+            delay = now - event.scheduled_run_times[-1].timestamp()
+            self.operator.hset(key, "last_delay", round(delay, 3))
+        elif event.code in (EVENT_JOB_EXECUTED, EVENT_JOB_ERROR):
+            with self._lock:
+                submitted_at = self._submitted_at.pop((event.job_id, event.scheduled_run_time), now)
+            duration = round(now - submitted_at, 3)
+            status = "success" if event.code == EVENT_JOB_EXECUTED else "error"
+            max_duration = float(self.operator.hget(key, "max_duration") or 0)
+            with self.operator.pipeline() as pipe:
+                pipe.hincrby(key, "runs", 1)
+                if status == "error":
+                    pipe.hincrby(key, "errors", 1)
+                pipe.hincrbyfloat(key, "total_duration", duration)
+                pipe.hset(key, mapping={
+                    "last_status": status,
+                    "last_run_at": round(now, 3),
+                    "last_duration": duration,
+                    "max_duration": max(max_duration, duration)
+                })
+                pipe.execute()
+            log.info(f"Job {event.job_id} finished with {status} in {duration} seconds.")
+        elif event.code == EVENT_JOB_MISSED:
+            self.operator.hincrby(key, "misses", 1)
+            log.warning(f"Job {event.job_id} missed its run time {event.scheduled_run_time}.")
+        elif event.code == EVENT_JOB_MAX_INSTANCES:
+            self.operator.hincrby(key, "skipped", 1)
+            log.warning(f"Job {event.job_id} is skipped, max_instances is reached.")
+
+    def get_metrics(self, job_id: str) -> Dict[str, str]:
+        """Return the metrics of a job."""
+        metrics = self.operator.hgetall(self._key(job_id))
+        return {
+            (key.decode("utf-8") if isinstance(key, bytes) else key):
+            (value.decode("utf-8") if isinstance(value, bytes) else value)
+            for key, value in metrics.items()
+        }
@@ -0,0 +1,87 @@
+"""This scrip define a APScheduler job store on PostgreSQL"""
+import pickle
+
+from apscheduler.job import Job
+from apscheduler.jobstores.base import BaseJobStore, ConflictingIdError, JobLookupError
+from apscheduler.util import datetime_to_utc_timestamp, utc_timestamp_to_datetime
+
+from config.logger_setting import log
+from src.dao.schedule_job_dao import ScheduleJobDao
+from src.data_models.entities import ScheduleJob
+
+
+class PostgresJobStore(BaseJobStore):
+    """This class stores jobs in the schedule_jobs table through the service connection pool.
+
+    Job definitions and next run times survive restarts, so runs missed while no scheduler
+    was running are caught up (once, when coalesce is enabled) after the next start.
+    """
+    def __init__(self, pickle_protocol: int = pickle.HIGHEST_PROTOCOL):
+        super().__init__()
+        self.pickle_protocol = pickle_protocol
+        self.job_dao = None
+
+    def start(self, scheduler, alias):
+        super().start(scheduler, alias)
+        self.job_dao = ScheduleJobDao()
+
+    def lookup_job(self, job_id):
+        job_entity = self.job_dao.find_by_id(job_id)
+        return self._reconstitute_job(job_entity.job_state) if job_entity else None
+
+    def get_due_jobs(self, now):
+        return self._get_jobs(self.job_dao.find_due(datetime_to_utc_timestamp(now)))
+
+    def get_next_run_time(self):
+        return utc_timestamp_to_datetime(self.job_dao.find_next_run_time())
+
+    def get_all_jobs(self):
+        jobs = self._get_jobs(self.job_dao.find_all())
+        self._fix_paused_jobs_sorting(jobs)
+        return jobs
+
+    def add_job(self, job):
+        if self.job_dao.find_by_id(job.id):
+            raise ConflictingIdError(job.id)
+        if not self.job_dao.save(self._to_entity(job)):
+            raise ConflictingIdError(job.id)
+
+    def update_job(self, job):
+        if not self.job_dao.update_by_id(job.id, self._to_entity(job)):
+            raise JobLookupError(job.id)
+
+    def remove_job(self, job_id):
+        if not self.job_dao.delete_job(job_id):
+            raise JobLookupError(job_id)
+
+    def remove_all_jobs(self):
+        self.job_dao.delete_all()
+
+    def _to_entity(self, job: Job) -> ScheduleJob:
+        return ScheduleJob(
+            id=job.id,
+            next_run_time=datetime_to_utc_timestamp(job.next_run_time),
+            job_state=pickle.dumps(job.__getstate__(), self.pickle_protocol)
+        )
+
+    def _reconstitute_job(self, job_state: bytes) -> Job:
+        job_state = pickle.loads(job_state)
+        job_state["jobstore"] = self
+        job = Job.__new__(Job)
+        job.__setstate__(job_state)
+        job._scheduler = self._scheduler
+        job._jobstore_alias = self._alias
+        return job
+
+    def _get_jobs(self, job_entities):
+        jobs = []
+        for job_entity in job_entities:
+            try:
+                jobs.append(self._reconstitute_job(job_entity.job_state))
+            except Exception:
+                log.exception(f"Unable to restore job {job_entity.id}, removing it.")
+                self.job_dao.delete_job(job_entity.id)
+        return jobs
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}>"
@@ -0,0 +1,13 @@
+"""This scrip define the functions run by the scheduler.
+
+Jobs are module level functions, so the process pool executor and the job stores
+can refer to them by their import path.
+"""
+from src.service.auto_update_model import AutoUpdateModelService
+from src.service.schedule.job_lock import concurrency_limit
+
+
+@concurrency_limit(limit=1)
+def schedule_update_model():
+    """Update the models, it is CPU heavy and run in the process pool."""
+    AutoUpdateModelService().schedule_update_model()
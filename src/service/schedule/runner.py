@@ -0,0 +1,44 @@
+"""This file is the entrypoint of the scheduler process.
+
+Run it with `python -m src.service.schedule.runner`. Several runners can be started
+on different nodes, only the elected leader runs the jobs.
+"""
+import signal
+import threading
+
+from config.logger_setting import log
+from config.project_setting import schedule_config
+from src.operator.redis import RedisOperator
+from src.service.event.redis.leader_election import LeaderElection
+from src.service.event.redis.lock_admin import LockAdmin
+from src.service.schedule.apschedule import ScheduleWork
+
+
+def run():
+    """Run the scheduler until SIGTERM or SIGINT is received."""
+    schedule_work = ScheduleWork()
+    apschedule_election = LeaderElection(
+        LockAdmin(RedisOperator()),
+        name=ScheduleWork.LEADER_NAME,
+        lease_seconds=schedule_config.leader_lease_seconds,
+        renew_interval_seconds=schedule_config.leader_renew_interval_seconds,
+        on_elected=schedule_work.start,
+        on_revoked=schedule_work.pause
+    )
+
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: stop_event.set())
+
+    apschedule_election.start()
+    log.info("start scheduler service.")
+    while not stop_event.wait(1):
+        pass
+
+    apschedule_election.stop()
+    schedule_work.shutdown()
+    log.info("stop scheduler service.")
+
+
+if __name__ == "__main__":
+    run()
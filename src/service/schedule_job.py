@@ -0,0 +1,85 @@
+"""This module contains class to for schedule job service."""
+import pickle
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from src.dao.schedule_job_dao import ScheduleJobDao
+from src.dao.schedule_job_run_dao import ScheduleJobRunDao
+from src.data_models import entities
+from src.data_models.schedule import ScheduleJob, ScheduleJobRun
+from src.operator.redis import RedisOperator
+from src.service.schedule.apschedule import ScheduleWork
+
+
+def _to_datetime(timestamp: Optional[float]) -> Optional[datetime]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc)
+
+
+class ScheduleJobService:
+    """Provide functions related to the jobs stored by the scheduler."""
+    def __init__(self):
+        self.job_dao = ScheduleJobDao()
+        self.job_run_dao = ScheduleJobRunDao()
+        self.redis_operator = RedisOperator()
+
+    def find_all(self) -> List[ScheduleJob]:
+        """Get all scheduled jobs with their last run.
+
+        Returns:
+            a list of ScheduleJob objects ordered by next run time.
+        """
+        schedule_jobs = []
+        for job_entity in self.job_dao.find_all():
+            job_state = pickle.loads(job_entity.job_state)
+            last_run = self.job_run_dao.find_last_by_job_id(job_entity.id)
+            schedule_jobs.append(ScheduleJob(
+                id=job_entity.id,
+                name=job_state["name"],
+                func=job_state["func"],
+                trigger=str(job_state["trigger"]),
+                executor=job_state["executor"],
+                next_run_time=_to_datetime(job_entity.next_run_time),
+                paused=job_entity.next_run_time is None,
+                last_run=self._to_job_run(last_run) if last_run else None
+            ))
+        return schedule_jobs
+
+    def get_job_runs(self, job_id: str, limit: int = 20) -> Optional[List[ScheduleJobRun]]:
+        """Get the latest runs of a job.
+
+        Parameters:
+            job_id: id of the job.
+            limit: max number of runs.
+
+        Returns:
+            a list of ScheduleJobRun objects, the latest first, or None if the job doesn't exist.
+        """
+        if not self.job_dao.find_by_id(job_id):
+            return None
+        return [self._to_job_run(job_run) for job_run in self.job_run_dao.find_recent_by_job_id(job_id, limit)]
+
+    def trigger_job(self, job_id: str) -> Optional[bool]:
+        """Ask the running scheduler to run a job now.
+
+        Parameters:
+            job_id: id of the job.
+
+        Returns:
+            None if the job doesn't exist, False if no scheduler received the request, else True.
+        """
+        if not self.job_dao.find_by_id(job_id):
+            return None
+        return self.redis_operator.publish(ScheduleWork.TRIGGER_CHANNEL, job_id) > 0
+
+    @staticmethod
+    def _to_job_run(job_run: entities.ScheduleJobRun) -> ScheduleJobRun:
+        return ScheduleJobRun(
+            job_id=job_run.job_id,
+            scheduled_run_time=_to_datetime(job_run.scheduled_run_time),
+            started_at=_to_datetime(job_run.started_at),
+            finished_at=_to_datetime(job_run.finished_at),
+            status=job_run.status,
+            error=job_run.error
+        )
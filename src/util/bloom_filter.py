@@ -0,0 +1,53 @@
+"""This file contains an in-memory bloom filter."""
+import hashlib
+import math
+
+
+class BloomFilter:
+    """A fixed size bloom filter for string members.
+
+    A membership test may return a false positive with probability about `error_rate`
+    when no more than `capacity` members are added, but never a false negative.
+
+    Attributes:
+        capacity: int
+            expected number of members.
+        error_rate: float
+            expected false positive probability at full capacity.
+        bit_size: int
+            number of bits in the filter.
+        hash_count: int
+            number of bit positions set per member.
+    """
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        if capacity <= 0:
+            raise ValueError("capacity should be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate should be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bit_size = int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.bit_size / capacity * math.log(2))))
+        self._bits = bytearray((self.bit_size + 7) // 8)
+        self._count = 0
+
+    def _positions(self, member: str):
+        """Yield the bit positions of a member with double hashing."""
+        digest = hashlib.blake2b(member.encode("utf-8"), digest_size=16).digest()
+        hash_1 = int.from_bytes(digest[:8], "little")
+        hash_2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (hash_1 + i * hash_2) % self.bit_size
+
+    def add(self, member: str) -> None:
+        """Add a member into the filter."""
+        for position in self._positions(member):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self._count += 1
+
+    def __contains__(self, member: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(member))
+
+    def __len__(self) -> int:
+        """Return the number of add() calls, duplicates included."""
+        return self._count
@@ -0,0 +1,32 @@
+"""This file is for testing the bloom filter."""
+import pytest
+
+from src.util.bloom_filter import BloomFilter
+
+
+class TestBloomFilter:
+    """Pytest class, test for bloom filter."""
+
+    def test_added_member_is_contained(self):
+        """Test there is no false negative."""
+        bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+        members = [f"token-{i}" for i in range(1000)]
+        for member in members:
+            bloom_filter.add(member)
+        assert all(member in bloom_filter for member in members)
+        assert len(bloom_filter) == 1000
+
+    def test_false_positive_rate_within_bound(self):
+        """Test the false positive rate is about the error rate at full capacity."""
+        bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom_filter.add(f"token-{i}")
+        false_positives = sum(f"other-{i}" in bloom_filter for i in range(10000))
+        assert false_positives / 10000 < 0.02
+
+    def test_invalid_parameters(self):
+        """Test invalid capacity and error rate raise ValueError."""
+        with pytest.raises(ValueError):
+            BloomFilter(capacity=0)
+        with pytest.raises(ValueError):
+            BloomFilter(capacity=10, error_rate=1)
@@ -0,0 +1,38 @@
+"""This file is for testing the msgpack-numpy celery serializer."""
+from datetime import datetime
+
+import numpy as np
+
+from src.service.event import serializer
+
+
+class TestCelerySerializer:
+    """Pytest class, test for the msgpack-numpy celery serializer."""
+
+    def test_roundtrip_keeps_dtype_and_shape(self):
+        """Test arrays come back with the same dtype, shape and values."""
+        payload = {
+            "small": np.arange(6, dtype=np.int8).reshape(2, 3),
+            "large": np.random.default_rng(0).random((100, 2, 96)),
+            "scalar": np.float32(1.5),
+            "created_at": datetime(2024, 1, 1, 8, 30),
+            1: [1, "a", None]
+        }
+        result = serializer.loads(serializer.dumps(payload))
+        for key in ("small", "large"):
+            assert result[key].dtype == payload[key].dtype
+            assert result[key].shape == payload[key].shape
+            np.testing.assert_array_equal(result[key], payload[key])
+        assert result["scalar"] == 1.5
+        assert result["created_at"] == payload["created_at"]
+        assert result[1] == [1, "a", None]
+
+    def test_large_buffer_is_compressed(self):
+        """Test a sparse one-hot array larger than the threshold is compressed."""
+        one_hot = np.eye(10, dtype=int)[np.zeros((100, 2, 96), dtype=int)]
+        assert len(serializer.dumps(one_hot)) < one_hot.nbytes / 10
+
+    def test_non_contiguous_array(self):
+        """Test a transposed array is serialized in its logical order."""
+        array = np.arange(12).reshape(3, 4).T
+        np.testing.assert_array_equal(serializer.loads(serializer.dumps(array)), array)
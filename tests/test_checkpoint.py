@@ -0,0 +1,89 @@
+"""This file is for testing the checkpoints of the optimizer."""
+import os
+from functools import partial
+
+import numpy as np
+
+from src.service.optimizer.checkpoint import CheckpointManager
+from src.service.optimizer.fitness import weighted_cost_batch
+from src.service.optimizer.genetic_optimizer import GeneticOptimizer
+
+
+class TestCheckpoint:
+    """Pytest class, test for checkpoint manager and resume."""
+
+    @classmethod
+    def setup_class(cls):
+        """Setup for testing"""
+        cls.optimizer_kwargs = dict(
+            accuracy=[6, 2], future_step=24, actions=[[1, 2, 3, 4, 5, 6], [1, 2]],
+            fitness_function=partial(weighted_cost_batch, cost_weights=np.random.default_rng(0).random((2, 24)) + 0.5),
+            pop_size=40, mutation_rate=0.02, seed=3
+        )
+
+    def test_save_load_and_retention(self, tmp_path):
+        """Test the checkpoints are loaded as saved, the last keep are kept and the interrupted writes removed."""
+        os.makedirs(tmp_path / ".tmp-interrupted")
+        checkpoint_manager = CheckpointManager(str(tmp_path), keep=2)
+        assert not os.path.exists(tmp_path / ".tmp-interrupted")
+        assert checkpoint_manager.latest() is None
+        pop = np.arange(24, dtype=np.uint8).reshape(2, 3, 4)
+        for generation in (5, 10, 15):
+            checkpoint_manager.save(generation, {"pop": pop + generation, "empty": np.empty(0), "none": None},
+                                    {"generation": generation})
+            checkpoint_manager.wait()
+        assert [os.path.basename(path) for path in checkpoint_manager.get_checkpoints()] == [
+            "generation_00000010", "generation_00000015"
+        ]
+        arrays, state = checkpoint_manager.load()
+        assert isinstance(arrays["pop"], np.memmap) and set(arrays) == {"pop", "empty"}
+        np.testing.assert_array_equal(arrays["pop"], pop + 15)
+        assert state == {"generation": 15}
+        checkpoint_manager.clear()
+        assert not os.path.exists(tmp_path)
+
+    def test_resume_continues_the_run(self, tmp_path):
+        """Test a run resumed from its checkpoint gives the same generations as an uninterrupted run."""
+        uninterrupted = GeneticOptimizer(generations=30, **self.optimizer_kwargs)
+        expected = uninterrupted.run()
+
+        interrupted = GeneticOptimizer(generations=20, checkpoint_dir=str(tmp_path), checkpoint_interval=10,
+                                       **self.optimizer_kwargs)
+        interrupted.run()
+        assert "checkpoint" in interrupted.timings
+        resumed = GeneticOptimizer(generations=30, checkpoint_dir=str(tmp_path), **self.optimizer_kwargs)
+        assert resumed.resume()
+        assert resumed.generation == 20
+        result = resumed.run()
+        assert result["best_fit"] == expected["best_fit"]
+        assert resumed.history == uninterrupted.history
+        np.testing.assert_array_equal(resumed.pop, uninterrupted.pop)
+        assert not GeneticOptimizer(generations=30, **self.optimizer_kwargs).resume()
+
+    def test_task_keeps_checkpoints_of_a_failed_run(self, tmp_path, monkeypatch):
+        """Test the task keeps the checkpoints when the run raises and removes them when it succeeds."""
+        from config.project_setting import optimization_config
+        from src.service.event.tasks.optimization import run_optimization
+
+        monkeypatch.setattr(optimization_config, "checkpoint_dir", str(tmp_path))
+        monkeypatch.setattr(optimization_config, "checkpoint_interval", 5)
+        # the progress is not written to the result backend
+        monkeypatch.setattr(run_optimization, "update_state", lambda *args, **kwargs: None)
+        request = dict(
+            future_step=24, accuracy=[6, 2], actions=[[1, 2, 3, 4, 5, 6], [1, 2]], cost_weights=np.ones((2, 24)).tolist(),
+            pop_size=40, generations=20, crossover_rate=0.8, mutation_rate=0.1, current_ac_status=None, ac_opend=None, seed=3
+        )
+        step = GeneticOptimizer.step
+
+        def failing_step(optimizer):
+            if optimizer.generation == 12:
+                raise RuntimeError("worker crashed")
+            step(optimizer)
+
+        monkeypatch.setattr(GeneticOptimizer, "step", failing_step)
+        assert run_optimization.apply(args=(request,), task_id="task").failed()
+        assert os.path.basename(CheckpointManager(str(tmp_path / "task")).latest()) == "generation_00000010"
+
+        monkeypatch.setattr(GeneticOptimizer, "step", step)
+        assert run_optimization.apply(args=(request,), task_id="task").result["generations"] == 20
+        assert not os.path.exists(tmp_path / "task")
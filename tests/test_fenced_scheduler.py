@@ -0,0 +1,51 @@
+"""This file is for testing the scheduler fenced by the leader election."""
+import threading
+from datetime import datetime
+
+import pytz
+from apscheduler.events import EVENT_JOB_REMOVED
+from apscheduler.schedulers.base import STATE_PAUSED, STATE_RUNNING
+
+from src.service.schedule.fenced_scheduler import FencedBackgroundScheduler
+
+
+class TestFencedBackgroundScheduler:
+    """Pytest class, test for fenced background scheduler."""
+
+    def run_due_job(self, fencing_check) -> tuple:
+        """Start a scheduler with a due job, return whether it ran and the scheduler state."""
+        ran, removed = threading.Event(), threading.Event()
+        scheduler = FencedBackgroundScheduler(fencing_check=fencing_check, timezone=pytz.utc)
+        scheduler.add_listener(lambda event: removed.set(), EVENT_JOB_REMOVED)
+        scheduler.add_job(ran.set, next_run_time=datetime.now(pytz.utc))
+        scheduler.start()
+        try:
+            # the scheduler thread removes the one-off job once it is submitted, shut down after it
+            return ran.wait(1) and removed.wait(1), scheduler.state
+        finally:
+            scheduler.shutdown(wait=True)
+
+    def test_runs_jobs_with_a_valid_fencing_token(self):
+        """Test the due jobs run while the fencing token is valid."""
+        assert self.run_due_job(lambda: True) == (True, STATE_RUNNING)
+
+    def test_pauses_with_an_outdated_fencing_token(self):
+        """Test a scheduler whose fencing token is outdated pauses without running the due jobs."""
+        assert self.run_due_job(lambda: False) == (False, STATE_PAUSED)
+
+    def test_retries_when_the_check_fails(self):
+        """Test the due jobs wait until the fencing token can be checked."""
+        checks = []
+
+        def fencing_check():
+            checks.append(True)
+            if len(checks) == 1:
+                raise ConnectionError("redis is unreachable")
+            return True
+
+        FencedBackgroundScheduler.RETRY_SECONDS = 0.1
+        try:
+            assert self.run_due_job(fencing_check) == (True, STATE_RUNNING)
+        finally:
+            FencedBackgroundScheduler.RETRY_SECONDS = 1
+        assert len(checks) >= 2
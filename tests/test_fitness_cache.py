@@ -0,0 +1,71 @@
+"""This file is for testing the fitness cache."""
+from functools import partial
+
+import numpy as np
+import pytest
+
+from src.service.optimizer.fitness import weighted_cost_batch
+from src.service.optimizer.fitness_cache import FitnessCache
+from src.service.optimizer.genetic_optimizer import GeneticOptimizer
+
+
+class TestFitnessCache:
+    """Pytest class, test for fitness cache."""
+
+    @staticmethod
+    def evaluate(pop: np.ndarray, evaluated: list) -> np.ndarray:
+        """Sum of the genes, counting the evaluated individuals."""
+        evaluated.append(len(pop))
+        return pop.sum(axis=(1, 2)).astype(float) + 1
+
+    def test_duplicates_are_evaluated_once(self):
+        """Test the known and duplicated genotypes are not evaluated again."""
+        pop = np.random.default_rng(0).integers(0, 4, size=(6, 2, 5), dtype=np.uint8)
+        pop[3] = pop[0]
+        evaluated = []
+        fitness_cache = FitnessCache()
+        np.testing.assert_array_equal(fitness_cache.evaluate(pop, partial(self.evaluate, evaluated=evaluated)), self.evaluate(pop, []))
+        assert evaluated == [5]
+        np.testing.assert_array_equal(fitness_cache.evaluate(pop[::-1], partial(self.evaluate, evaluated=evaluated)), self.evaluate(pop[::-1], []))
+        assert evaluated == [5]
+        assert fitness_cache.get_stats() == {"size": 5, "hits": 7, "misses": 5, "hit_rate": 7 / 12}
+
+    def test_least_recently_used_is_evicted(self):
+        """Test the cache keeps max_size genotypes, evicting the least recently used."""
+        pop = np.arange(4, dtype=np.uint8).reshape(4, 1, 1)
+        evaluated = []
+        fitness_cache = FitnessCache(max_size=3)
+        fitness_cache.evaluate(pop[:3], partial(self.evaluate, evaluated=evaluated))
+        fitness_cache.evaluate(pop[:1], partial(self.evaluate, evaluated=evaluated))
+        fitness_cache.evaluate(pop[3:], partial(self.evaluate, evaluated=evaluated))
+        assert len(fitness_cache) == 3
+        fitness_cache.evaluate(pop[[0, 2, 3]], partial(self.evaluate, evaluated=evaluated))
+        assert evaluated == [3, 1]
+        fitness_cache.evaluate(pop[1:2], partial(self.evaluate, evaluated=evaluated))
+        assert evaluated == [3, 1, 1]
+        with pytest.raises(ValueError):
+            FitnessCache(max_size=0)
+
+    def test_optimizer_with_cache(self):
+        """Test a run with the cache gives the same result as without it."""
+        kwargs = dict(
+            accuracy=[4, 2], future_step=12, actions=[[1, 2, 3, 4], [1, 2]],
+            fitness_function=partial(weighted_cost_batch, cost_weights=np.ones((2, 12))),
+            pop_size=40, generations=30, mutation_rate=0.02, seed=2
+        )
+        cached = GeneticOptimizer(fitness_cache_size=1000, **kwargs)
+        uncached = GeneticOptimizer(**kwargs)
+        result = cached.run()
+        assert uncached.run()["best_fit"] == result["best_fit"]
+        assert cached.history == uncached.history
+        assert result["fitness_cache"]["hit_rate"] > 0.1
+        assert result["true_evaluations"] == result["fitness_cache"]["misses"] < uncached.true_evaluations
+
+    def test_cache_objectives(self):
+        """Test the rows of objectives of a multi-objective fitness are cached too."""
+        fitness_cache = FitnessCache(max_size=10)
+        pop = np.array([[[0, 1]], [[1, 1]], [[0, 1]]], dtype=np.uint8)
+        objectives = fitness_cache.evaluate(pop, lambda pop: np.stack([pop.sum(axis=(1, 2)), -pop[:, 0, 0].astype(int)], axis=1))
+        np.testing.assert_array_equal(objectives, [[1, 0], [2, -1], [1, 0]])
+        np.testing.assert_array_equal(fitness_cache.evaluate(pop[:2], None), objectives[:2])
+        assert fitness_cache.get_stats()["hits"] == 3
@@ -0,0 +1,102 @@
+"""This file is for testing the GA operators on index populations."""
+import numpy as np
+import pytest
+
+from src.service.optimizer.gene_change import GeneChange
+from src.service.optimizer.gene_translation import GeneTranslation
+
+
+class TestGeneChange:
+    """Pytest class, test for gene change."""
+
+    @classmethod
+    def setup_class(cls):
+        """Setup for testing"""
+        cls.accuracy = [6, 2]
+        cls.future_step = 24
+        cls.gene_translation = GeneTranslation(pop_size=101, number_of_features=2, future_step=24, accuracy=cls.accuracy)
+
+    def get_gene_change(self, seed: int = 0) -> GeneChange:
+        """Get a seeded GeneChange."""
+        return GeneChange(self.accuracy, self.future_step, rng=np.random.default_rng(seed))
+
+    @pytest.mark.parametrize("method", GeneChange.CROSSOVER_METHODS)
+    def test_crossover_swaps_genes_between_parents(self, method):
+        """Test the genes at each position are only swapped between individuals."""
+        index_pop = self.gene_translation.create_index_pop(np.random.default_rng(1))
+        new_pop = self.get_gene_change().crossover_index_pop(index_pop, 1.0, method)
+        assert new_pop.shape == index_pop.shape and new_pop.dtype == index_pop.dtype
+        assert not np.array_equal(new_pop, index_pop)
+        np.testing.assert_array_equal(np.sort(new_pop, axis=0), np.sort(index_pop, axis=0))
+
+    def test_single_point_crossover_keeps_head_and_tail(self):
+        """Test a single point child is a head of a parent followed by a tail of the other."""
+        index_pop = np.zeros((2, 2, self.future_step), dtype=np.uint8)
+        index_pop[1] = 1
+        new_pop = self.get_gene_change().crossover_index_pop(index_pop, 1.0, "single_point")
+        for chromosome in new_pop.reshape(-1, self.future_step):
+            assert np.count_nonzero(np.diff(chromosome.astype(int))) <= 1
+        np.testing.assert_array_equal(new_pop[0] + new_pop[1], 1)
+
+    def test_no_crossover_with_zero_rate(self):
+        """Test the population is unchanged if the crossover rate is 0."""
+        index_pop = self.gene_translation.create_index_pop(np.random.default_rng(1))
+        new_pop = self.get_gene_change().crossover_index_pop(index_pop, 0.0, "uniform")
+        np.testing.assert_array_equal(new_pop, index_pop)
+        with pytest.raises(ValueError):
+            self.get_gene_change().crossover_index_pop(index_pop, 0.5, "three_point")
+
+    def test_mutation_rate_of_each_gene(self):
+        """Test genes mutate with their own rate and stay within the actions."""
+        index_pop = self.gene_translation.create_index_pop(np.random.default_rng(1))
+        mutation_rate = np.zeros((2, self.future_step))
+        mutation_rate[0, :12] = 1.0
+        new_pop = self.get_gene_change().mutation_index_pop(index_pop, mutation_rate)
+        np.testing.assert_array_equal(new_pop[:, :, 12:], index_pop[:, :, 12:])
+        np.testing.assert_array_equal(new_pop[:, 1], index_pop[:, 1])
+        assert not np.array_equal(new_pop[:, 0, :12], index_pop[:, 0, :12])
+        assert new_pop.dtype == index_pop.dtype and new_pop[:, 0].max() < 6
+
+    def test_gene_mutation_rate_matches_individual_mutation_rate(self):
+        """Test the per gene rate mutates one step of a feature per mutated individual on average."""
+        index_pop = np.full((20000, 2, self.future_step), 2, dtype=np.uint8)
+        gene_mutation_rate = GeneChange.get_gene_mutation_rate(0.1, self.future_step)
+        new_pop = self.get_gene_change().mutation_index_pop(index_pop, gene_mutation_rate, creep=1)
+        # a creep of the feature 0 always changes the gene
+        mutated_genes = np.count_nonzero(new_pop[:, 0] != index_pop[:, 0], axis=1)
+        assert mutated_genes.mean() == pytest.approx(0.1, rel=0.05)
+
+    def test_creep_mutation(self):
+        """Test a creep mutation moves a gene by at most k within the actions."""
+        index_pop = self.gene_translation.create_index_pop(np.random.default_rng(1))
+        new_pop = self.get_gene_change().mutation_index_pop(index_pop, 1.0, creep=[1, 0])
+        step = np.abs(new_pop[:, 0].astype(int) - index_pop[:, 0])
+        assert step.max() == 1
+        assert new_pop[:, 0].min() >= 0 and new_pop[:, 0].max() < 6
+        np.testing.assert_array_equal(
+            new_pop, self.get_gene_change().mutation_index_pop(index_pop, 1.0, creep=[1, 0])
+        )
+
+    @pytest.mark.parametrize("current_ac_status", [0, 1])
+    @pytest.mark.parametrize("ac_opend", [
+        [0] * 8 + [1] * 8 + [0] * 8,
+        [1] * 6 + [0] * 12 + [1] * 6,
+        [0, 1] * 12,
+        [1] * 24,
+        [0] * 24
+    ])
+    def test_repair_ac_status_matches_one_hot_repair(self, current_ac_status, ac_opend):
+        """Differential test of the index repair against repair_ac_status.
+
+        repair_ac_status skips the last individual, which the index repair also repairs,
+        so it is compared with the repair of a population with one more individual.
+        """
+        index_pop = self.gene_translation.create_index_pop(np.random.default_rng(sum(ac_opend)))
+        gene_change = self.get_gene_change()
+        one_hot_pop = self.gene_translation.index_to_one_hot(np.concatenate([index_pop, index_pop[:1]]))
+        expected = self.gene_translation.one_hot_to_index(
+            gene_change.repair_ac_status(one_hot_pop, ac_opend, current_ac_status)
+        )[:-1]
+        repaired = gene_change.repair_ac_status_index_pop(index_pop, ac_opend, current_ac_status)
+        np.testing.assert_array_equal(repaired, expected)
+        np.testing.assert_array_equal(repaired[:, 0], index_pop[:, 0])
@@ -0,0 +1,43 @@
+"""This file is for testing the encoding of the GA population."""
+import numpy as np
+
+from src.service.optimizer.gene_translation import GeneTranslation, PhenotypeDecoder
+
+
+class TestGeneTranslation:
+    """Pytest class, test for gene translation."""
+
+    @classmethod
+    def setup_class(cls):
+        """Setup for testing"""
+        cls.gene_translation = GeneTranslation(pop_size=50, number_of_features=2, future_step=12, accuracy=[5, 2])
+
+    def test_create_index_pop(self):
+        """Test the index population shape, dtype, bounds and seeding."""
+        index_pop = self.gene_translation.create_index_pop(np.random.default_rng(1))
+        assert index_pop.shape == (50, 2, 12)
+        assert index_pop.dtype == np.uint8
+        assert index_pop[:, 0].max() < 5 and index_pop[:, 1].max() < 2
+        np.testing.assert_array_equal(index_pop, self.gene_translation.create_index_pop(np.random.default_rng(1)))
+
+    def test_one_hot_index_roundtrip(self):
+        """Test the conversions between the one-hot and the index populations."""
+        one_hot_pop = self.gene_translation.create_encoded_pop()
+        index_pop = self.gene_translation.one_hot_to_index(one_hot_pop)
+        converted = self.gene_translation.index_to_one_hot(index_pop)
+        for genotype, converted_genotype in zip(one_hot_pop, converted):
+            for chromosome, converted_chromosome in zip(genotype, converted_genotype):
+                np.testing.assert_array_equal(chromosome, converted_chromosome)
+        np.testing.assert_array_equal(self.gene_translation.one_hot_to_index(converted), index_pop)
+
+    def test_phenotype_decoder_matches_decode_chrom(self):
+        """Test the gather decoding gives the phenotypes of decode_chrom and reuses its buffer."""
+        actions = [[18, 20, 22, 24, 26], [0, 1]]
+        index_pop = self.gene_translation.create_index_pop(np.random.default_rng(2))
+        expected = np.array(self.gene_translation.decode_chrom(self.gene_translation.index_to_one_hot(index_pop), actions))
+        decoder = PhenotypeDecoder(actions)
+        phenotype = decoder.decode(index_pop)
+        np.testing.assert_array_equal(phenotype, expected)
+        assert np.shares_memory(decoder.decode(index_pop[::-1].copy()), phenotype)
+        np.testing.assert_array_equal(phenotype, expected[::-1])
+        assert np.shares_memory(decoder.decode(index_pop[:10]), phenotype)
@@ -0,0 +1,116 @@
+"""This file is for testing the GA driver."""
+from functools import partial
+
+import numpy as np
+import pytest
+
+from src.service.optimizer.fitness import cost_and_contract_batch, weighted_cost_batch
+from src.service.optimizer.generation import ElitistGeneration, GenerationHook, GenerationStrategy
+from src.service.optimizer.genetic_optimizer import GeneticOptimizer
+
+
+class TestGeneticOptimizer:
+    """Pytest class, test for genetic optimizer."""
+
+    @classmethod
+    def setup_class(cls):
+        """Setup for testing"""
+        cls.accuracy = [4, 2]
+        cls.future_step = 12
+        cls.actions = [[1, 2, 3, 4], [1, 2]]
+        cls.fitness_function = partial(weighted_cost_batch, cost_weights=np.ones((2, 12)))
+
+    def get_optimizer(self, **kwargs) -> GeneticOptimizer:
+        """Get an optimizer of the test problem, its best fit value is 24."""
+        kwargs = dict(dict(pop_size=60, generations=200, mutation_rate=0.02, seed=1), **kwargs)
+        return GeneticOptimizer(self.accuracy, self.future_step, self.actions, self.fitness_function, **kwargs)
+
+    def test_run_converges_and_stops_on_plateau(self):
+        """Test the run finds the optimum, keeps the best with elitism and stops on a plateau."""
+        result = self.get_optimizer(patience=30, selection_method="tournament").run()
+        assert result["best_fit"] == 24
+        np.testing.assert_array_equal(result["best_phenotype"], np.ones((2, 12)))
+        assert result["stop_reason"] == GeneticOptimizer.STOP_PLATEAU
+        assert result["generations"] < 200
+        assert set(result["timings"]) >= {"select", "crossover", "mutation", "decode", "evaluate"}
+
+    def test_run_is_reproducible(self):
+        """Test two runs with the same seed give the same history."""
+        first, second = self.get_optimizer(generations=10), self.get_optimizer(generations=10)
+        first.run()
+        second.run()
+        assert first.history == second.history
+        assert all(later <= earlier for earlier, later in zip(first.history, first.history[1:]))
+        np.testing.assert_array_equal(first.pop, second.pop)
+
+    def test_stop_by_callback_and_time_budget(self):
+        """Test a callback returning True and the time budget stop the run."""
+        generations = []
+        result = self.get_optimizer(callbacks=[lambda optimizer: generations.append(optimizer.generation) or optimizer.generation == 3]).run()
+        assert result["stop_reason"] == GeneticOptimizer.STOP_CALLBACK
+        assert generations == [1, 2, 3]
+        assert self.get_optimizer(time_budget_seconds=0).run()["stop_reason"] == GeneticOptimizer.STOP_TIME_BUDGET
+
+    def test_ac_status_is_repaired(self):
+        """Test the AC switch of the whole population follows the repair rules."""
+        optimizer = self.get_optimizer(generations=5, current_ac_status=1, ac_opend=[1] * 12)
+        optimizer.run()
+        np.testing.assert_array_equal(optimizer.pop[:, 1], 1)
+
+    def test_elites_are_not_evaluated_again(self):
+        """Test the elites keep their fit values, only the offspring are evaluated."""
+        optimizer = self.get_optimizer(generations=10, elite_size=5)
+        result = optimizer.run()
+        assert result["true_evaluations"] == 60 + 10 * (60 - 5)
+        phenotypes = optimizer.decoder.decode(optimizer.pop, out=np.empty(optimizer.pop.shape))
+        np.testing.assert_array_equal(optimizer.fit_value, self.fitness_function(phenotypes))
+
+    def test_hooks_run_after_each_generation(self):
+        """Test a hook runs after each generation once its best fit value is recorded, and is closed."""
+        class RecordingHook(GenerationHook):
+            """Record the generations and the history seen by the hook."""
+            name = "recording"
+
+            def __init__(self):
+                self.seen, self.closed = [], False
+
+            def after_generation(self, optimizer):
+                self.seen.append((optimizer.generation, optimizer.history[-1] == optimizer.best_fit))
+
+            def close(self):
+                self.closed = True
+
+        hook = RecordingHook()
+        optimizer = self.get_optimizer(generations=3, hooks=[hook])
+        result = optimizer.run()
+        assert hook.seen == [(1, True), (2, True), (3, True)] and hook.closed
+        assert optimizer.get_hook(RecordingHook) is hook and "recording" in result["timings"]
+
+    def test_generation_strategy_is_abstract(self):
+        """Test a generation strategy without evaluate or step cannot be built."""
+        class NoStepGeneration(GenerationStrategy):
+            """A strategy which only evaluates."""
+
+            def evaluate(self, optimizer, pop):
+                optimizer.fit_value = optimizer.evaluate(pop)
+
+        with pytest.raises(TypeError):
+            GenerationStrategy()
+        with pytest.raises(TypeError):
+            NoStepGeneration()
+        assert isinstance(ElitistGeneration(), GenerationStrategy)
+
+    def test_multi_objective_pareto_front(self):
+        """Test a NSGA-II run finds the Pareto front of cost vs contract."""
+        optimizer = GeneticOptimizer(
+            self.accuracy, self.future_step, self.actions, partial(cost_and_contract_batch, cost_weights=np.ones((2, 12))),
+            pop_size=60, generations=100, mutation_rate=0.02, multi_objective=True, fitness_cache_size=1000, seed=1
+        )
+        result = optimizer.run()
+        pareto_front = result["pareto_front"]
+        # each contract raise costs as much as it brings, so every contract is a trade-off
+        np.testing.assert_array_equal(pareto_front["objectives"], [[24, -1], [25, -2], [26, -3], [27, -4]])
+        np.testing.assert_array_equal(pareto_front["phenotypes"][:, 0, 0], [1, 2, 3, 4])
+        assert result["best_fit"] == 24
+        with pytest.raises(ValueError):
+            self.get_optimizer(multi_objective=True, memetic_interval=5)
@@ -0,0 +1,79 @@
+"""This file is for testing the island model GA."""
+import multiprocessing
+from functools import partial
+
+import numpy as np
+
+from src.service.optimizer.fitness import weighted_cost_batch
+from src.service.optimizer.genetic_optimizer import GeneticOptimizer
+from src.service.optimizer.island_model import IslandModel
+
+
+class TestIslandModel:
+    """Pytest class, test for island model."""
+
+    @classmethod
+    def setup_class(cls):
+        """Setup for testing"""
+        cls.optimizer_kwargs = dict(
+            accuracy=[4, 2],
+            future_step=12,
+            actions=[[1, 2, 3, 4], [1, 2]],
+            fitness_function=partial(weighted_cost_batch, cost_weights=np.ones((2, 12))),
+            pop_size=30,
+            generations=25,
+            mutation_rate=0.02
+        )
+
+    def test_destinations(self):
+        """Test the ring sends to the next island and random never to itself."""
+        np.testing.assert_array_equal(IslandModel(self.optimizer_kwargs, islands=4).get_destinations(), [1, 2, 3, 0])
+        island_model = IslandModel(self.optimizer_kwargs, islands=4, topology="random", seed=0)
+        for _ in range(20):
+            assert not np.any(island_model.get_destinations() == np.arange(4))
+
+    def test_run(self):
+        """Test the islands run the generations and report the best individual of all islands."""
+        progress = []
+        island_model = IslandModel(
+            self.optimizer_kwargs, islands=3, migration_interval=10, seed=1,
+            callbacks=[lambda model: progress.append(model.generation)]
+        )
+        result = island_model.run()
+        assert progress == [10, 20, 25]
+        assert result["stop_reason"] == GeneticOptimizer.STOP_GENERATIONS
+        assert result["best_fit"] == min(island_model.island_best_fit)
+        assert result["best_phenotype"].sum() == result["best_fit"]
+
+    def test_random_migration_delivers_every_emigrant(self):
+        """Test each island receives the emigrants of one other island and none is lost."""
+        island_model = IslandModel(self.optimizer_kwargs, islands=5, topology="random", seed=0)
+        emigrants = [(np.full((2, 2, 12), island, dtype=np.uint8), np.full(2, float(island))) for island in range(5)]
+        for _ in range(20):
+            immigrants = island_model.route_emigrants(emigrants)
+            assert [len(pop) for pop, _ in immigrants] == [2] * 5
+            origins = [int(fit_value[0]) for _, fit_value in immigrants]
+            assert sorted(origins) == list(range(5)) and all(origin != island for island, origin in enumerate(origins))
+            np.testing.assert_array_equal([pop[0, 0, 0] for pop, _ in immigrants], origins)
+
+    def test_run_in_process(self):
+        """Test the islands run in the current process give the results of the island processes."""
+        results = [
+            IslandModel(self.optimizer_kwargs, islands=3, topology="random", seed=2, use_processes=use_processes).run()
+            for use_processes in (True, False)
+        ]
+        assert results[0]["best_fit"] == results[1]["best_fit"]
+        np.testing.assert_array_equal(results[0]["best_individual"], results[1]["best_individual"])
+
+    def test_run_in_daemon_process(self):
+        """Test the islands run in a daemon process, such as a celery prefork worker."""
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=_run_model, args=(self.optimizer_kwargs, queue), daemon=True)
+        process.start()
+        best_fit = queue.get(timeout=60)
+        process.join(timeout=10)
+        assert best_fit is not None
+
+
+def _run_model(optimizer_kwargs: dict, queue) -> None:
+    queue.put(IslandModel(optimizer_kwargs, islands=2, seed=1).run()["best_fit"])
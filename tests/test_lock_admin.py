@@ -0,0 +1,52 @@
+"""This file is for testing the redis lock and leader election."""
+import time
+
+from src.operator.redis import RedisOperator
+from src.service.event.redis.leader_election import LeaderElection
+from src.service.event.redis.lock_admin import LockAdmin
+
+
+class TestLockAdmin:
+    """Pytest class, test for lock admin and leader election."""
+    @classmethod
+    def setup_class(cls):
+        """Setup for testing"""
+        cls.lock_admin = LockAdmin(RedisOperator())
+
+    def test_only_owner_can_renew_and_release(self):
+        """Test compare-and-expire and compare-and-delete."""
+        fencing_token = self.lock_admin.acquire("test_lock", "owner_a", 1000)
+        assert fencing_token > 0
+        assert self.lock_admin.acquire("test_lock", "owner_b", 1000) == 0
+        assert not self.lock_admin.renew("test_lock", "owner_b", 1000)
+        assert not self.lock_admin.release("test_lock", "owner_b")
+        assert self.lock_admin.renew("test_lock", "owner_a", 1000)
+        assert self.lock_admin.release("test_lock", "owner_a")
+
+    def test_fencing_token_increases(self):
+        """Test a former owner's fencing token is invalid after another acquire."""
+        fencing_token = self.lock_admin.acquire("test_fencing", "owner_a", 1000)
+        self.lock_admin.release("test_fencing", "owner_a")
+        new_fencing_token = self.lock_admin.acquire("test_fencing", "owner_b", 1000)
+        assert new_fencing_token > fencing_token
+        assert not self.lock_admin.is_fencing_token_valid("test_fencing", fencing_token)
+        assert self.lock_admin.is_fencing_token_valid("test_fencing", new_fencing_token)
+        self.lock_admin.release("test_fencing", "owner_b")
+
+    def test_failover_when_leader_dies(self):
+        """Test a follower is elected after the lease of the leader expires."""
+        elected = []
+        leader = LeaderElection(self.lock_admin, "test_election", 1, 0.2, on_elected=elected.append)
+        follower = LeaderElection(self.lock_admin, "test_election", 1, 0.2, on_elected=elected.append)
+        leader.start()
+        time.sleep(0.3)
+        follower.start()
+        time.sleep(0.5)
+        assert leader.is_leader and not follower.is_leader
+
+        # stop renewing without releasing the lease, as if the leader is killed
+        leader._stop_event.set()
+        time.sleep(1.5)
+        assert follower.is_leader
+        assert len(elected) == 2 and elected[1] > elected[0]
+        follower.stop()
@@ -0,0 +1,49 @@
+"""This file is for testing the memetic refinement."""
+from functools import partial
+
+import numpy as np
+import pytest
+
+from src.service.optimizer.fitness import weighted_cost_batch
+from src.service.optimizer.genetic_optimizer import GeneticOptimizer
+from src.service.optimizer.memetic import MemeticRefiner
+
+
+class TestMemeticRefiner:
+    """Pytest class, test for memetic refinement."""
+
+    @classmethod
+    def setup_class(cls):
+        """Setup for testing"""
+        cls.weights = np.random.default_rng(0).random((2, 48)) + 0.5
+        cls.fitness_function = partial(weighted_cost_batch, cost_weights=cls.weights)
+        cls.optimizer_kwargs = dict(
+            accuracy=[10, 2], future_step=48, actions=[list(range(1, 11)), [1, 2]],
+            fitness_function=cls.fitness_function, pop_size=100, generations=200, mutation_rate=0.02, seed=1
+        )
+        cls.target = cls.weights.sum() * 1.05
+
+    def test_refine_keeps_or_improves_elites(self):
+        """Test the refined individuals are never worse and their fit values are true."""
+        optimizer = GeneticOptimizer(memetic_interval=1, memetic_top_k=3, **self.optimizer_kwargs)
+        optimizer.initialize()
+        top = np.argsort(optimizer.fit_value)[:3]
+        fit_value = optimizer.fit_value[top].copy()
+        optimizer.get_hook(MemeticRefiner).refine(optimizer)
+        assert (optimizer.fit_value[top] <= fit_value).all()
+        assert optimizer.fit_value[top].min() < fit_value.min()
+        np.testing.assert_allclose(
+            optimizer.fit_value[top], self.fitness_function(optimizer.decoder.decode(optimizer.pop[top]))
+        )
+
+    def test_memetic_reaches_target_sooner(self):
+        """Test the memetic GA reaches the target in fewer generations and reports its phase improvements."""
+        def reach_target(optimizer):
+            return optimizer.best_fit < self.target
+
+        plain = GeneticOptimizer(callbacks=[reach_target], **self.optimizer_kwargs).run()
+        memetic = GeneticOptimizer(memetic_interval=5, callbacks=[reach_target], **self.optimizer_kwargs).run()
+        assert memetic["generations"] < plain["generations"]
+        assert memetic["phase_improvements"]["memetic"] > 0
+        assert "memetic" not in plain["phase_improvements"]
+        assert memetic["best_fit"] == pytest.approx(self.fitness_function(memetic["best_phenotype"][np.newaxis])[0])
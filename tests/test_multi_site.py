@@ -0,0 +1,104 @@
+"""This file is for testing the batched GA of many sites."""
+from functools import partial
+
+import numpy as np
+import pytest
+
+from src.service.optimizer.fitness import weighted_cost_batch
+from src.service.optimizer.gene_change import GeneChange
+from src.service.optimizer.gene_translation import GeneTranslation, PhenotypeDecoder
+from src.service.optimizer.genetic_optimizer import GeneticOptimizer
+from src.service.optimizer.multi_site import MultiSiteGeneticOptimizer
+from src.service.optimizer.selection_method import SelectionMethod
+
+
+class TestMultiSite:
+    """Pytest class, test for the operators and the GA driver of a batch of sites."""
+
+    @classmethod
+    def setup_class(cls):
+        """Setup for testing"""
+        cls.accuracy = np.array([[6, 2], [3, 2], [4, 2]])
+        cls.future_step = 12
+        cls.actions = [[[1, 2, 3, 4, 5, 6], [1, 2]], [[10, 20, 30], [5, 6]], [[1, 3, 5, 7], [0.5, 1]]]
+        cls.index_pop = GeneTranslation(41, 2, cls.future_step, cls.accuracy).create_index_pop(np.random.default_rng(0))
+
+    def test_create_index_pop_follows_site_accuracy(self):
+        """Test each site draws its genes among its own actions."""
+        assert self.index_pop.shape == (3, 41, 2, self.future_step)
+        np.testing.assert_array_equal(self.index_pop.max(axis=(1, 3)), self.accuracy - 1)
+
+    @pytest.mark.parametrize("method", GeneChange.CROSSOVER_METHODS)
+    def test_crossover_and_mutation_stay_in_site(self, method):
+        """Test the crossover swaps genes within each site, and the mutation keeps the site accuracy."""
+        gene_change = GeneChange(self.accuracy, self.future_step, rng=np.random.default_rng(0))
+        new_pop = gene_change.crossover_index_pop(self.index_pop, 1.0, method)
+        np.testing.assert_array_equal(np.sort(new_pop, axis=1), np.sort(self.index_pop, axis=1))
+        assert not np.array_equal(new_pop, self.index_pop)
+        new_pop = gene_change.mutation_index_pop(self.index_pop, 1.0)
+        assert new_pop.dtype == self.index_pop.dtype
+        np.testing.assert_array_equal(new_pop.max(axis=(1, 3)), self.accuracy - 1)
+
+    def test_repair_and_decode_match_each_site(self):
+        """Test the batched repair and decoding give the results of each site alone."""
+        gene_change = GeneChange(self.accuracy, self.future_step)
+        ac_opend = np.array([[0] * 5 + [1] * 7, [1] * 12, [1] * 6 + [0] * 6])
+        current_ac_status = np.array([0, 1, 1])
+        repaired = gene_change.repair_ac_status_index_pop(self.index_pop, ac_opend, current_ac_status)
+        phenotypes = PhenotypeDecoder(self.actions).decode(repaired)
+        for site in range(3):
+            site_repaired = gene_change.repair_ac_status_index_pop(self.index_pop[site], ac_opend[site], current_ac_status[site])
+            np.testing.assert_array_equal(repaired[site], site_repaired)
+            np.testing.assert_array_equal(phenotypes[site], PhenotypeDecoder(self.actions[site]).decode(site_repaired))
+
+    @pytest.mark.parametrize("method", SelectionMethod.SELECTION_METHODS)
+    def test_selection_per_site(self, method):
+        """Test the selection never selects the invalid individuals of a site, and follows its fit values."""
+        fit_value = np.array([[4.0, 1.0, -1.0, 2.0], [0.0, 0.0, 0.0, 0.0], [1.0, 0.0, 3.0, 3.0]])
+        indexes = SelectionMethod(pop_size=4, rng=np.random.default_rng(0)).select_indices(fit_value, method, 6000)
+        assert indexes.shape == (3, 6000)
+        assert not np.isin(indexes[0], [2]).any() and not np.isin(indexes[2], [1]).any()
+        np.testing.assert_allclose(np.bincount(indexes[1], minlength=4) / 6000, 0.25, atol=0.03)
+        if method != "tournament":
+            np.testing.assert_allclose(np.bincount(indexes[2], minlength=4) / 6000, [0.6, 0, 0.2, 0.2], atol=0.03)
+        np.testing.assert_array_equal(SelectionMethod.get_best_index(fit_value), [1, 0, 0])
+
+    def test_optimizer_finds_optimum_of_each_site(self):
+        """Test the batched GA finds the optimum of each site with its own cost weights."""
+        cost_weights = np.ones((3, 2, self.future_step))
+        optimizer = MultiSiteGeneticOptimizer(
+            self.accuracy, self.future_step, self.actions, partial(weighted_cost_batch, cost_weights=cost_weights),
+            pop_size=60, generations=300, mutation_rate=0.02, selection_method="tournament", patience=30, seed=1
+        )
+        result = optimizer.run()
+        assert result["best_fit"] == [24.0, 180.0, 18.0]
+        assert result["stop_reason"] == "plateau"
+        np.testing.assert_array_equal(
+            weighted_cost_batch(result["best_phenotype"][:, np.newaxis], cost_weights)[:, 0], result["best_fit"]
+        )
+        with pytest.raises(ValueError):
+            MultiSiteGeneticOptimizer([6, 2], self.future_step, self.actions[0], optimizer.fitness_function)
+
+    def test_optimizer_shares_the_generation_loop(self):
+        """Test the callbacks and the time budget stop the batched GA as they stop GeneticOptimizer,
+        and only the offspring are evaluated."""
+        cost_weights = np.ones((3, 2, self.future_step))
+        evaluated = []
+
+        def fitness_function(phenotypes):
+            evaluated.append(phenotypes.shape[1])
+            return weighted_cost_batch(phenotypes, cost_weights)
+
+        kwargs = dict(pop_size=20, elite_size=2, seed=1)
+        optimizer = MultiSiteGeneticOptimizer(
+            self.accuracy, self.future_step, self.actions, fitness_function,
+            callbacks=[lambda optimizer: optimizer.generation == 3], **kwargs
+        )
+        result = optimizer.run()
+        assert result["stop_reason"] == GeneticOptimizer.STOP_CALLBACK and result["generations"] == 3
+        assert evaluated == [20, 18, 18, 18]
+        assert set(result["timings"]) >= {"select", "crossover", "mutation", "decode", "evaluate"}
+        optimizer = MultiSiteGeneticOptimizer(
+            self.accuracy, self.future_step, self.actions, fitness_function, time_budget_seconds=0, **kwargs
+        )
+        assert optimizer.run()["stop_reason"] == GeneticOptimizer.STOP_TIME_BUDGET
@@ -0,0 +1,59 @@
+"""This file is for testing optimization APIs."""
+#pylint: disable=no-self-use, duplicate-code
+
+
+class TestOptimization:
+    """Pytest class, test for optimization module."""
+    @classmethod
+    def setup_class(cls):
+        """Setup for testing"""
+        cls.api_version = f"/craftsman/v1"
+        cls.payload = {
+            "future_step": 8,
+            "accuracy": [3, 2],
+            "actions": [[1, 2, 3], [0, 1]],
+            "cost_weights": [[1] * 8, [2] * 8],
+            "pop_size": 20,
+            "generations": 5
+        }
+
+    def test_submit_and_get_status_ok(self, test_client, admin_auth_headers):
+        """Test submit an optimization and get its status."""
+        response = test_client.post(
+            f"{self.api_version}/optimization/",
+            json=self.payload,
+            headers=admin_auth_headers
+        )
+        assert response.status_code == 200
+        task_id = response.json()["task_id"]
+
+        response = test_client.get(
+            f"{self.api_version}/optimization/{task_id}",
+            headers=admin_auth_headers
+        )
+        assert response.status_code == 200
+        assert response.json()["status"] in ("PENDING", "STARTED", "PROGRESS", "SUCCESS")
+
+    def test_submit_with_wrong_shape(self, test_client, admin_auth_headers):
+        """Test submit an optimization which actions don't match accuracy."""
+        payload = dict(self.payload, actions=[[1, 2], [0, 1]])
+        response = test_client.post(
+            f"{self.api_version}/optimization/",
+            json=payload,
+            headers=admin_auth_headers
+        )
+        assert response.status_code == 400
+
+    def test_identical_submit_is_deduplicated(self, test_client, admin_auth_headers):
+        """Test an identical request gets the task of the first one, unless data_version changes."""
+        payload = dict(self.payload, data_version="test-dedup")
+        first = test_client.post(f"{self.api_version}/optimization/", json=payload, headers=admin_auth_headers)
+        second = test_client.post(f"{self.api_version}/optimization/", json=payload, headers=admin_auth_headers)
+        assert first.status_code == 200 and second.status_code == 200
+        assert second.json()["task_id"] == first.json()["task_id"]
+        assert second.json()["deduplicated"] is True
+
+        payload["data_version"] = "test-dedup-2"
+        third = test_client.post(f"{self.api_version}/optimization/", json=payload, headers=admin_auth_headers)
+        assert third.json()["task_id"] != first.json()["task_id"]
+        assert third.json()["deduplicated"] is False
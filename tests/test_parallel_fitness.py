@@ -0,0 +1,31 @@
+"""This file is for testing the parallel fitness evaluation."""
+from functools import partial
+
+import numpy as np
+import pytest
+
+from src.service.optimizer.fitness import weighted_cost, weighted_cost_batch
+from src.service.optimizer.parallel_fitness import ParallelFitnessEvaluator
+
+
+class TestParallelFitnessEvaluator:
+    """Pytest class, test for parallel fitness evaluator."""
+
+    @classmethod
+    def setup_class(cls):
+        """Setup for testing"""
+        rng = np.random.default_rng(0)
+        cls.cost_weights = rng.random((2, 24))
+        cls.phenotypes = rng.random((101, 2, 24))
+        cls.expected = np.array([weighted_cost(phenotype, cls.cost_weights) for phenotype in cls.phenotypes])
+
+    @pytest.mark.parametrize("workers,chunk_size", [(1, None), (2, None), (2, 7)])
+    def test_evaluate(self, workers, chunk_size):
+        """Test the fit values are the ones of weighted_cost in the population order."""
+        fitness_function = partial(weighted_cost_batch, cost_weights=self.cost_weights)
+        with ParallelFitnessEvaluator(fitness_function, workers=workers, chunk_size=chunk_size) as evaluator:
+            np.testing.assert_allclose(evaluator.evaluate(self.phenotypes), self.expected)
+            buffer = evaluator.get_buffer(self.phenotypes.shape)
+            buffer[:] = self.phenotypes[::-1]
+            np.testing.assert_allclose(evaluator.evaluate(buffer), self.expected[::-1])
+            np.testing.assert_allclose(evaluator.evaluate(self.phenotypes[:10]), self.expected[:10])
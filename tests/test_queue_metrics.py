@@ -0,0 +1,29 @@
+"""This file is for testing the celery queue routing and metrics."""
+import json
+
+from src.service.event.celery_app import celery_app
+from src.service.event.queue_metrics import ENQUEUED_AT_HEADER, QueueMetrics, stamp_enqueued_at
+
+
+class TestQueueMetrics:
+    """Pytest class, test for celery queues."""
+
+    def test_tasks_are_routed_by_duration(self):
+        """Test notifications go to the short queue and optimizations to the long queue."""
+        router = celery_app.amqp.router
+        notification_route = router.route({}, "src.service.event.tasks.notification.send_line_notify")
+        optimization_route = router.route({}, "src.service.event.tasks.optimization.run_optimization")
+        assert notification_route["queue"].name == "short"
+        assert optimization_route["queue"].name == "long"
+
+    def test_enqueued_at_is_stamped(self):
+        """Test the publish time is stamped once and read back from a broker message."""
+        headers = {}
+        stamp_enqueued_at(headers=headers)
+        enqueued_at = headers[ENQUEUED_AT_HEADER]
+        stamp_enqueued_at(headers=headers)
+        assert headers[ENQUEUED_AT_HEADER] == enqueued_at
+
+        message = json.dumps({"body": "", "headers": headers}).encode("utf-8")
+        assert QueueMetrics._get_enqueued_at(message) == enqueued_at
+        assert QueueMetrics._get_enqueued_at(b"not json") is None
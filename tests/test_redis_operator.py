@@ -0,0 +1,36 @@
+"""This file is for testing the redis operator."""
+from src.operator.redis import RedisOperator
+
+
+class TestRedisOperator:
+    """Pytest class, test for redis operator."""
+    @classmethod
+    def setup_class(cls):
+        """Setup for testing"""
+        cls.operator = RedisOperator()
+
+    def test_client_is_shared(self):
+        """Test the client is created once per process."""
+        assert RedisOperator().redis_conn is self.operator.redis_conn
+
+    def test_pipeline_batches_commands(self):
+        """Test commands in a pipeline are returned in order."""
+        with self.operator.pipeline() as pipe:
+            pipe.set("test_pipeline", 1).incr("test_pipeline")
+            results = pipe.execute()
+        assert results == [True, 2]
+        self.operator.delete("test_pipeline")
+
+    def test_bulk_helpers(self):
+        """Test mset / mget and hash helpers."""
+        assert self.operator.mset({"test_mset_1": 1, "test_mset_2": 2}, ex=10)
+        assert self.operator.mget(["test_mset_1", "test_mset_2", "test_mset_3"]) == [b"1", b"2", None]
+        self.operator.hset("test_hash", mapping={"a": 1, "b": 2})
+        assert self.operator.hgetall("test_hash") == {b"a": b"1", b"b": b"2"}
+        self.operator.delete("test_mset_1", "test_mset_2", "test_hash")
+
+    def test_pool_stats(self):
+        """Test the pool usage is reported."""
+        stats = self.operator.pool_stats()
+        assert stats["in_use_connections"] <= stats["max_connections"]
+        assert 0 <= stats["saturation"] <= 1
@@ -0,0 +1,81 @@
+"""This file is for testing the vectorized simulated annealing."""
+import numpy as np
+import pytest
+
+from src.service.optimizer.gene_translation import GeneTranslation, PhenotypeDecoder
+from src.service.optimizer.sa_method import SA, VectorizedSA
+
+
+class TestVectorizedSA:
+    """Pytest class, test for vectorized SA."""
+
+    @classmethod
+    def setup_class(cls):
+        """Setup for testing"""
+        cls.accuracy = [6, 2]
+        cls.gene_translation = GeneTranslation(pop_size=64, number_of_features=2, future_step=12, accuracy=cls.accuracy)
+        decoder = PhenotypeDecoder([[1, 2, 3, 4, 5, 6], [1, 2]])
+        cls.evaluate = staticmethod(lambda states: decoder.decode(states).sum(axis=(1, 2)))
+
+    def test_anneal_prob_batch_matches_anneal_prob(self):
+        """Test the batched anneal prob gives the values of anneal_prob."""
+        delta_c = np.array([-3.0, -0.5, 0.0, 2.0])
+        expected = [SA.anneal_prob(delta, 1.5) for delta in delta_c]
+        np.testing.assert_allclose(VectorizedSA.anneal_prob_batch(delta_c, 1.5), expected)
+        np.testing.assert_array_equal(VectorizedSA.anneal_prob_batch(np.array([-np.inf, np.nan]), 1.0), [0, 0])
+
+    @pytest.mark.parametrize("cooling_schedule", VectorizedSA.COOLING_SCHEDULES)
+    def test_cooling_schedules(self, cooling_schedule):
+        """Test the temperature starts at the initial temperature and decreases."""
+        sa = VectorizedSA(self.accuracy, self.evaluate, steps=50, cooling_schedule=cooling_schedule)
+        temperatures = [sa.get_temperature(step) for step in range(50)]
+        assert temperatures[0] == pytest.approx(10.0)
+        assert all(later <= earlier for earlier, later in zip(temperatures, temperatures[1:]))
+        assert temperatures[-1] >= 0.01 - 1e-12
+
+    @pytest.mark.parametrize("tempering_interval", [None, 5])
+    def test_run_finds_optimum(self, tempering_interval):
+        """Test the chains reach the optimum, 24, staying within the actions."""
+        states = self.gene_translation.create_index_pop(np.random.default_rng(0))
+        sa = VectorizedSA(
+            self.accuracy, self.evaluate, steps=300, initial_temperature=2.0, move_probability=0.1,
+            tempering_interval=tempering_interval, rng=np.random.default_rng(0)
+        )
+        result = sa.run(states)
+        assert result["best_fit"] == 24
+        assert result["states"].shape == states.shape and result["states"][:, 0].max() < 6
+        assert 0 < result["acceptance_rate"] <= 1
+        assert result["history"][-1] == 24
+
+    def test_swap_temperatures_uses_the_temperatures(self):
+        """Test the replica exchange accepts swaps with exp((E_l - E_u) * (1 / T_l - 1 / T_u))."""
+        sa = VectorizedSA(self.accuracy, self.evaluate, rng=np.random.default_rng(0))
+        states = np.arange(2000)[:, np.newaxis, np.newaxis]
+        temperature = np.tile([0.01, 0.1], 1000)
+
+        # at a low base temperature, a colder chain better by 1 is never swapped, exp(-90)
+        energy = np.tile([1.0, 2.0], 1000)
+        assert sa._swap_temperatures(states.copy(), energy, temperature, offset=0) == (1000, 0)
+
+        # a hotter chain which is better is always swapped
+        energy = np.tile([2.0, 1.0], 1000)
+        swapped_states = states.copy()
+        assert sa._swap_temperatures(swapped_states, energy, temperature, offset=0) == (1000, 1000)
+        np.testing.assert_array_equal(swapped_states[:2, 0, 0], [1, 0])
+        np.testing.assert_array_equal(energy[:2], [1.0, 2.0])
+
+        # exp(-ln(2)) = 0.5
+        energy = np.tile([0.0, np.log(2) / 50], 1000)
+        _, swaps = sa._swap_temperatures(states.copy(), energy, np.tile([0.01, 0.02], 1000), offset=0)
+        assert swaps / 1000 == pytest.approx(0.5, abs=0.05)
+
+    def test_run_reports_swap_rate(self):
+        """Test the swap rate is reported with tempering only."""
+        states = self.gene_translation.create_index_pop(np.random.default_rng(0))
+        sa = VectorizedSA(
+            self.accuracy, self.evaluate, steps=50, initial_temperature=2.0, move_probability=0.1,
+            tempering_interval=5, rng=np.random.default_rng(0)
+        )
+        assert 0 <= sa.run(states)["swap_rate"] <= 1
+        sa.tempering_interval = None
+        assert sa.run(states)["swap_rate"] is None
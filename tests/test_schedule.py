@@ -0,0 +1,35 @@
+"""This file is for testing schedule APIs."""
+#pylint: disable=no-self-use, duplicate-code
+
+
+class TestSchedule:
+    """Pytest class, test for schedule module."""
+    @classmethod
+    def setup_class(cls):
+        """Setup for testing"""
+        cls.api_version = f"/craftsman/v1"
+
+    def test_get_jobs_ok(self, test_client, admin_auth_headers):
+        """Test get scheduled jobs by ADMIN."""
+        response = test_client.get(
+            f"{self.api_version}/schedule/jobs",
+            headers=admin_auth_headers
+        )
+        assert response.status_code == 200
+        assert isinstance(response.json(), list)
+
+    def test_get_runs_of_unknown_job(self, test_client, admin_auth_headers):
+        """Test get runs of a job which doesn't exist."""
+        response = test_client.get(
+            f"{self.api_version}/schedule/jobs/unknown_job/runs",
+            headers=admin_auth_headers
+        )
+        assert response.status_code == 404
+
+    def test_run_unknown_job(self, test_client, admin_auth_headers):
+        """Test trigger a job which doesn't exist."""
+        response = test_client.post(
+            f"{self.api_version}/schedule/jobs/unknown_job/run",
+            headers=admin_auth_headers
+        )
+        assert response.status_code == 404
@@ -0,0 +1,80 @@
+"""This file is for testing the vectorized GA selection."""
+import numpy as np
+import pytest
+
+from src.service.optimizer.selection_method import SelectionMethod
+
+
+class TestSelectionMethod:
+    """Pytest class, test for selection method."""
+
+    @classmethod
+    def setup_class(cls):
+        """Setup for testing"""
+        cls.fit_value = np.array([4.0, 1.0, -1.0, 2.0, 0.0, 4.0])
+        cls.probability = np.array([0.125, 0.5, 0, 0.25, 0, 0.125])
+
+    def test_get_best_index(self):
+        """Test the best index is the one of get_best_individual."""
+        pop = list(range(len(self.fit_value)))
+        assert SelectionMethod.get_best_index(self.fit_value) == SelectionMethod.get_best_individual(pop, self.fit_value)[0]
+        assert SelectionMethod.get_best_index([0, -1, 0]) == 0
+
+    def test_get_probability(self):
+        """Test the probability is proportional to 1 / fit value, and 0 for invalid fit values."""
+        np.testing.assert_allclose(SelectionMethod.get_probability(self.fit_value), self.probability)
+        np.testing.assert_allclose(SelectionMethod.get_probability([0, 0]), [0.5, 0.5])
+
+    @pytest.mark.parametrize("method", SelectionMethod.SELECTION_METHODS)
+    def test_select_indices_never_selects_invalid(self, method):
+        """Test the selected indexes are valid individuals."""
+        selection_method = SelectionMethod(pop_size=10001, rng=np.random.default_rng(0))
+        indexes = selection_method.select_indices(self.fit_value, method)
+        assert indexes.shape == (10000,)
+        assert not np.isin(indexes, [2, 4]).any()
+
+    def test_roulette_and_sus_follow_probability(self):
+        """Test roulette follows the probability, and SUS gives the expected counts."""
+        selection_method = SelectionMethod(pop_size=8, rng=np.random.default_rng(0))
+        counts = np.bincount(selection_method.roulette_indices(self.fit_value, 100000), minlength=6)
+        np.testing.assert_allclose(counts / 100000, self.probability, atol=0.01)
+        counts = np.bincount(selection_method.sus_indices(self.fit_value, 8), minlength=6)
+        np.testing.assert_array_equal(counts, self.probability * 8)
+
+    def test_tournament_prefers_better(self):
+        """Test a tournament of the whole population always selects the best."""
+        selection_method = SelectionMethod(pop_size=8, rng=np.random.default_rng(0))
+        assert selection_method.tournament_indices(self.fit_value, 100, tournament_size=1).min() >= 0
+        winners = selection_method.tournament_indices(self.fit_value, 1000, tournament_size=3)
+        assert np.mean(self.fit_value[winners]) < np.mean(self.fit_value[self.fit_value > 0])
+
+    def test_non_dominated_sort(self):
+        """Test the fronts match a brute force dominance check, the invalid individuals are ranked last."""
+        objectives = np.random.default_rng(0).integers(1, 6, size=(60, 2)).astype(float)
+        objectives[[3, 7], 0] = [0, np.inf]
+        ranks = SelectionMethod.non_dominated_sort(objectives)
+        valid = SelectionMethod.get_valid_objectives(objectives)
+        assert ranks[3] == ranks[7] == ranks[valid].max() + 1
+        for i in np.flatnonzero(valid):
+            dominators = [
+                j for j in np.flatnonzero(valid)
+                if (objectives[j] <= objectives[i]).all() and (objectives[j] < objectives[i]).any()
+            ]
+            assert ranks[i] == (max(ranks[dominators]) + 1 if dominators else 0)
+        np.testing.assert_array_equal(
+            SelectionMethod.get_pareto_front_indices(objectives), np.flatnonzero(ranks == 0)
+        )
+
+    def test_crowding_distance_and_crowded_tournament(self):
+        """Test the boundaries of a front are infinitely crowded, and the tournament prefers lower ranks
+        then less crowded individuals."""
+        objectives = np.array([[1.0, 4.0], [2.0, 2.0], [4.0, 1.0], [3.0, 3.0], [3.5, 3.5]])
+        order, ranks, crowding = SelectionMethod.nsga2_sort(objectives)
+        np.testing.assert_array_equal(ranks, [0, 0, 0, 1, 2])
+        assert np.isinf(crowding[[0, 2, 3, 4]]).all()
+        assert crowding[1] == pytest.approx(2.0)
+        assert list(order[:3]) in ([0, 2, 1], [2, 0, 1])
+        selection_method = SelectionMethod(pop_size=5, rng=np.random.default_rng(0))
+        winners = selection_method.crowded_tournament_indices(ranks, crowding, 1000)
+        assert np.mean(ranks[winners]) < np.mean(ranks)
+        assert np.mean(winners == 1) < np.mean(winners == 0)
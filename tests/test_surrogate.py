@@ -0,0 +1,54 @@
+"""This file is for testing the surrogate screening."""
+from functools import partial
+
+import numpy as np
+import pytest
+
+from src.service.optimizer.fitness import weighted_cost_batch
+from src.service.optimizer.genetic_optimizer import GeneticOptimizer
+from src.service.optimizer.surrogate import SurrogateScreener
+
+
+class TestSurrogateScreener:
+    """Pytest class, test for surrogate screener."""
+
+    def test_screen_ranks_by_prediction(self):
+        """Test the fitted surrogate screens the individuals with the lowest fit values."""
+        rng = np.random.default_rng(0)
+        pop = rng.integers(0, 5, size=(600, 2, 6), dtype=np.uint8)
+        fit_value = pop.sum(axis=(1, 2)) + 1.0
+        surrogate = SurrogateScreener(top_fraction=0.1, min_samples=100, max_samples=400, random_state=0)
+        assert not surrogate.maybe_retrain(0)
+        surrogate.add_samples(pop[:500], fit_value[:500])
+        assert surrogate.maybe_retrain(0)
+        assert not surrogate.maybe_retrain(1)
+
+        screened = surrogate.screen(surrogate.predict(pop[500:]))
+        assert len(screened) == 10
+        assert fit_value[500:][screened].mean() < np.percentile(fit_value[500:], 30)
+        with pytest.raises(ValueError):
+            SurrogateScreener(top_fraction=0)
+
+    def test_optimizer_with_surrogate(self):
+        """Test the surrogate reduces the evaluations, and the best individual is an evaluated one."""
+        weights = np.random.default_rng(0).random((2, 16)) + 0.5
+        fitness_function = partial(weighted_cost_batch, cost_weights=weights)
+        optimizer = GeneticOptimizer(
+            accuracy=[6, 2], future_step=16, actions=[[1, 2, 3, 4, 5, 6], [1, 2]],
+            fitness_function=fitness_function, pop_size=100, generations=20, mutation_rate=0.02,
+            surrogate_top_fraction=0.3, surrogate_min_samples=100, seed=0
+        )
+        result = optimizer.run()
+        assert result["true_evaluations"] < 100 * 21 / 2
+        assert result["best_fit"] == pytest.approx(fitness_function(result["best_phenotype"][np.newaxis])[0])
+        assert optimizer.evaluated[-1] and not optimizer.evaluated.all()
+
+    def test_surrogate_does_not_evaluate_the_elites_again(self):
+        """Test only the screened offspring are evaluated, the elites keep their fit values."""
+        optimizer = GeneticOptimizer(
+            accuracy=[4, 2], future_step=12, actions=[[1, 2, 3, 4], [1, 2]],
+            fitness_function=partial(weighted_cost_batch, cost_weights=np.ones((2, 12))), pop_size=50,
+            generations=10, mutation_rate=0.02, elite_size=5, surrogate_top_fraction=1.0, surrogate_min_samples=50, seed=0
+        )
+        assert optimizer.run()["true_evaluations"] == 50 + 10 * (50 - 5)
+        assert optimizer.generation_strategy.surrogate.is_fitted and optimizer.evaluated.all()
@@ -0,0 +1,35 @@
+"""This file is for testing the token revocation."""
+from src.service.event.redis.token_revocation import TokenRevocationAdmin
+
+
+class ScanOperator:
+    """A redis operator whose scan publishes a revoked id before it ends."""
+
+    def __init__(self, keys, on_scan):
+        self.keys = keys
+        self.on_scan = on_scan
+
+    def scan_iter(self, match=None, count=None):
+        # pylint: disable=W0613
+        """Yield the keys, the revocation is published in the middle of the scan."""
+        yield self.keys[0]
+        self.on_scan()
+        yield from self.keys[1:]
+
+    def exists(self, key):
+        """Every key is stored."""
+        return 1
+
+
+class TestTokenRevocationAdmin:
+    """Pytest class, test for token revocation admin."""
+
+    def test_sync_keeps_ids_revoked_during_the_scan(self):
+        """Test an id published while sync scans redis is in the new bloom filter."""
+        operator = ScanOperator([b"revoked_token:jti_a", b"revoked_token:jti_b"], on_scan=lambda: None)
+        admin = TokenRevocationAdmin(operator)
+        operator.on_scan = lambda: admin._on_message({"data": b"jti_published"})
+        admin.sync()
+        assert admin.is_revoked("jti_a") and admin.is_revoked("jti_b")
+        assert admin.is_revoked("jti_published")
+        assert admin._pending is None